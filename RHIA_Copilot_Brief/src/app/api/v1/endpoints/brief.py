@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import PlainTextResponse
+from app.core.constants import SECTION_IDS  # en haut du fichier
 from app.redis_client import get_session_data
+from app.services.brief_scheduler import PROGRESS_KEY, start_brief_generation
 from app.services.brief_template import render_final_brief
-from app.core.constants import SECTION_IDS  # en haut du fichier
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
 
 router = APIRouter()
 
@@ -41,3 +42,40 @@ async def get_final_brief(session_id: str):
 
     return markdown
 
+
+# Même plafond de boucle que /generate pour chaque section
+GRAPH_CONFIG = {"recursion_limit": 10}
+
+
+@router.post("/brief/{session_id}/generate", status_code=202)
+async def generate_full_brief(session_id: str):
+    """
+    Lance la génération de toutes les sections activées (hors sections déjà validées),
+    dans l'ordre des dépendances, et renvoie la progression initiale.
+    Suivi via GET /brief/{session_id}/progress, drafts dans la clé de session `drafts`.
+    """
+    user_preferences = await get_session_data(session_id, "user_preferences")
+    brief_data = await get_session_data(session_id, "brief_data")
+    approvals = await get_session_data(session_id, "approvals") or {}
+
+    if not user_preferences or not brief_data:
+        raise HTTPException(status_code=400, detail="Données incomplètes pour ce brief.")
+
+    try:
+        progress = start_brief_generation(
+            session_id, user_preferences, brief_data, approvals, GRAPH_CONFIG
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return {"session_id": session_id, "sections": progress}
+
+
+@router.get("/brief/{session_id}/progress")
+async def get_brief_progress(session_id: str):
+    """Statut par section : pending, waiting, running, done, error ou approved."""
+    progress = await get_session_data(session_id, PROGRESS_KEY)
+    if progress is None:
+        raise HTTPException(
+            status_code=404, detail="Aucune génération de brief pour cette session."
+        )
+    return {"session_id": session_id, "sections": progress}
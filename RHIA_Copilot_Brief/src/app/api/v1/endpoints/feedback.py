@@ -1,8 +1,11 @@
 from typing import Any
 
-from app.graph.feedback_graph import feedback_graph
+from app.graph.checkpointing import run_graph, thread_config
+from app.graph.feedback_graph import get_feedback_graph
 from app.models.user_pref import UserPreferences
+from app.services.streaming import SSE_HEADERS, stream_graph
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -15,6 +18,7 @@ class FeedbackRequest(BaseModel):
     previous_markdown: str
     user_preferences: UserPreferences
     brief_data: dict[str, Any]
+    bypass_cache: bool = False
 
 
 class FeedbackResponse(BaseModel):
@@ -23,24 +27,51 @@ class FeedbackResponse(BaseModel):
     confidence_label: str
 
 
-@router.post("/feedback", response_model=FeedbackResponse)
-async def revise_section(payload: FeedbackRequest):
-    """
-    Appelle le graphe LangGraph pour reformuler une section à partir d’un feedback.
-    """
-    state = {
+def _initial_state(payload: FeedbackRequest) -> dict[str, Any]:
+    return {
         "session_id": payload.session_id,
         "section_id": payload.section_id,
         "user_feedback": payload.user_feedback,
         "previous_output": payload.previous_markdown,
         "user_preferences": payload.user_preferences.dict(),
         "brief_data": payload.brief_data,
+        "bypass_cache": payload.bypass_cache,
     }
 
-    result = await feedback_graph.ainvoke(state)
 
+def _graph_config(payload: FeedbackRequest) -> dict[str, Any]:
+    return thread_config(
+        None, "feedback", payload.session_id, payload.section_id, _initial_state(payload)
+    )
+
+
+def _to_response(result: dict[str, Any]) -> FeedbackResponse:
     return FeedbackResponse(
         markdown=result["draft"],
         confidence=result["confidence"],
         confidence_label=result.get("confidence_label", ""),
     )
+
+
+@router.post("/feedback", response_model=FeedbackResponse)
+async def revise_section(payload: FeedbackRequest):
+    """
+    Appelle le graphe LangGraph pour reformuler une section à partir d’un feedback.
+    """
+    result = await run_graph(get_feedback_graph(), _initial_state(payload), _graph_config(payload))
+    return _to_response(result)
+
+
+@router.post("/feedback/stream")
+async def revise_section_stream(payload: FeedbackRequest):
+    """Variante SSE de /feedback (mêmes événements que /generate/stream)."""
+    return StreamingResponse(
+        stream_graph(
+            get_feedback_graph(),
+            _initial_state(payload),
+            to_final=lambda result: _to_response(result).dict(),
+            config=_graph_config(payload),
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -1,9 +1,23 @@
+import asyncio
+import time
 from typing import Any
 
-from app.graph.brief_generator import brief_graph
+from app.core.settings import get_settings
+from app.graph.brief_generator import get_brief_graph
+from app.graph.checkpointing import run_graph, thread_config
 from app.models.user_pref import UserPreferences
-from fastapi import APIRouter, HTTPException
-from langgraph.errors import GraphRecursionError
+from app.services.background_scoring import get_score, schedule_scoring
+from app.services.single_flight import (
+    IdempotencyKeyReused,
+    SingleFlightError,
+    get_idempotency_store,
+    get_single_flight,
+    request_fingerprint,
+)
+from app.services.streaming import SSE_HEADERS, stream_graph
+from app.telemetry.metrics import GENERATION_LATENCY_SECONDS
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -20,6 +34,7 @@ class GenerateRequest(BaseModel):
     section_id: str
     user_preferences: UserPreferences
     brief_data: dict[str, dict[str, Any]]
+    bypass_cache: bool = False  # force un nouvel appel LLM (bouton « régénérer »)
 
 
 class GenerateResponse(BaseModel):
@@ -27,27 +42,83 @@ class GenerateResponse(BaseModel):
     confidence: float
     confidence_label: str
     fallback_needed: bool
+    missing_fields: list[str] = []  # génération structurée uniquement
+    # "pending" : confiance provisoire,
+    # le score final arrive via /generate/{session_id}/{section_id}/score
+    scoring_status: str = "final"
 
 
-@router.post("/generate", response_model=GenerateResponse)
-async def generate_section(payload: GenerateRequest):
-    """
-    Appelle le graphe LangGraph pour générer une section complète.
-    """
-    state = {
+class ScoreResponse(BaseModel):
+    status: str
+    confidence: float | None = None
+    confidence_label: str | None = None
+    fallback_needed: bool | None = None
+    retry_count: int | None = None
+    revised: bool | None = None
+    markdown: str | None = None  # draft régénéré si le Verifier a relancé la section
+    detail: str | None = None
+
+
+GRAPH_CONFIG = {"recursion_limit": 10}
+
+
+def _graph_config(payload: GenerateRequest) -> dict[str, Any]:
+    return thread_config(
+        GRAPH_CONFIG, "brief", payload.session_id, payload.section_id, _initial_state(payload)
+    )
+
+
+def _initial_state(payload: GenerateRequest) -> dict[str, Any]:
+    return {
         "session_id": payload.session_id,
         "current_section": payload.section_id,  # ← clé correcte
         # Pydantic → dict pour le prompt builder
         "user_preferences": payload.user_preferences.dict(),
         "brief_data": payload.brief_data,
         "retry_count": 0,
+        "bypass_cache": payload.bypass_cache,
     }
 
+
+def _to_response(result: dict[str, Any]) -> GenerateResponse:
+    return GenerateResponse(
+        markdown=result["draft"],
+        confidence=result["confidence"],
+        confidence_label=result.get("confidence_label", ""),
+        fallback_needed=result.get("fallback_needed", False),
+        missing_fields=result.get("missing_fields") or [],
+        scoring_status=result.get("scoring_status", "final"),
+    )
+
+
+def _score_inline() -> bool:
+    settings = get_settings()
+    # best-of-N note ses candidats dans le graphe : pas de scoring différé
+    return not settings.background_scoring or settings.generation_strategy == "best_of_n"
+
+
+def _observe_latency(started: float) -> None:
+    GENERATION_LATENCY_SECONDS.labels(get_settings().generation_strategy).observe(
+        time.perf_counter() - started
+    )
+
+
+def _coalescing_key(payload: GenerateRequest) -> str:
+    fingerprint = request_fingerprint(
+        payload.brief_data, payload.user_preferences.dict(), payload.bypass_cache
+    )
+    return f"generate:{payload.session_id}:{payload.section_id}:{fingerprint}"
+
+
+async def _run_generation(payload: GenerateRequest) -> dict[str, Any]:
+    from langgraph.errors import GraphRecursionError
+
+    score_inline = _score_inline()
+    config = _graph_config(payload)
+    started = time.perf_counter()
     try:
-        result = await brief_graph.ainvoke(
-            state,
-            config={"recursion_limit": 10},
-        )  # ← version asynchrone !
+        # Un run précédent interrompu (timeout LLM...) reprend après son dernier nœud réussi
+        result = await run_graph(get_brief_graph(score_inline), _initial_state(payload), config)
     except GraphRecursionError as exc:
         raise HTTPException(
             status_code=500,
@@ -56,9 +127,82 @@ async def generate_section(payload: GenerateRequest):
             ),
         ) from exc
 
-    return GenerateResponse(
-        markdown=result["draft"],
-        confidence=result["confidence"],
-        confidence_label=result.get("confidence_label", ""),
-        fallback_needed=result.get("fallback_needed", False),
+    _observe_latency(started)
+    if not score_inline:
+        await schedule_scoring(result, config)
+    return _to_response(result).dict()
+
+
+@router.post("/generate", response_model=GenerateResponse)
+async def generate_section(
+    payload: GenerateRequest,
+    idempotency_key: str | None = Header(default=None, alias="Idempotency-Key"),
+):
+    """
+    Appelle le graphe LangGraph pour générer une section complète.
+    Les requêtes identiques en cours (double clic, retry du front) partagent une seule
+    exécution ; avec `Idempotency-Key`, la réponse déjà produite est rejouée (422 si la clé
+    a servi à une requête différente).
+    """
+    store = get_idempotency_store()
+    key = _coalescing_key(payload)
+    if idempotency_key:
+        try:
+            replay = await store.get(payload.session_id, idempotency_key, key)
+        except IdempotencyKeyReused as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        if replay is not None:
+            return GenerateResponse(**replay)
+
+    try:
+        response = await get_single_flight().run(key, lambda: _run_generation(payload))
+    except SingleFlightError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail) from exc
+
+    if idempotency_key:
+        await store.put(payload.session_id, idempotency_key, key, response)
+    return GenerateResponse(**response)
+
+
+@router.post("/generate/stream")
+async def generate_section_stream(payload: GenerateRequest):
+    """
+    Variante SSE de /generate : événements `node` (progression), `token` (draft au fil
+    de l'eau), `draft_discarded` (relance du Verifier : le draft affiché est à vider)
+    puis `final` (markdown, confiance, label).
+    """
+    score_inline = _score_inline()
+    config = _graph_config(payload)
+    started = time.perf_counter()
+
+    def to_final(result: dict[str, Any]) -> dict[str, Any]:
+        _observe_latency(started)
+        return _to_response(result).dict()
+
+    async def follow_up(result: dict[str, Any]) -> dict[str, Any]:
+        # shield : le scoring continue (et finit dans la session) si le client se déconnecte
+        return await asyncio.shield(await schedule_scoring(result, config))
+
+    return StreamingResponse(
+        stream_graph(
+            get_brief_graph(score_inline),
+            _initial_state(payload),
+            to_final=to_final,
+            config=config,
+            follow_up=None if score_inline else follow_up,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
+
+
+@router.get("/generate/{session_id}/{section_id}/score", response_model=ScoreResponse)
+async def get_section_score(session_id: str, section_id: str):
+    """
+    Score d'une section générée en mode scoring différé : `pending` tant que l'évaluation
+    tourne, puis `done` (confiance finale, draft régénéré éventuel) ou `error`.
+    """
+    record = await get_score(session_id, section_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Aucun score pour cette section.")
+    return ScoreResponse(**record)
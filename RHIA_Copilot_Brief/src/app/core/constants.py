@@ -70,3 +70,16 @@ MIN_SKILLS_REQUIRED: Final[int] = 3
 
 # Nombre maximum de tentatives de génération avant d'arrêter les boucles
 MAX_GRAPH_RETRIES: Final[int] = 3
+
+# Dépendances de rédaction entre sections (slugs) : une section reçoit dans son prompt
+# le draft des sections dont elle dépend (génération du brief complet)
+SECTION_DEPENDENCIES: Final[dict[str, list[str]]] = {
+    "finalite_mission": ["contexte"],
+    "objectifs_kpis": ["finalite_mission"],
+    "responsabilites_cles": ["finalite_mission"],
+    "perimetre_budgetaire": ["responsabilites_cles"],
+    "competences_exigences": ["responsabilites_cles"],
+    "qualifications_experiences": ["competences_exigences"],
+    "performance_cadence": ["objectifs_kpis"],
+    "onboarding_developpement": ["competences_exigences"],
+}
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from contextlib import contextmanager
+
+from app.core.settings import AppSettings
+from app.telemetry.logging import logger
+
+# État factice utilisé pour le passage à vide du graphe pendant le warmup
+WARMUP_STATE = {
+    "session_id": "warmup",
+    "current_section": "finalite_mission",
+    "brief_data": {"finalite_mission": {"job_function": "warmup"}},
+    "user_preferences": {"seniority": "Senior", "language": "fr"},
+}
+
+
+class ResourceRegistry:
+    """
+    Ressources partagées du process API (clients, modèles, graphes).
+    Ouvertes dans le lifespan FastAPI, préchauffées en tâche de fond, fermées à l'arrêt.
+    `ready` ne passe à True qu'une fois le warmup terminé (sonde /ready).
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.warmup_error: str | None = None
+        self.timings: dict[str, float] = {}
+        self._warmup_task: asyncio.Task | None = None
+
+    @contextmanager
+    def _timed(self, step: str):
+        start = time.perf_counter()
+        yield
+        self.timings[step] = round(time.perf_counter() - start, 3)
+
+    async def startup(self, settings: AppSettings) -> None:
+        from app.services.qdrant_client import init_async_qdrant_client
+
+        with self._timed("connections"):
+            await init_async_qdrant_client()
+        self._warmup_task = asyncio.create_task(self.warmup(settings))
+
+    async def warmup(self, settings: AppSettings) -> None:
+        """Un embedding, un reranking et un passage du graphe (sans LLM) avant d'être prêt."""
+        try:
+            from app.graph.brief_generator import get_brief_graph
+            from app.graph.feedback_graph import get_feedback_graph
+            from app.graph.nodes.mapper import SectionMapper
+            from app.graph.nodes.prompt_builder import PromptBuilder
+            from app.graph.nodes.rag_retriever import RagRetriever
+            from app.services.rag_retriever import (
+                get_embedder,
+                prewarm_embeddings,
+                retrieve_chunks,
+            )
+            from app.services.rerank_service import get_rerank_batcher
+
+            with self._timed("embed"):
+                await asyncio.to_thread(get_embedder().encode, ["warmup"])
+
+            with self._timed("rerank"):
+                batcher = get_rerank_batcher()
+                if batcher is not None:
+                    await batcher.submit([["warmup", "warmup"]])
+
+            with self._timed("retrieval"):
+                # Appel direct : le nœud RagRetriever avale les erreurs (Qdrant injoignable)
+                await retrieve_chunks(
+                    section=WARMUP_STATE["current_section"],
+                    job_function="warmup",
+                    seniority=WARMUP_STATE["user_preferences"]["seniority"],
+                    language=WARMUP_STATE["user_preferences"]["language"],
+                )
+
+            with self._timed("graph"):
+                get_brief_graph()
+                get_feedback_graph()
+                rag = await RagRetriever()(WARMUP_STATE)
+                if "rag_error" in rag:
+                    raise RuntimeError(f"Passage RAG du warmup en échec: {rag['rag_error']}")
+                state = {**WARMUP_STATE, **rag}
+                state = {**state, **SectionMapper()(state)}
+                PromptBuilder()(state)
+
+            if settings.embedding_prewarm:
+                with self._timed("prewarm"):
+                    await prewarm_embeddings(settings.embedding_prewarm_job_functions)
+
+            self.ready = True
+            logger.info("Warmup terminé: %s", self.timings)
+        except Exception as e:
+            self.warmup_error = str(e)
+            logger.exception("Warmup en échec: %s", e)
+
+    async def shutdown(self) -> None:
+        from app.redis_client import close_redis
+        from app.services.background_scoring import close_background_scoring
+        from app.services.brief_scheduler import close_brief_scheduler
+        from app.services.llm_client import close_openai_client
+        from app.services.qdrant_client import close_async_qdrant_client
+        from app.services.rerank_service import close_rerank_batcher
+
+        self.ready = False
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+
+        await close_brief_scheduler()
+        await close_background_scoring()
+        await close_rerank_batcher()
+        await close_async_qdrant_client()
+        await close_openai_client()
+        await close_redis()
+
+
+registry = ResourceRegistry()
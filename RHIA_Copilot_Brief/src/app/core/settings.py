@@ -7,7 +7,7 @@ logging.basicConfig(level=logging.DEBUG)
 
 
 
-class AppSettings(BaseSettings):
+class AppSettings(BaseSettings):
     # ENV
     environment: Literal["dev", "test", "prod"] = "dev"
     production_guard: bool = False
@@ -16,25 +16,131 @@ class AppSettings(BaseSettings):
     openai_api_key: str = Field(..., alias="OPENAI_API_KEY")
     openai_model: str = "gpt-4"
     temperature: float = 0.7
+    # "fake" : faux LLM local (tests de charge hors ligne, aucun appel OpenAI)
+    llm_provider: Literal["openai", "fake"] = "openai"
+    # "structured" : une complétion JSON (draft + auto-évaluation + champs manquants) ;
+    # nécessite un modèle compatible structured outputs (ex. gpt-4o-mini)
+    generation_mode: Literal["text", "structured"] = "text"
+    # "best_of_n" : N candidats notés en un batch au lieu de la boucle de relance du Verifier
+    generation_strategy: Literal["retry", "best_of_n"] = "retry"
+    best_of_n: int = 3
+    best_of_n_mode: Literal["n", "parallel"] = "n"  # paramètre `n` ou requêtes parallèles
+    best_of_n_temperature_spread: float = 0.2
+    fake_llm_latency_median: float = 2.0
+    fake_llm_latency_sigma: float = 0.5
+    fake_llm_error_rate: float = 0.0
+    fake_llm_rate_limit_rate: float = 0.0
+    fake_llm_seed: int | None = None
     llm_timeout: int = 20
+    # Transport HTTP partagé par tous les appels OpenAI
+    openai_max_connections: int = 100
+    openai_max_keepalive: int = 20
+    openai_keepalive_expiry: float = 60.0
+    openai_connect_timeout: float = 5.0
+    openai_http2: bool = True
+    # Gouverneur : budget par modèle partagé entre réplicas + concurrence AIMD par process
+    llm_rpm_limit: int = 500
+    llm_tpm_limit: int = 80_000
+    llm_concurrency_initial: int = 8
+    llm_concurrency_max: int = 64
+    llm_latency_target: float = 15.0
+    llm_rate_limit_retries: int = 5
+    # Requêtes couvertes (hedging) : seconde requête après le quantile glissant de latence
+    llm_hedging: bool = False
+    llm_hedge_quantile: float = 0.9
+    llm_hedge_min_samples: int = 20
+    llm_hedge_max_ratio: float = 0.1
+    llm_hedge_window: int = 200
+
+    # Évaluation des drafts : "local" (embeddings / cross-encoder + contrôles),
+    # "llm" (second appel OpenAI)
+    answer_scorer: Literal["local", "llm"] = "local"
+    # /generate répond dès le draft (confiance provisoire), scoring + Verifier en tâche de fond
+    background_scoring: bool = False
+    # Génération du brief complet : sections indépendantes en parallèle (plafond)
+    brief_max_concurrency: int = 4
+    # Attente d'un brief déjà en génération sur un autre réplica : ce délai par section activée
+    brief_section_timeout: float = 120.0
+    local_scorer_model: Literal["embedding", "cross_encoder"] = "embedding"
+    local_scorer_similarity_range: tuple[float, float] = (0.2, 0.7)
+    local_scorer_min_words: int = 40
+    local_scorer_max_words: int = 600
 
     # Qdrant
     qdrant_host: str = "qdrant"
     qdrant_port: int = 6333
     qdrant_collection_brief: str = "brief"
     qdrant_collection_rules: str = "rules"
+    qdrant_prefer_grpc: bool = False
+    qdrant_grpc_port: int = 6334
+    qdrant_timeout: int = 10
+    qdrant_pool_size: int = 32
+    qdrant_keepalive_expiry: float = 30.0
+    # "memory" : store vectoriel en mémoire à la place de Qdrant (tests de charge hors ligne)
+    vector_store: Literal["qdrant", "memory"] = "qdrant"
+    memory_store_path: str = ""
+    memory_store_job_functions: list[str] = ["Data Scientist", "Product Manager", "Sales Manager"]
+    memory_store_chunks_per_filter: int = 8
+
+    # Embeddings
+    embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_cache_size: int = 4096
+    embedding_cache_ttl: int = 7 * 24 * 3600
+    embedding_prewarm: bool = False
+    embedding_prewarm_job_functions: list[str] = []
+
+    # Inférence (embedder / cross-encoder)
+    reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    inference_backend: Literal["torch", "onnx"] = "torch"
+    onnx_model_dir: str = "models/onnx"
+    inference_mode: Literal["local", "sidecar"] = "local"
+    inference_socket_path: str = "/tmp/rhia-inference.sock"
+    inference_timeout: float = 10.0
+    inference_max_batch: int = 64
+    inference_max_wait_ms: float = 5.0
+    rerank_cache_size: int = 16384
+    rerank_cache_redis: bool = False
+    rerank_cache_ttl: int = 24 * 3600
+
+    # Cache des résultats RAG
+    retrieval_cache_size: int = 2048
+    retrieval_cache_ttl: int = 600
+    retrieval_version_refresh: float = 5.0
+
+    # Assemblage du contexte RAG (budget en tokens du modèle de génération)
+    rag_context_token_budget: int = 1200
+    rag_context_section_budgets: dict[str, int] = {}
+    rag_mmr_diversity: float = 0.3
+
+    # Cache des réponses LLM (exact + sémantique optionnel) : désactivé par défaut, un draft
+    # en cache est renvoyé tel quel (pas de nouvelle complétion) tant que `bypass_cache` est faux
+    llm_cache_enabled: bool = False
+    llm_cache_ttl: int = 24 * 3600
+    llm_semantic_cache: bool = False
+    llm_semantic_max_distance: float = 0.05
+    llm_semantic_max_entries: int = 200
+
+    # Regroupement des /generate identiques (single-flight) et Idempotency-Key
+    singleflight_lock_ttl: int = 120
+    singleflight_result_ttl: int = 30
+    singleflight_wait_timeout: float = 120.0
+    idempotency_ttl: int = 600
+
+    # Checkpoints LangGraph dans Redis : un /generate relancé reprend après le dernier nœud réussi
+    graph_checkpointing: bool = True
+    graph_checkpoint_ttl: int = 3600
+
+    # Redis
+    redis_host: str = "redis"
+    redis_port: int = 6379
+
+    # Database
+    supabase_url: str = Field(..., alias="SUPABASE_URL")
 
-    # Redis
-    redis_host: str = "redis"
-    redis_port: int = 6379
-
-    # Database
-    supabase_url: str = Field(..., alias="SUPABASE_URL")
-
-    # Security
-    cors_origins: list[str] = []
-    enable_rbac: bool = True
-    JWT_SECRET_KEY: str = Field(..., alias="JWT_SECRET_KEY")
+    # Security
+    cors_origins: list[str] = []
+    enable_rbac: bool = True
+    JWT_SECRET_KEY: str = Field(..., alias="JWT_SECRET_KEY")
 
     # Tracing / Logs
     enable_otlp: bool = True
@@ -1,35 +1,76 @@
+from functools import lru_cache
+
+from app.core.settings import get_settings
+from app.graph.checkpointing import get_checkpointer
+from app.graph.instrumentation import instrument_node
 from app.graph.nodes.answer_scorer import AnswerScorer
+from app.graph.nodes.best_of_n import BestOfNExecutor
 from app.graph.nodes.llm_executor import LLMExecutor
 from app.graph.nodes.mapper import SectionMapper
 from app.graph.nodes.prompt_builder import PromptBuilder
+from app.graph.nodes.provisional_scorer import ProvisionalScorer
 from app.graph.nodes.rag_retriever import RagRetriever
 from app.graph.nodes.verifier import Verifier
 from app.graph.state import BriefState
-from langgraph.graph import StateGraph
-
-# 1. Créer le graphe
-graph = StateGraph(BriefState)
-
-# 2. Ajouter les nœuds
-graph.add_node("retrieve_chunks", RagRetriever())
-graph.add_node("map_section", SectionMapper())
-graph.add_node("build_prompt", PromptBuilder())
-graph.add_node("call_llm", LLMExecutor())
-graph.add_node("score", AnswerScorer())
-graph.add_node("verify", Verifier())
-
-# 3. Définir les transitions
-graph.set_entry_point("retrieve_chunks")
-graph.add_edge("retrieve_chunks", "map_section")
-graph.add_edge("map_section", "build_prompt")
-graph.add_edge("build_prompt", "call_llm")
-graph.add_edge("call_llm", "score")
-graph.add_edge("score", "verify")
-
-# 4. Condition : si confiance faible → reboucler sur build_prompt (clarification UX plus tard)
-graph.add_conditional_edges(
-    "verify", lambda state: "build_prompt" if state.get("fallback_needed") else "output"
-)
-
-# 5. Compiler le graphe␊
-brief_graph = graph.compile()
+
+
+def build_brief_graph(score_inline: bool = True):
+    """
+    `score_inline=False` (scoring différé) : le graphe s'arrête après le LLM avec une confiance
+    provisoire ; l'évaluation et la vérification sont faites par `background_scoring`.
+    Stratégie `best_of_n` : un seul nœud génère, note et choisit, sans boucle de relance.
+    Les checkpoints (Redis) exigent un `thread_id` : exécuter via `checkpointing.run_graph`.
+    """
+    # langgraph est importé à la construction, pas à l'import de l'app
+    from langgraph.graph import END, StateGraph
+
+    # 1. Créer le graphe
+    graph = StateGraph(BriefState)
+
+    # 2. Ajouter les nœuds
+    graph.add_node("retrieve_chunks", instrument_node("brief", "retrieve_chunks", RagRetriever()))
+    graph.add_node("map_section", instrument_node("brief", "map_section", SectionMapper()))
+    graph.add_node("build_prompt", instrument_node("brief", "build_prompt", PromptBuilder()))
+
+    # 3. Définir les transitions
+    graph.set_entry_point("retrieve_chunks")
+    graph.add_edge("retrieve_chunks", "map_section")
+    graph.add_edge("map_section", "build_prompt")
+
+    if get_settings().generation_strategy == "best_of_n":
+        graph.add_node("best_of_n", instrument_node("brief", "best_of_n", BestOfNExecutor()))
+        graph.add_edge("build_prompt", "best_of_n")
+        graph.add_edge("best_of_n", END)
+        return graph.compile(checkpointer=get_checkpointer())
+
+    graph.add_node("call_llm", instrument_node("brief", "call_llm", LLMExecutor()))
+    graph.add_edge("build_prompt", "call_llm")
+
+    if not score_inline:
+        graph.add_node(
+            "provisional_score",
+            instrument_node("brief", "provisional_score", ProvisionalScorer()),
+        )
+        graph.add_edge("call_llm", "provisional_score")
+        graph.add_edge("provisional_score", END)
+        return graph.compile(checkpointer=get_checkpointer())
+
+    graph.add_node("score", instrument_node("brief", "score", AnswerScorer()))
+    graph.add_node("verify", instrument_node("brief", "verify", Verifier()))
+    graph.add_edge("call_llm", "score")
+    graph.add_edge("score", "verify")
+
+    # 4. Condition : si confiance faible → reboucler sur build_prompt (clarification UX plus tard)
+    graph.add_conditional_edges(
+        "verify",
+        lambda state: "build_prompt" if state.get("fallback_needed") else "output",
+        {"build_prompt": "build_prompt", "output": END},
+    )
+
+    # 5. Compiler le graphe
+    return graph.compile(checkpointer=get_checkpointer())
+
+
+@lru_cache
+def get_brief_graph(score_inline: bool = True):
+    return build_brief_graph(score_inline)
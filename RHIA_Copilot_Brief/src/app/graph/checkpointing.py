@@ -0,0 +1,140 @@
+import asyncio
+import uuid
+from typing import Any
+
+from app.core.settings import get_settings
+from app.services.single_flight import request_fingerprint
+from app.telemetry.logging import logger
+
+# Clés d'entrée modifiées par le graphe lui-même : exclues de l'empreinte d'une requête
+RUNTIME_KEYS = ("retry_count",)
+
+_checkpointer = None
+
+
+def get_checkpointer():
+    """Checkpointer Redis partagé par les graphes ; None si désactivé (`graph_checkpointing`)."""
+    global _checkpointer
+    settings = get_settings()
+    if not settings.graph_checkpointing:
+        return None
+    if _checkpointer is None:
+        from app.graph.redis_checkpointer import RedisCheckpointSaver
+
+        _checkpointer = RedisCheckpointSaver(ttl=settings.graph_checkpoint_ttl)
+    return _checkpointer
+
+
+def thread_config(
+    config: dict[str, Any] | None,
+    graph: str,
+    session_id: str,
+    section_id: str,
+    state: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Config d'exécution avec le thread de la requête :
+    `{graph}:{session_id}:{section_id}:{empreinte de state}`. Deux requêtes différentes sur la
+    même section ne reprennent jamais le run l'une de l'autre ; chaque run ajoute ensuite son
+    propre nonce (voir `start_run`).
+    """
+    fingerprint = request_fingerprint(
+        {key: value for key, value in state.items() if key not in RUNTIME_KEYS}
+    )
+    thread_id = f"{graph}:{session_id}:{section_id}:{fingerprint}"
+    return {**(config or {}), "configurable": {"thread_id": thread_id}}
+
+
+async def start_run(
+    graph: Any, state: dict[str, Any], config: dict[str, Any]
+) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+    """
+    Entrée et config du run. Chaque run a son propre thread (`{thread de la requête}:{nonce}`) :
+    deux requêtes identiques simultanées n'écrivent ni ne suppriment jamais les checkpoints
+    l'une de l'autre. Seul un run marqué interrompu (`mark_interrupted`) est repris, par une
+    seule requête (GETDEL) : l'entrée est alors None (reprise après le dernier nœud réussi).
+    """
+    if graph.checkpointer is None:
+        return state, config
+
+    request_thread = config["configurable"]["thread_id"]
+    thread_id = await _claim_interrupted(request_thread)
+    if thread_id is not None:
+        run_config = _with_thread(config, thread_id)
+        snapshot = await graph.aget_state(run_config)
+        if snapshot.next and all(node in graph.nodes for node in snapshot.next):
+            return None, run_config
+        # Graphe modifié depuis l'interruption (ou checkpoints expirés) : on repart de zéro
+        await release_thread(graph, run_config)
+    return state, _with_thread(config, f"{request_thread}:{uuid.uuid4().hex}")
+
+
+async def mark_interrupted(graph: Any, config: dict[str, Any]) -> None:
+    """
+    Run en échec : ses checkpoints seront repris par la prochaine requête identique.
+    Un run interrompu plus ancien de la même requête est remplacé et supprimé.
+    """
+    if graph.checkpointer is None:
+        return
+    thread_id = config["configurable"]["thread_id"]
+    request_thread = thread_id.rsplit(":", 1)[0]
+    from app.redis_client import get_redis
+
+    try:
+        previous = await get_redis().set(
+            interrupted_key(request_thread),
+            thread_id,
+            ex=get_settings().graph_checkpoint_ttl,
+            get=True,
+        )
+    except Exception as e:
+        logger.warning("Run interrompu non enregistré (redis): %s", e)
+        return
+    if previous and previous != thread_id:
+        await graph.checkpointer.adelete_thread(previous)
+
+
+async def release_thread(graph: Any, config: dict[str, Any]) -> None:
+    """Run terminé : plus rien à reprendre, les checkpoints du thread sont supprimés."""
+    if graph.checkpointer is not None:
+        await graph.checkpointer.adelete_thread(config["configurable"]["thread_id"])
+
+
+async def thread_values(
+    graph: Any, config: dict[str, Any], fallback: dict[str, Any]
+) -> dict[str, Any]:
+    """État courant du thread (y compris les clés écrites avant une reprise), sinon `fallback`."""
+    if graph.checkpointer is None:
+        return fallback
+    snapshot = await graph.aget_state(config)
+    return snapshot.values or fallback
+
+
+async def run_graph(graph: Any, state: dict[str, Any], config: dict[str, Any]) -> dict[str, Any]:
+    """`ainvoke` avec reprise : un run en échec laisse ses checkpoints pour la requête suivante."""
+    graph_input, run_config = await start_run(graph, state, config)
+    try:
+        result = await graph.ainvoke(graph_input, config=run_config)
+    except (Exception, asyncio.CancelledError):
+        await mark_interrupted(graph, run_config)
+        raise
+    await release_thread(graph, run_config)
+    return result
+
+
+def interrupted_key(request_thread: str) -> str:
+    return f"checkpoint_interrupted:{request_thread}"
+
+
+def _with_thread(config: dict[str, Any], thread_id: str) -> dict[str, Any]:
+    return {**config, "configurable": {**config["configurable"], "thread_id": thread_id}}
+
+
+async def _claim_interrupted(request_thread: str) -> str | None:
+    from app.redis_client import get_redis
+
+    try:
+        return await get_redis().getdel(interrupted_key(request_thread))
+    except Exception as e:
+        logger.warning("Reprise de run (redis) indisponible: %s", e)
+        return None
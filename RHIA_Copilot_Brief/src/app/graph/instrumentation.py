@@ -0,0 +1,52 @@
+import inspect
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.telemetry.metrics import GRAPH_NODE_RUNS, GRAPH_NODE_SECONDS, GRAPH_RETRIES
+
+
+def _observe(graph: str, node: str, started: float, outcome: str) -> None:
+    GRAPH_NODE_SECONDS.labels(graph, node).observe(time.perf_counter() - started)
+    GRAPH_NODE_RUNS.labels(graph, node, outcome).inc()
+
+
+def _count_retry(graph: str, state: dict[str, Any], result: dict[str, Any]) -> None:
+    if result.get("retry_count", 0) > state.get("retry_count", 0):
+        GRAPH_RETRIES.labels(graph).inc()
+
+
+def instrument_node(graph: str, node: str, fn: Callable) -> Callable:
+    """
+    Enveloppe un nœud LangGraph : durée, issue (ok / error) et relances.
+    Un nœud synchrone reste synchrone (LangGraph choisit son mode d'exécution sur la signature).
+    """
+    if inspect.iscoroutinefunction(fn) or (
+        callable(fn) and inspect.iscoroutinefunction(type(fn).__call__)
+    ):
+
+        async def run_async(state: dict[str, Any]) -> dict[str, Any]:
+            started = time.perf_counter()
+            try:
+                result = await fn(state)
+            except Exception:
+                _observe(graph, node, started, "error")
+                raise
+            _observe(graph, node, started, "ok")
+            _count_retry(graph, state, result)
+            return result
+
+        return run_async
+
+    def run(state: dict[str, Any]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            result = fn(state)
+        except Exception:
+            _observe(graph, node, started, "error")
+            raise
+        _observe(graph, node, started, "ok")
+        _count_retry(graph, state, result)
+        return result
+
+    return run
@@ -12,11 +12,15 @@ class AnswerScorer:
         rag_score = state.get("rag_confidence", 0.0)
         llm_base = state.get("confidence", 0.0)
 
-        eval_score = await score_answer(prompt, answer)
+        self_confidence = state.get("self_confidence")
+        if self_confidence is not None:
+            # Génération structurée : l'auto-évaluation du modèle tient lieu d'évaluateur
+            eval_score = self_confidence
+        else:
+            eval_score = await score_answer(prompt, answer, state.get("rag_context", ""))
         final_conf, label = combine_confidences(rag_score, llm_base, eval_score)
 
         return {
-            **state,
             "llm_confidence": eval_score,
             "confidence": final_conf,
             "confidence_label": label,
@@ -0,0 +1,64 @@
+from typing import Any
+
+from app.core.settings import get_settings
+from app.services.confidence_scoring import combine_confidences, score_answers
+from app.services.llm_cache import cache_scope
+from app.services.llm_client import generate_candidates, remember_output
+from app.services.streaming import emit_token
+
+
+class BestOfNExecutor:
+    """
+    Node LangGraph (stratégie best-of-N, remplace call_llm → score → verify et sa boucle) :
+    N candidats générés d'un coup, notés en un seul batch, le meilleur est retenu.
+    """
+
+    async def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        settings = get_settings()
+        prompt = state["prompt"]
+        section_id = state["section_id"]
+        seniority = state["user_preferences"].get("seniority")
+        scope = cache_scope(state.get("brief_data"))
+
+        candidates = await generate_candidates(
+            prompt,
+            section_id,
+            settings.best_of_n,
+            seniority=seniority,
+            bypass_cache=state.get("bypass_cache", False),
+            scope=scope,
+        )
+
+        self_scores = [c.get("self_confidence") for c in candidates]
+        if all(score is not None for score in self_scores):
+            # Génération structurée : l'auto-évaluation tient lieu d'évaluateur
+            eval_scores = self_scores
+        else:
+            eval_scores = await score_answers(
+                prompt, [c["output"] for c in candidates], state.get("rag_context", "")
+            )
+
+        rag_score = state.get("rag_confidence", 0.0)
+        combined = [
+            combine_confidences(rag_score, c["confidence"], e)
+            for c, e in zip(candidates, eval_scores, strict=True)
+        ]
+        best = max(range(len(candidates)), key=lambda i: combined[i][0])
+        chosen = candidates[best]
+
+        emit_token(chosen["output"])
+        if len(candidates) > 1:
+            await remember_output(
+                prompt, section_id, seniority, chosen["raw"], scope, chosen["temperature"]
+            )
+
+        confidence, label = combined[best]
+        return {
+            "draft": chosen["output"],
+            "llm_confidence": eval_scores[best],
+            "self_confidence": chosen.get("self_confidence"),
+            "missing_fields": chosen.get("missing_fields"),
+            "confidence": confidence,
+            "confidence_label": label,
+            "fallback_needed": False,
+        }
@@ -14,5 +14,5 @@ class FeedbackPromptBuilder:
             brief_data=state.get("brief_data", {}),
             user_preferences=state.get("user_preferences", {}),
         )
-        return {**state, "prompt": prompt}
+        return {"prompt": prompt}
 
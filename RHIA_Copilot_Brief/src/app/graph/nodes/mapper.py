@@ -86,7 +86,7 @@ class SectionMapper:
             # Valeur inattendue : on la renvoie telle quelle
             section_name = str(section_key)
 
-        return {**state, "section_id": section_name}
+        return {"section_id": section_name}
 
 
 # Aliases connus pour chaque section
@@ -9,8 +9,9 @@ class PromptBuilder:
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         prompt = build_prompt(
             section_id=state["section_id"],
-            rag_chunks=state.get("rag_chunks", []),
+            rag_context=state.get("rag_context", ""),  # déjà formaté par RagRetriever
             brief_data=state.get("brief_data", {}),
             user_preferences=state.get("user_preferences", {}),
+            previous_sections=state.get("previous_sections"),
         )
-        return {**state, "prompt": prompt}
+        return {"prompt": prompt}
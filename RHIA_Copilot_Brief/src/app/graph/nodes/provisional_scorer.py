@@ -0,0 +1,22 @@
+from typing import Any
+
+from app.services.confidence_scoring import provisional_confidence
+
+
+class ProvisionalScorer:
+    """
+    Node LangGraph (scoring différé) : confiance provisoire,
+    l'évaluation se fait en tâche de fond.
+    """
+
+    def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        confidence, label = provisional_confidence(
+            state.get("rag_confidence", 0.0), state.get("confidence", 0.0)
+        )
+        return {
+            "llm_confidence": state.get("confidence", 0.0),
+            "confidence": confidence,
+            "confidence_label": label,
+            "fallback_needed": False,
+            "scoring_status": "pending",
+        }
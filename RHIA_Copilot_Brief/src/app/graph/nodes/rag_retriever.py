@@ -1,12 +1,13 @@
 from typing import Any
 
 from app.core.constants import THRESHOLD_RAG_SIMILARITY
-from app.services.confidence_scoring import (
-    compute_rag_score,
-    rerank_chunks,
-)
+from app.services.confidence_scoring import compute_rag_score
+from app.services.context_assembler import assemble_context
+from app.services.prompt_builder import format_chunk
 from app.services.rag_retriever import retrieve_chunks
+from app.services.rerank_service import arerank_chunks
 from app.telemetry.logging import logger
+from app.telemetry.metrics import RAG_CHUNKS, RAG_RETRIEVAL_ERRORS
 
 
 class RagRetriever:
@@ -33,22 +34,25 @@ class RagRetriever:
             )
 
             query = f"{section_id} {job_function} {seniority} {language}".strip()
-            reranked = rerank_chunks(query, chunks)
-            filtered = [c for c in reranked if c.get("score", 0.0) >= THRESHOLD_RAG_SIMILARITY]
-            context = "\n\n".join([chunk.get("text", "") for chunk in filtered])
+            reranked = await arerank_chunks(query, chunks)
+            filtered = [c for c in reranked if c.score >= THRESHOLD_RAG_SIMILARITY]
+            selected = assemble_context(filtered, section_id)
+            context = "\n\n".join(format_chunk(chunk) for chunk in selected)
             rag_score = compute_rag_score(filtered)
+            RAG_CHUNKS.labels("retrieved").observe(len(chunks))
+            RAG_CHUNKS.labels("filtered").observe(len(filtered))
+            RAG_CHUNKS.labels("selected").observe(len(selected))
 
             return {
-                **state,
                 "rag_context": context,
-                "rag_chunks": filtered,
+                "rag_chunks": selected,
                 "rag_confidence": rag_score,
             }
 
         except Exception as e:
             logger.warning("RagRetriever failed: %s", e)
+            RAG_RETRIEVAL_ERRORS.inc()
             return {
-                **state,
                 "rag_context": "",
                 "rag_chunks": [],
                 "rag_confidence": 0.0,
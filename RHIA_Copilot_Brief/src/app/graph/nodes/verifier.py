@@ -18,7 +18,6 @@ class Verifier:
             retries += 1
 
         return {
-            **state,
             "fallback_needed": should_retry,
             "retry_count": retries,
         }
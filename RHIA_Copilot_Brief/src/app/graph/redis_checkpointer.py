@@ -0,0 +1,202 @@
+import base64
+import json
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from app.telemetry.logging import logger
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+
+# Séparateur des champs du hash : absent des namespaces LangGraph (":" et "|") et des ids
+SEP = "/"
+WRITES = "w"
+
+
+def thread_key(thread_id: str) -> str:
+    return f"checkpoint:{thread_id}"
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """
+    Checkpointer LangGraph dans Redis : un hash par thread (`{ns}/{checkpoint_id}` pour les
+    checkpoints, `{ns}/{checkpoint_id}/w/{task_id}/{idx}` pour les écritures en attente),
+    TTL renouvelé à chaque écriture.
+    Fail-open : si Redis est indisponible, le graphe tourne sans reprise possible.
+    """
+
+    def __init__(self, ttl: int):
+        super().__init__()
+        self.ttl = ttl
+
+    # --- Sérialisation ------------------------------------------------------
+
+    def _dump(self, value: Any) -> dict[str, str]:
+        type_, data = self.serde.dumps_typed(value)
+        return {"type": type_, "data": base64.b64encode(data).decode("ascii")}
+
+    def _load(self, record: dict[str, str]) -> Any:
+        return self.serde.loads_typed((record["type"], base64.b64decode(record["data"])))
+
+    @staticmethod
+    def _config(thread_id: str, ns: str, checkpoint_id: str) -> RunnableConfig:
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": ns,
+                "checkpoint_id": checkpoint_id,
+            }
+        }
+
+    def _to_tuple(
+        self, thread_id: str, ns: str, checkpoint_id: str, fields: dict[str, bytes]
+    ) -> CheckpointTuple:
+        record = json.loads(fields[f"{ns}{SEP}{checkpoint_id}"])
+        prefix = f"{ns}{SEP}{checkpoint_id}{SEP}{WRITES}{SEP}"
+        writes = []
+        for field in sorted(f for f in fields if f.startswith(prefix)):
+            write = json.loads(fields[field])
+            writes.append((write["task_id"], write["channel"], self._load(write["value"])))
+        parent_id = record.get("parent_id")
+        return CheckpointTuple(
+            config=self._config(thread_id, ns, checkpoint_id),
+            checkpoint=self._load(record["checkpoint"]),
+            metadata=self._load(record["metadata"]),
+            parent_config=self._config(thread_id, ns, parent_id) if parent_id else None,
+            pending_writes=writes,
+        )
+
+    # --- Accès Redis --------------------------------------------------------
+
+    async def _fields(self, thread_id: str) -> dict[str, bytes]:
+        from app.redis_client import get_redis_bytes
+
+        raw = await get_redis_bytes().hgetall(thread_key(thread_id))
+        return {field.decode("utf-8"): value for field, value in raw.items()}
+
+    @staticmethod
+    def _checkpoint_ids(fields: dict[str, bytes], ns: str) -> list[str]:
+        """Ids des checkpoints du namespace, du plus récent au plus ancien (uuid6 ordonnés)."""
+        depth = ns.count(SEP) + 1
+        ids = [
+            f[len(ns) + 1:]
+            for f in fields
+            if f.startswith(f"{ns}{SEP}") and f.count(SEP) == depth
+        ]
+        return sorted(ids, reverse=True)
+
+    async def _write(self, thread_id: str, mapping: dict[str, str]) -> None:
+        from app.redis_client import get_redis_bytes
+
+        async with get_redis_bytes().pipeline(transaction=True) as pipe:
+            pipe.hset(thread_key(thread_id), mapping=mapping)
+            pipe.expire(thread_key(thread_id), self.ttl)
+            await pipe.execute()
+
+    # --- Interface BaseCheckpointSaver (asynchrone uniquement) ---------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        ns = configurable.get("checkpoint_ns", "")
+        try:
+            fields = await self._fields(thread_id)
+        except Exception as e:
+            logger.warning("Checkpoints (redis) indisponibles: %s", e)
+            return None
+
+        checkpoint_id = configurable.get("checkpoint_id")
+        if checkpoint_id is None:
+            ids = self._checkpoint_ids(fields, ns)
+            if not ids:
+                return None
+            checkpoint_id = ids[0]
+        elif f"{ns}{SEP}{checkpoint_id}" not in fields:
+            return None
+        return self._to_tuple(thread_id, ns, checkpoint_id, fields)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        if config is None:
+            return
+        thread_id = config["configurable"]["thread_id"]
+        ns = config["configurable"].get("checkpoint_ns", "")
+        try:
+            fields = await self._fields(thread_id)
+        except Exception as e:
+            logger.warning("Checkpoints (redis) indisponibles: %s", e)
+            return
+
+        before_id = before["configurable"]["checkpoint_id"] if before else None
+        count = 0
+        for checkpoint_id in self._checkpoint_ids(fields, ns):
+            if before_id is not None and checkpoint_id >= before_id:
+                continue
+            item = self._to_tuple(thread_id, ns, checkpoint_id, fields)
+            if filter and any(item.metadata.get(k) != v for k, v in filter.items()):
+                continue
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        ns = configurable.get("checkpoint_ns", "")
+        record = {
+            "checkpoint": self._dump(checkpoint),
+            "metadata": self._dump(metadata),
+            "parent_id": configurable.get("checkpoint_id"),
+        }
+        try:
+            await self._write(thread_id, {f"{ns}{SEP}{checkpoint['id']}": json.dumps(record)})
+        except Exception as e:
+            logger.warning("Checkpoint non enregistré (redis): %s", e)
+        return self._config(thread_id, ns, checkpoint["id"])
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        configurable = config["configurable"]
+        ns = configurable.get("checkpoint_ns", "")
+        prefix = f"{ns}{SEP}{configurable['checkpoint_id']}{SEP}{WRITES}"
+        mapping = {
+            f"{prefix}{SEP}{task_id}{SEP}{idx:04d}": json.dumps(
+                {"task_id": task_id, "channel": channel, "value": self._dump(value)}
+            )
+            for idx, (channel, value) in enumerate(writes)
+        }
+        try:
+            await self._write(configurable["thread_id"], mapping)
+        except Exception as e:
+            logger.warning("Écritures de checkpoint non enregistrées (redis): %s", e)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        from app.redis_client import get_redis_bytes
+
+        try:
+            await get_redis_bytes().delete(thread_key(thread_id))
+        except Exception as e:
+            logger.warning("Checkpoints non supprimés (redis): %s", e)
@@ -1,21 +1,38 @@
 from typing import Any, TypedDict
 
+from app.models.chunk import Chunk
+
 
 class BriefState(TypedDict, total=False):
+    """
+    Les nœuds ne renvoient que les clés qu'ils écrivent (delta) ; LangGraph les fusionne clé par clé
+    (réducteur par défaut : dernière valeur, chaque clé n'a qu'un écrivain par étape).
+    Hors graphe, fusionner soi-même : `{**state, **node(state)}`.
+    """
+
     session_id: str
     section_id: str
+    current_section: str | int
 
     user_preferences: dict[str, Any]
     brief_data: dict[str, Any]
 
-    rag_chunks: list[dict[str, Any]] | None
+    rag_chunks: list[Chunk] | None
     rag_confidence: float | None
     prompt: str | None
     draft: str | None
     confidence: float | None
     llm_confidence: float | None
+    self_confidence: float | None
+    missing_fields: list[str] | None
     confidence_label: str | None
     fallback_needed: bool | None
+    retry_count: int
+    scoring_status: str
+    bypass_cache: bool
+    previous_sections: dict[str, str] | None
+    rag_context: str | None
+    rag_error: str | None
 
     user_feedback: str | None
     previous_output: str | None
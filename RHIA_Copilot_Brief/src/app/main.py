@@ -1,5 +1,7 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 import uvicorn
@@ -7,17 +9,31 @@ import logging
 import structlog
 
 from app.api.v1.router import router_v1
+from app.core.resources import registry
 from app.core.settings import get_settings
+from app.telemetry.metrics import render_metrics
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # === Ressources partagées (pools de connexions, modèles, graphes) ===
+    await registry.startup(settings)
+    try:
+        yield
+    finally:
+        await registry.shutdown()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="Job Brief Builder API",
         version="1.0.0",
         docs_url="/docs",
         redoc_url=None,
-        openapi_url="/openapi.json"
+        openapi_url="/openapi.json",
+        lifespan=lifespan,
     )
 
     # === Middleware sécurité ===
@@ -46,6 +62,26 @@ def create_app() -> FastAPI:
     # === Routes ===
     app.include_router(router_v1, prefix="/v1")
 
+    # === Sondes (liveness / readiness) ===
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/ready")
+    async def ready():
+        if not registry.ready:
+            return JSONResponse(
+                status_code=503,
+                content={"status": "warming_up", "error": registry.warmup_error},
+            )
+        return {"status": "ready", "timings": registry.timings}
+
+    # === Métriques Prometheus (agrégées entre workers si PROMETHEUS_MULTIPROC_DIR) ===
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        content, content_type = render_metrics()
+        return Response(content=content, media_type=content_type)
+
     return app
 
 
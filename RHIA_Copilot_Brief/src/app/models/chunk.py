@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Métadonnées d'un chunk conservées (et injectées dans le prompt) ; le reste du payload est ignoré
+RAG_METADATA_FIELDS = ("source", "title")
+
+
+@dataclass(frozen=True, slots=True)
+class Chunk:
+    """
+    Résultat RAG compact et immuable : partagé tel quel entre le cache de recherche,
+    le reranking et l'état du graphe (pas de copie défensive).
+    `vector` ne sert qu'à la sélection MMR et n'est pas conservé dans l'état.
+    """
+
+    id: str
+    text: str
+    score: float
+    rerank_score: float | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+    vector: np.ndarray | None = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_payload(
+        cls, id: str, score: float, payload: Mapping[str, Any], vector: np.ndarray | None = None
+    ) -> Chunk:
+        metadata = {k: payload[k] for k in RAG_METADATA_FIELDS if payload.get(k) not in (None, "")}
+        text = payload.get("text") or ""
+        return cls(id=id, text=text, score=score, metadata=metadata, vector=vector)
+
+    @property
+    def relevance(self) -> float:
+        """Score du cross-encoder si le chunk a été reranké, sinon similarité vectorielle."""
+        return self.score if self.rerank_score is None else self.rerank_score
+
+    def with_rerank_score(self, rerank_score: float) -> Chunk:
+        return replace(self, rerank_score=rerank_score)
+
+    def without_vector(self) -> Chunk:
+        return self if self.vector is None else replace(self, vector=None)
@@ -1,21 +1,82 @@
 import redis.asyncio as redis
 import json
+import time
 from typing import Any
 import os
+from typing import TYPE_CHECKING
 
-r = redis.Redis(
-    host=os.getenv("REDIS_HOST"),
-    port=int(os.getenv("REDIS_PORT")),
-    password=os.getenv("REDIS_PASSWORD"),
-    decode_responses=True
-)
+from app.telemetry.metrics import REDIS_COMMAND_SECONDS
+
+if TYPE_CHECKING:
+    import redis as sync_redis
+
+_clients: dict[bool, redis.Redis] = {}
+_sync_client: "sync_redis.Redis | None" = None
+
+
+class InstrumentedRedis(redis.Redis):
+    """Mesure la latence de chaque commande (un pipeline est mesuré par son `EXEC`)."""
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            elapsed = time.perf_counter() - started
+            REDIS_COMMAND_SECONDS.labels(str(args[0]).upper()).observe(elapsed)
+
+
+def _connection_kwargs() -> dict[str, Any]:
+    return {
+        "host": os.getenv("REDIS_HOST"),
+        "port": int(os.getenv("REDIS_PORT")),
+        "password": os.getenv("REDIS_PASSWORD"),
+    }
+
+
+def _create_client(decode_responses: bool) -> redis.Redis:
+    return InstrumentedRedis(**_connection_kwargs(), decode_responses=decode_responses)
+
+
+def get_redis() -> redis.Redis:
+    """Client texte (JSON de session, compteurs). Créé au premier usage, pas à l'import."""
+    if True not in _clients:
+        _clients[True] = _create_client(decode_responses=True)
+    return _clients[True]
+
+
+def get_redis_bytes() -> redis.Redis:
+    """Client binaire (vecteurs float32, blobs) : pas de décodage UTF-8."""
+    if False not in _clients:
+        _clients[False] = _create_client(decode_responses=False)
+    return _clients[False]
+
+
+def get_sync_redis() -> "sync_redis.Redis":
+    """Client texte synchrone, pour les scripts hors event loop (seed, maintenance)."""
+    global _sync_client
+    if _sync_client is None:
+        import redis as sync_redis
+
+        _sync_client = sync_redis.Redis(**_connection_kwargs(), decode_responses=True)
+    return _sync_client
+
+
+async def close_redis():
+    global _sync_client
+    for client in _clients.values():
+        await client.close()
+    _clients.clear()
+    if _sync_client is not None:
+        _sync_client.close()
+        _sync_client = None
 
 
 async def set_session_data(session_id: str, key: str, value: Any):
     redis_key = f"brief:{session_id}:{key}"
-    await r.set(redis_key, json.dumps(value))
+    await get_redis().set(redis_key, json.dumps(value))
 
 async def get_session_data(session_id: str, key: str) -> Any:
     redis_key = f"brief:{session_id}:{key}"
-    data = await r.get(redis_key)
+    data = await get_redis().get(redis_key)
     return json.loads(data) if data else None
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any
+
+from app.redis_client import get_session_data, set_session_data
+from app.services.streaming import token_sink
+from app.telemetry.logging import logger
+
+_tasks: set[asyncio.Task] = set()
+
+
+def score_key(section_id: str) -> str:
+    return f"score:{section_id}"
+
+
+async def _store(session_id: str, section_id: str, record: dict[str, Any]) -> None:
+    try:
+        await set_session_data(session_id, score_key(section_id), record)
+    except Exception as e:
+        logger.warning("Score non enregistré dans la session (redis): %s", e)
+
+
+async def _score_and_verify(state: dict[str, Any], config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Évalue le draft hors du chemin critique, puis applique la décision du `Verifier` :
+    si la confiance reste trop basse, la section est régénérée (graphe complet, scoring inline).
+    """
+    from app.graph.brief_generator import get_brief_graph
+    from app.graph.checkpointing import run_graph, thread_config
+    from app.graph.nodes.answer_scorer import AnswerScorer
+    from app.graph.nodes.verifier import Verifier
+
+    # Tâche détachée : une éventuelle régénération ne doit pas écrire dans le flux SSE d'origine
+    token_sink.set(None)
+    section_id = state["current_section"]
+    try:
+        # Les nœuds renvoient des deltas : fusion manuelle hors du graphe
+        state = {**state, "confidence": state.get("llm_confidence", 0.0)}
+        state = {**state, **await AnswerScorer()(state)}
+        verified = {**state, **Verifier()(state)}
+        revised = bool(verified.get("fallback_needed"))
+        # Thread distinct : une requête /generate concurrente ne doit pas reprendre ce run
+        config = thread_config(config, "rescore", state["session_id"], section_id, verified)
+        final = await run_graph(get_brief_graph(), verified, config) if revised else verified
+        record = {
+            "status": "done",
+            "confidence": final["confidence"],
+            "confidence_label": final.get("confidence_label", ""),
+            "fallback_needed": final.get("fallback_needed", False),
+            "retry_count": final.get("retry_count", 0),
+            "revised": revised,
+            "markdown": final["draft"] if revised else None,
+        }
+    except Exception as e:
+        logger.exception("Scoring différé en échec pour %s: %s", section_id, e)
+        record = {"status": "error", "detail": str(e)}
+
+    await _store(state["session_id"], section_id, record)
+    return record
+
+
+async def schedule_scoring(state: dict[str, Any], config: dict[str, Any]) -> asyncio.Task:
+    """Enregistre le score provisoire (`pending`) puis lance l'évaluation en tâche de fond."""
+    await _store(
+        state["session_id"],
+        state["current_section"],
+        {
+            "status": "pending",
+            "confidence": state.get("confidence", 0.0),
+            "confidence_label": state.get("confidence_label", ""),
+        },
+    )
+    task = asyncio.create_task(_score_and_verify(state, config))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
+
+
+async def get_score(session_id: str, section_id: str) -> dict[str, Any] | None:
+    return await get_session_data(session_id, score_key(section_id))
+
+
+async def close_background_scoring() -> None:
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,131 @@
+import asyncio
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generic, TypeVar
+
+from app.telemetry.logging import logger
+from app.telemetry.metrics import BATCH_QUEUE_DEPTH, BATCH_SIZE, BATCH_WAIT_SECONDS
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+Entry = tuple[list[T], asyncio.Future, float]
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Regroupe les éléments soumis par des appelants concurrents en micro-batches
+    (bornés par `max_batch` éléments et `max_wait_ms`), exécute `fn` une seule fois par batch
+    dans un thread dédié, puis rend à chaque appelant la tranche de résultats qui le concerne.
+    Profondeur de file, taille des batches et temps d'attente sont exportés par `name`.
+    File et worker sont liés à l'event loop du premier appel : ils sont recréés si la loop
+    change (tests, workers successifs) ou si le worker s'est arrêté.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list[T]], Sequence[R]],
+        max_batch: int,
+        max_wait_ms: float,
+        name: str = "default",
+    ):
+        self.fn = fn
+        self.name = name
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        # Un seul thread : les modèles ne gagnent rien à être appelés en parallèle
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="micro-batch")
+        self._queue: asyncio.Queue[Entry] | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def submit(self, items: Sequence[T]) -> Sequence[R]:
+        items = list(items)
+        if not items:
+            return []
+
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        self._queue.put_nowait((items, future, loop.time()))
+        BATCH_QUEUE_DEPTH.labels(self.name).set(self._queue.qsize())
+        return await future
+
+    @staticmethod
+    def _fail(batch: list[Entry], error: BaseException) -> None:
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            try:
+                await self._process(queue, batch)
+            except asyncio.CancelledError:
+                # Arrêt du worker : le reste de la file est échoué par `close`
+                self._fail(batch, RuntimeError(f"Micro-batcher {self.name} arrêté"))
+                raise
+            except Exception as e:
+                # Une erreur inattendue échoue le batch courant sans tuer le worker
+                logger.exception("Micro-batch %s en échec: %s", self.name, e)
+                self._fail(batch, e)
+
+    async def _process(self, queue: asyncio.Queue[Entry], batch: list[Entry]) -> None:
+        """Complète `batch` (modifié en place) jusqu'à `max_batch` ou `max_wait`, puis l'exécute."""
+        loop = asyncio.get_running_loop()
+        size = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while size < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(queue.get(), timeout)
+            except TimeoutError:
+                break
+            batch.append(entry)
+            size += len(entry[0])
+
+        started = loop.time()
+        BATCH_QUEUE_DEPTH.labels(self.name).set(queue.qsize())
+        BATCH_SIZE.labels(self.name).observe(size)
+        for _, _, enqueued in batch:
+            BATCH_WAIT_SECONDS.labels(self.name).observe(started - enqueued)
+
+        flat = [item for items, _, _ in batch for item in items]
+        results = await loop.run_in_executor(self._executor, self.fn, flat)
+        if len(results) != len(flat):
+            raise ValueError(
+                f"Micro-batch {self.name}: {len(results)} résultats pour {len(flat)} éléments"
+            )
+
+        offset = 0
+        for items, future, _ in batch:
+            if not future.done():
+                future.set_result(results[offset:offset + len(items)])
+            offset += len(items)
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._queue is not None:
+            # Aucun appelant ne doit rester suspendu sur son future
+            pending = []
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+            self._fail(pending, RuntimeError(f"Micro-batcher {self.name} arrêté"))
+            self._queue = None
+            self._loop = None
+        self._executor.shutdown(wait=False)
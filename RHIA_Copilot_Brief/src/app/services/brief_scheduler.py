@@ -0,0 +1,230 @@
+import asyncio
+import time
+from typing import Any
+
+from app.core.constants import (
+    SECTION_DEPENDENCIES,
+    SECTION_IDS,
+    SECTION_LABELS_TO_SLUGS,
+    SECTION_SLUGS_TO_LABELS,
+)
+from app.core.settings import get_settings
+from app.redis_client import set_session_data
+from app.services.single_flight import get_single_flight
+from app.telemetry.logging import logger
+
+PROGRESS_KEY = "generation_progress"
+DRAFTS_KEY = "drafts"
+
+_runs: dict[str, "BriefRun"] = {}
+_tasks: set[asyncio.Task] = set()
+
+
+PENDING_STATUSES = ("pending", "waiting", "running")
+
+
+def enabled_sections(user_preferences: dict[str, Any]) -> list[str]:
+    """
+    Slugs des sections activées, dans l'ordre contractuel.
+    ValueError si la liste de bascules ne couvre pas exactement les sections canoniques.
+    """
+    toggles = user_preferences.get("sections") or []
+    if len(toggles) != len(SECTION_IDS):
+        raise ValueError(f"{len(toggles)} sections activables reçues, {len(SECTION_IDS)} attendues")
+    return [
+        SECTION_LABELS_TO_SLUGS[label]
+        for label, included in zip(SECTION_IDS, toggles, strict=True)
+        if included
+    ]
+
+
+def section_dependencies(sections: list[str]) -> dict[str, list[str]]:
+    """`SECTION_DEPENDENCIES` restreint aux sections activées (dépendance désactivée ignorée)."""
+    enabled = set(sections)
+    return {
+        slug: [dep for dep in SECTION_DEPENDENCIES.get(slug, []) if dep in enabled]
+        for slug in sections
+    }
+
+
+class BriefRun:
+    """
+    Génération du brief complet : une tâche par section, qui attend les sections dont elle
+    dépend puis passe par le graphe de section ; les sections indépendantes tournent en
+    parallèle (sémaphore `brief_max_concurrency`).
+    Les sections déjà validées ne sont pas régénérées, leur markdown sert de dépendance.
+    La progression et les drafts sont écrits dans la session au fil de l'eau.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        user_preferences: dict[str, Any],
+        brief_data: dict[str, Any],
+        approvals: dict[str, Any],
+        config: dict[str, Any] | None = None,
+    ):
+        self.session_id = session_id
+        self.user_preferences = user_preferences
+        self.brief_data = brief_data
+        self.config = config
+        self.sections = enabled_sections(user_preferences)
+        self.dependencies = section_dependencies(self.sections)
+        self.drafts: dict[str, str] = {}
+        self.progress: dict[str, dict[str, Any]] = {}
+        for slug in self.sections:
+            label = SECTION_SLUGS_TO_LABELS[slug]
+            approval = approvals.get(label)
+            if approval:
+                self.drafts[slug] = approval["markdown"]
+            self.progress[slug] = {
+                "label": label,
+                "status": "approved" if approval else "pending",
+                "depends_on": self.dependencies[slug],
+            }
+        self._lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(get_settings().brief_max_concurrency)
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def _update(self, slug: str, **fields: Any) -> None:
+        async with self._lock:
+            self.progress[slug].update(fields)
+            try:
+                await set_session_data(self.session_id, PROGRESS_KEY, self.progress)
+                if fields.get("status") == "done":
+                    await set_session_data(self.session_id, DRAFTS_KEY, self.drafts)
+            except Exception as e:
+                logger.warning("Progression du brief non enregistrée (redis): %s", e)
+
+    def _initial_state(self, slug: str) -> dict[str, Any]:
+        previous = {
+            SECTION_SLUGS_TO_LABELS[dep]: self.drafts[dep]
+            for dep in self.dependencies[slug]
+            if dep in self.drafts
+        }
+        return {
+            "session_id": self.session_id,
+            "current_section": slug,
+            "user_preferences": self.user_preferences,
+            "brief_data": self.brief_data,
+            "retry_count": 0,
+            "previous_sections": previous or None,
+        }
+
+    async def _prefetch(self) -> None:
+        """Une seule recherche groupée pour toutes les sections : les nœuds RAG lisent le cache."""
+        from app.services.rag_retriever import RetrievalRequest, retrieve_chunks_many
+
+        seniority = self.user_preferences.get("seniority", "").strip()
+        language = self.user_preferences.get("language", "").strip()
+        requests = [
+            RetrievalRequest(slug, job_function, seniority, language)
+            for slug in self.sections
+            if self.progress[slug]["status"] == "pending"
+            and (job_function := self.brief_data.get(slug, {}).get("job_function", "").strip())
+        ]
+        try:
+            await retrieve_chunks_many(requests)
+        except Exception as e:
+            logger.warning("Préchargement RAG du brief en échec: %s", e)
+
+    async def _run_section(self, slug: str) -> None:
+        dependencies = [self._tasks[dep] for dep in self.dependencies[slug] if dep in self._tasks]
+        if dependencies:
+            await self._update(slug, status="waiting")
+            # Une dépendance en échec n'empêche pas la section : elle est rédigée sans son draft
+            await asyncio.gather(*dependencies)
+
+        from app.graph.brief_generator import get_brief_graph
+        from app.graph.checkpointing import run_graph, thread_config
+
+        async with self._semaphore:
+            await self._update(slug, status="running")
+            started = time.perf_counter()
+            try:
+                state = self._initial_state(slug)
+                config = thread_config(self.config, "brief", self.session_id, slug, state)
+                result = await run_graph(get_brief_graph(), state, config)
+            except Exception as e:
+                logger.exception("Génération du brief: section %s en échec: %s", slug, e)
+                duration = round(time.perf_counter() - started, 3)
+                await self._update(slug, status="error", error=str(e), duration=duration)
+                return
+
+            self.drafts[slug] = result["draft"]
+            await self._update(
+                slug,
+                status="done",
+                confidence=result["confidence"],
+                confidence_label=result.get("confidence_label", ""),
+                fallback_needed=result.get("fallback_needed", False),
+                duration=round(time.perf_counter() - started, 3),
+            )
+
+    async def _save_progress(self) -> None:
+        async with self._lock:
+            try:
+                await set_session_data(self.session_id, PROGRESS_KEY, self.progress)
+            except Exception as e:
+                logger.warning("Progression du brief non enregistrée (redis): %s", e)
+
+    async def execute(self) -> dict[str, Any]:
+        await self._save_progress()
+        try:
+            await self._prefetch()
+            # Toutes les tâches existent avant que la première ne démarre (elles s'attendent)
+            for slug in self.sections:
+                if self.progress[slug]["status"] == "pending":
+                    self._tasks[slug] = asyncio.create_task(self._run_section(slug))
+            await asyncio.gather(*self._tasks.values())
+        except asyncio.CancelledError:
+            # Arrêt du process : sans ce marquage, la progression resterait `running` dans Redis
+            for progress in self.progress.values():
+                if progress["status"] in PENDING_STATUSES:
+                    progress.update(status="error", error="Génération interrompue")
+            await self._save_progress()
+            raise
+        return {"progress": self.progress}
+
+
+def start_brief_generation(
+    session_id: str,
+    user_preferences: dict[str, Any],
+    brief_data: dict[str, Any],
+    approvals: dict[str, Any],
+    config: dict[str, Any] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """
+    Lance la génération du brief complet en tâche de fond et renvoie la progression initiale.
+    Une génération déjà en cours pour la session est réutilisée (doublons dans le process
+    ou sur un autre réplica via le single-flight).
+    """
+    current = _runs.get(session_id)
+    if current is not None:
+        return current.progress
+
+    run = BriefRun(session_id, user_preferences, brief_data, approvals, config)
+    _runs[session_id] = run
+    # Un brief dure bien plus qu'un /generate : le suiveur d'un autre réplica attend en conséquence
+    wait_timeout = get_settings().brief_section_timeout * len(run.sections)
+    task = asyncio.create_task(
+        get_single_flight().run(f"brief:{session_id}", run.execute, wait_timeout=wait_timeout)
+    )
+    _tasks.add(task)
+
+    def _done(task: asyncio.Task) -> None:
+        _tasks.discard(task)
+        _runs.pop(session_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Génération du brief en échec pour %s: %s", session_id, task.exception())
+
+    task.add_done_callback(_done)
+    return run.progress
+
+
+async def close_brief_scheduler() -> None:
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    _runs.clear()
@@ -1,65 +1,135 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+from typing import TYPE_CHECKING, Any
 
-from langchain.evaluation import ScoreStringEvalChain
-from langchain_openai import ChatOpenAI
-from sentence_transformers import CrossEncoder
+from app.core.settings import get_settings
+from app.models.chunk import Chunk
+from app.services.inference_client import RemoteReranker, get_inference_client
+from app.services.llm_governor import PRIORITY_SCORING, estimate_tokens, get_llm_governor
+from app.services.model_loader import load_reranker
+from app.services.openai_transport import get_openai_http_client
 
-_reranker: CrossEncoder | None = None
+if TYPE_CHECKING:
+    from langchain.evaluation import ScoreStringEvalChain
+
+_reranker: Any | None = None
 _score_chain: ScoreStringEvalChain | None = None
 
+SCORE_MODEL = "gpt-3.5-turbo"
+# Réponse de l'évaluateur (justification + note), réservée dans le budget TPM
+SCORE_MAX_TOKENS = 300
+
 
-def get_reranker() -> CrossEncoder | None:
+def get_reranker() -> Any | None:
+    """CrossEncoder local, ou proxy vers le serveur d'inférence en mode sidecar."""
     global _reranker
     if _reranker is None:
         try:
-            _reranker = CrossEncoder("cross-encoder/ms-marco-MiniLM-L-6-v2")
+            if get_settings().inference_mode == "sidecar":
+                _reranker = RemoteReranker(get_inference_client(), load_reranker)
+            else:
+                _reranker = load_reranker()
         except Exception:
             _reranker = None
     return _reranker
 
 
-def rerank_chunks(query: str, chunks: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def apply_rerank_scores(chunks: list[Chunk], scores) -> list[Chunk]:
+    reranked = [
+        chunk.with_rerank_score(float(score))
+        for chunk, score in zip(chunks, scores, strict=True)
+    ]
+    return sorted(reranked, key=lambda c: c.rerank_score, reverse=True)
+
+
+def rerank_chunks(query: str, chunks: list[Chunk]) -> list[Chunk]:
     model = get_reranker()
     if model is None:
         return chunks
-    pairs = [[query, c.get("text", "")] for c in chunks]
-    scores = model.predict(pairs)
-    for chunk, score in zip(chunks, scores, strict=False):
-        chunk["rerank_score"] = float(score)
-    return sorted(chunks, key=lambda c: c.get("rerank_score", 0), reverse=True)
+    pairs = [[query, c.text] for c in chunks]
+    return apply_rerank_scores(chunks, model.predict(pairs))
 
 
-def compute_rag_score(chunks: list[dict[str, Any]]) -> float:
+def compute_rag_score(chunks: list[Chunk]) -> float:
     if not chunks:
         return 0.0
-    return sum(c.get("rerank_score", c.get("score", 0.0)) for c in chunks) / len(chunks)
+    return sum(c.relevance for c in chunks) / len(chunks)
 
 
 def get_score_chain() -> ScoreStringEvalChain:
     global _score_chain
     if _score_chain is None:
-        llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
+        from langchain.evaluation import ScoreStringEvalChain
+        from langchain_openai import ChatOpenAI
+
+        llm = ChatOpenAI(
+            model=SCORE_MODEL,
+            temperature=0,
+            max_retries=0,
+            timeout=get_settings().llm_timeout,
+            http_async_client=get_openai_http_client(),
+        )
         _score_chain = ScoreStringEvalChain.from_llm(llm, criteria="relevance")
     return _score_chain
 
 
-async def score_answer(prompt: str, answer: str) -> float:
+async def _evaluate(prompt: str, answer: str) -> dict:
+    if get_settings().llm_provider == "fake":
+        from app.services.fake_llm import get_fake_llm
+
+        return await get_fake_llm().evaluate(prompt, answer)
+    return await get_score_chain().aevaluate_strings(prediction=answer, input=prompt)
+
+
+async def score_answer(prompt: str, answer: str, rag_context: str = "") -> float:
+    """
+    Note du draft sur [0, 1] : évaluateur local par défaut (`answer_scorer="local"`),
+    évaluateur LLM (ScoreStringEvalChain) en option.
+    """
     try:
-        chain = get_score_chain()
-        result = await chain.aevaluate_strings(prediction=answer, input=prompt)
+        if get_settings().answer_scorer == "local":
+            from app.services.local_scorer import score_locally
+
+            return await score_locally(prompt, answer, rag_context)
+
+        result = await get_llm_governor().run(
+            lambda: _evaluate(prompt, answer),
+            model=SCORE_MODEL,
+            tokens=estimate_tokens(prompt + answer, SCORE_MAX_TOKENS),
+            priority=PRIORITY_SCORING,
+        )
         return float(result.get("score", 0)) / 10.0
     except Exception:
         return 0.0
 
 
+async def score_answers(prompt: str, answers: list[str], rag_context: str = "") -> list[float]:
+    """Note de plusieurs drafts du même prompt : un seul batch en mode local."""
+    if get_settings().answer_scorer == "local":
+        from app.services.local_scorer import score_locally_many
+
+        try:
+            return await score_locally_many(prompt, answers, rag_context)
+        except Exception:
+            return [0.0] * len(answers)
+    return list(await asyncio.gather(*(score_answer(prompt, a, rag_context) for a in answers)))
+
+
+def confidence_label(confidence: float) -> str:
+    if confidence >= 0.8:
+        return "élevée"
+    if confidence >= 0.6:
+        return "moyenne"
+    return "faible"
+
+
 def combine_confidences(rag_score: float, llm_score: float, eval_score: float) -> tuple[float, str]:
     final = (rag_score + llm_score + eval_score) / 3.0
-    if final >= 0.8:
-        label = "élevée"
-    elif final >= 0.6:
-        label = "moyenne"
-    else:
-        label = "faible"
-    return final, label
+    return final, confidence_label(final)
+
+
+def provisional_confidence(rag_score: float, llm_score: float) -> tuple[float, str]:
+    """Confiance avant évaluation du draft (scoring différé) : RAG + heuristique LLM."""
+    provisional = (rag_score + llm_score) / 2.0
+    return provisional, confidence_label(provisional)
@@ -0,0 +1,93 @@
+from functools import lru_cache
+
+import numpy as np
+from app.core.settings import get_settings
+from app.models.chunk import Chunk
+from app.services.prompt_builder import format_chunk
+from app.telemetry.logging import logger
+
+# Repli quand tiktoken n'est pas installé ou que ses encodages ne sont pas téléchargeables
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=4)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken absent : comptage de tokens approximatif")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass  # modèle inconnu de tiktoken
+    except Exception as e:
+        # Fichier d'encodage non téléchargeable (hors ligne) : ne doit pas vider le contexte RAG
+        logger.warning("Encodage tiktoken de %s indisponible: %s", model, e)
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning("Encodage tiktoken indisponible, comptage de tokens approximatif: %s", e)
+        return None
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    """Nombre de tokens de `text` avec le tokenizer du modèle de génération."""
+    encoding = _encoding(model or get_settings().openai_model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text))
+
+
+def mmr_order(relevance: np.ndarray, vectors: np.ndarray, diversity: float) -> list[int]:
+    """
+    Ordre de sélection par Maximal Marginal Relevance :
+    argmax (1 - diversity) * pertinence - diversity * similarité max aux chunks déjà retenus.
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    unit = vectors / np.maximum(norms, 1e-12)
+    similarity = unit @ unit.T
+
+    n = len(relevance)
+    selected: list[int] = []
+    remaining = np.ones(n, dtype=bool)
+    max_similarity = np.zeros(n, dtype=np.float32)
+    for _ in range(n):
+        scores = (1.0 - diversity) * relevance - diversity * max_similarity
+        scores[~remaining] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        remaining[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
+
+
+def assemble_context(chunks: list[Chunk], section_id: str) -> list[Chunk]:
+    """
+    Chunks injectés dans le prompt : ordre MMR (écarte les quasi-doublons ; pertinence = score
+    du cross-encoder si les chunks ont été rerankés), puis remplissage glouton du budget de
+    tokens de la section (texte + métadonnées autorisées, tels que formatés).
+    Les chunks retenus perdent leur vecteur, inutile au-delà de la sélection.
+    """
+    if not chunks:
+        return []
+
+    settings = get_settings()
+    budget = settings.rag_context_section_budgets.get(section_id, settings.rag_context_token_budget)
+
+    order = list(range(len(chunks)))
+    if all(c.vector is not None for c in chunks):
+        relevance = np.asarray([c.relevance for c in chunks], dtype=np.float32)
+        if all(c.rerank_score is not None for c in chunks):
+            # Logits du cross-encoder ramenés dans [0, 1], l'échelle du terme de similarité
+            relevance = 1.0 / (1.0 + np.exp(-relevance))
+        vectors = np.stack([c.vector for c in chunks])
+        order = mmr_order(relevance, vectors, settings.rag_mmr_diversity)
+
+    selected = []
+    for i in order:
+        cost = count_tokens(format_chunk(chunks[i]))
+        if cost <= budget:
+            selected.append(chunks[i].without_vector())
+            budget -= cost
+    return selected
@@ -0,0 +1,120 @@
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Sequence
+
+import numpy as np
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+from app.telemetry.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalisation de la clé de cache : NFC, espaces compactés, minuscules.
+    MiniLM est un modèle "uncased" : la casse ne change pas l'embedding.
+    """
+    query = unicodedata.normalize("NFC", query)
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+
+class EmbeddingCache:
+    """
+    Cache à deux niveaux pour les embeddings de requêtes :
+    LRU borné en mémoire, puis Redis (octets float32) partagé entre workers.
+    """
+
+    def __init__(self, model_name: str, maxsize: int, ttl: int):
+        self.model_name = model_name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru: OrderedDict[str, np.ndarray] = OrderedDict()
+        # Le LRU est aussi lu depuis les threads (chemin synchrone)
+        self._lock = threading.Lock()
+
+    def key(self, query: str) -> str:
+        digest = hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"emb:{self.model_name}:{digest}"
+
+    # --- Niveau 1 : mémoire -------------------------------------------------
+
+    def get_local(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+            return vector
+
+    def put_local(self, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+
+    # --- Niveau 2 : Redis ---------------------------------------------------
+
+    async def get_many(self, queries: Sequence[str]) -> list[np.ndarray | None]:
+        keys = [self.key(q) for q in queries]
+        vectors = [self.get_local(k) for k in keys]
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        EMBEDDING_CACHE_HITS.labels("memory").inc(len(keys) - len(missing))
+        if not missing:
+            return vectors
+
+        from app.redis_client import get_redis_bytes
+
+        try:
+            blobs = await get_redis_bytes().mget([keys[i] for i in missing])
+        except Exception as e:
+            logger.warning("Embedding cache (redis) indisponible: %s", e)
+            EMBEDDING_CACHE_MISSES.inc(len(missing))
+            return vectors
+
+        found = 0
+        for i, blob in zip(missing, blobs, strict=True):
+            if blob:
+                vector = np.frombuffer(blob, dtype=np.float32)
+                self.put_local(keys[i], vector)
+                vectors[i] = vector
+                found += 1
+        EMBEDDING_CACHE_HITS.labels("redis").inc(found)
+        EMBEDDING_CACHE_MISSES.inc(len(missing) - found)
+        return vectors
+
+    async def put_many(self, queries: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        from app.redis_client import get_redis_bytes
+
+        entries = {
+            self.key(q): np.asarray(v, dtype=np.float32)
+            for q, v in zip(queries, vectors, strict=True)
+        }
+        for key, vector in entries.items():
+            self.put_local(key, vector)
+
+        try:
+            async with get_redis_bytes().pipeline(transaction=False) as pipe:
+                for key, vector in entries.items():
+                    pipe.set(key, vector.tobytes(), ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Embedding cache (redis) indisponible: %s", e)
+
+
+_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = EmbeddingCache(
+            # Les vecteurs int8 (ONNX) et torch ne doivent pas se mélanger
+            model_name=f"{settings.embedding_model}:{settings.inference_backend}",
+            maxsize=settings.embedding_cache_size,
+            ttl=settings.embedding_cache_ttl,
+        )
+    return _cache
@@ -0,0 +1,129 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+
+from app.core.settings import get_settings
+from app.services.streaming import emit_token
+
+VOCABULARY = (
+    "piloter", "équipe", "objectifs", "clients", "qualité", "projets", "budget", "processus",
+    "collaborer", "stratégie", "indicateurs", "données", "amélioration", "continue", "partenaires",
+    "reporting", "priorités", "roadmap", "conformité", "innovation", "expertise", "accompagner",
+)
+
+
+class FakeLLMError(RuntimeError):
+    """Erreur injectée par le faux LLM."""
+
+    status_code = 500
+    response = None
+
+
+class FakeRateLimitError(FakeLLMError):
+    """429 injecté : même forme que `openai.RateLimitError` pour le gouverneur."""
+
+    status_code = 429
+
+
+class FakeLLM:
+    """
+    Faux fournisseur LLM pour les tests de charge hors ligne :
+    réponse déterministe (fonction du prompt), latence tirée d'une loi log-normale,
+    streaming token par token et injection d'erreurs / de 429.
+    """
+
+    def __init__(
+        self,
+        latency_median: float,
+        latency_sigma: float,
+        error_rate: float,
+        rate_limit_rate: float,
+        seed: int | None = None,
+    ):
+        self.latency_mu = math.log(max(latency_median, 1e-3))
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+
+    def _inject_failure(self) -> None:
+        draw = self._random.random()
+        if draw < self.rate_limit_rate:
+            raise FakeRateLimitError("fake LLM: rate limit injected")
+        if draw < self.rate_limit_rate + self.error_rate:
+            raise FakeLLMError("fake LLM: failure injected")
+
+    @staticmethod
+    def _text(prompt: str, max_tokens: int) -> str:
+        rng = random.Random(hashlib.sha256(prompt.encode("utf-8")).digest())
+        words = [rng.choice(VOCABULARY) for _ in range(min(max_tokens, rng.randint(80, 240)))]
+        bullets = [" ".join(words[i:i + 12]).capitalize() for i in range(0, len(words), 12)]
+        text = "\n".join(f"- {bullet}." for bullet in bullets)
+        # ~10 % de réponses incomplètes pour exercer la boucle de relance du graphe
+        if rng.random() < 0.1:
+            text += "\n- Rattachement hiérarchique (à compléter)."
+        return text
+
+    def _answer(self, prompt: str, max_tokens: int, json_output: bool) -> str:
+        text = self._text(prompt, max_tokens)
+        if not json_output:
+            return text
+        # Même schéma que le mode de génération structuré
+        missing = ["Rattachement hiérarchique"] if "(à compléter)" in text else []
+        confidence = 0.6 + (hashlib.sha256(text.encode("utf-8")).digest()[0] % 40) / 100
+        return json.dumps({"markdown": text, "confidence": confidence, "missing_fields": missing})
+
+    async def complete(
+        self, messages: list[dict], max_tokens: int, stream: bool = False, json_output: bool = False
+    ) -> str:
+        latency = self._random.lognormvariate(self.latency_mu, self.latency_sigma)
+        self._inject_failure()
+        text = self._answer(messages[-1]["content"], max_tokens, json_output)
+        if not stream or json_output:
+            await asyncio.sleep(latency)
+            return text
+
+        # Premier token après ~20 % de la latence, le reste réparti régulièrement
+        tokens = text.split(" ")
+        await asyncio.sleep(latency * 0.2)
+        step = latency * 0.8 / max(len(tokens), 1)
+        for i, token in enumerate(tokens):
+            emit_token(token if i == 0 else " " + token)
+            await asyncio.sleep(step)
+        return text
+
+    async def complete_many(
+        self, messages: list[dict], max_tokens: int, n: int, json_output: bool = False
+    ) -> list[str]:
+        """Équivalent du paramètre `n` : N réponses distinctes, une seule latence."""
+        latency = self._random.lognormvariate(self.latency_mu, self.latency_sigma)
+        self._inject_failure()
+        await asyncio.sleep(latency)
+        prompt = messages[-1]["content"]
+        return [self._answer(f"{prompt}#{i}", max_tokens, json_output) for i in range(n)]
+
+    async def evaluate(self, prompt: str, answer: str) -> dict:
+        """Équivalent de `ScoreStringEvalChain.aevaluate_strings` : note déterministe sur 10."""
+        await asyncio.sleep(self._random.lognormvariate(self.latency_mu, self.latency_sigma) / 2)
+        self._inject_failure()
+        digest = hashlib.sha256((prompt + answer).encode("utf-8")).digest()
+        return {"score": 6 + digest[0] % 5, "reasoning": "fake evaluator"}
+
+
+_fake_llm: FakeLLM | None = None
+
+
+def get_fake_llm() -> FakeLLM:
+    global _fake_llm
+    if _fake_llm is None:
+        settings = get_settings()
+        _fake_llm = FakeLLM(
+            latency_median=settings.fake_llm_latency_median,
+            latency_sigma=settings.fake_llm_latency_sigma,
+            error_rate=settings.fake_llm_error_rate,
+            rate_limit_rate=settings.fake_llm_rate_limit_rate,
+            seed=settings.fake_llm_seed,
+        )
+    return _fake_llm
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.core.settings import get_settings
+from app.telemetry.metrics import LLM_HEDGE_THRESHOLD, LLM_HEDGE_WINS, LLM_HEDGES
+
+T = TypeVar("T")
+
+
+class Hedger:
+    """
+    Requêtes LLM « couvertes » : si la requête principale n'a pas répondu après le quantile
+    glissant de latence du modèle (p90 par défaut), une seconde requête identique part ;
+    la première réponse réussie gagne, l'autre est annulée.
+    La part de requêtes couvertes sur la fenêtre est plafonnée (`max_ratio`) pour borner le
+    surcoût. Appelé à l'intérieur du gouverneur (voir `llm_client._governed_complete`) : les
+    latences mesurées excluent la file d'attente.
+    """
+
+    def __init__(self, quantile: float, min_samples: int, max_ratio: float, window: int):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.max_ratio = max_ratio
+        self.window = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._hedged: deque[bool] = deque(maxlen=window)
+
+    def threshold(self, model: str) -> float | None:
+        """Quantile glissant de latence du modèle ; None tant que l'historique est trop court."""
+        samples = self._latencies.get(model)
+        if samples is None or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+
+    def _record(self, model: str, latency: float, hedged: bool) -> None:
+        self._latencies.setdefault(model, deque(maxlen=self.window)).append(latency)
+        self._hedged.append(hedged)
+
+    def _can_hedge(self) -> bool:
+        return sum(self._hedged) < self.max_ratio * max(len(self._hedged), 1)
+
+    async def run(self, model: str, call: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        delay = self.threshold(model)
+        if delay is not None:
+            LLM_HEDGE_THRESHOLD.labels(model).set(delay)
+
+        primary = asyncio.create_task(call())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._can_hedge():
+                result = await primary
+                self._record(model, time.perf_counter() - started, hedged=False)
+                return result
+
+            LLM_HEDGES.labels(model).inc()
+            hedge = asyncio.create_task(call())
+            result, winner = await self._first_success({primary: "primary", hedge: "hedge"})
+            LLM_HEDGE_WINS.labels(model, winner).inc()
+            # Latence observée depuis le départ de la principale (borne haute, ≥ seuil)
+            self._record(model, time.perf_counter() - started, hedged=True)
+            return result
+        except BaseException:
+            primary.cancel()
+            raise
+
+    @staticmethod
+    async def _first_success(tasks: dict[asyncio.Task, str]) -> tuple[T, str]:
+        pending = set(tasks)
+        first_error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), tasks[task]
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+_hedger: Hedger | None = None
+
+
+def get_hedger() -> Hedger | None:
+    global _hedger
+    settings = get_settings()
+    if not settings.llm_hedging:
+        return None
+    if _hedger is None:
+        _hedger = Hedger(
+            quantile=settings.llm_hedge_quantile,
+            min_samples=settings.llm_hedge_min_samples,
+            max_ratio=settings.llm_hedge_max_ratio,
+            window=settings.llm_hedge_window,
+        )
+    return _hedger
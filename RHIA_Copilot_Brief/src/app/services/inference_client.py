@@ -0,0 +1,145 @@
+import json
+import socket
+import struct
+import threading
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+
+# Trame : longueur de l'en-tête JSON, longueur du payload binaire (float32)
+FRAME_HEADER = struct.Struct("!II")
+
+
+def encode_frame(header: dict[str, Any], payload: bytes = b"") -> bytes:
+    raw_header = json.dumps(header).encode("utf-8")
+    return FRAME_HEADER.pack(len(raw_header), len(payload)) + raw_header + payload
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Serveur d'inférence déconnecté")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+
+class InferenceClient:
+    """
+    Client bloquant vers le serveur d'inférence local (socket Unix).
+    Une connexion par thread : les appels partent depuis les threads de `asyncio.to_thread`.
+    """
+
+    def __init__(self, socket_path: str, timeout: float):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self._local.sock = sock
+        return sock
+
+    def _close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def request(self, header: dict[str, Any]) -> np.ndarray:
+        frame = encode_frame(header)
+        for attempt in range(2):
+            reused = getattr(self._local, "sock", None) is not None
+            sock = self._local.sock if reused else self._connect()
+            try:
+                sock.sendall(frame)
+                header_len, payload_len = FRAME_HEADER.unpack(_recv_exact(sock, FRAME_HEADER.size))
+                response = json.loads(_recv_exact(sock, header_len))
+                payload = _recv_exact(sock, payload_len)
+                break
+            except TimeoutError:
+                # Le serveur calcule peut-être encore : rejouer doublerait sa charge
+                self._close()
+                raise
+            except OSError:
+                self._close()
+                # Une seule reconnexion, si une connexion gardée a été coupée (serveur redémarré
+                # entre deux appels). embed / rerank sont des calculs purs : les rejouer est sûr.
+                if attempt or not reused:
+                    raise
+
+        if "error" in response:
+            raise RuntimeError(f"[Inference error] {response['error']}")
+        return np.frombuffer(payload, dtype=np.float32).reshape(response["shape"])
+
+
+class _RemoteModel:
+    """
+    Modèle servi par le serveur d'inférence. Socket absente ou refusée (serveur pas encore
+    démarré, arrêté) : repli sur le modèle chargé localement par `load_local`, une seule fois ;
+    le serveur reste tenté en premier à chaque appel.
+    """
+
+    def __init__(self, client: InferenceClient, load_local: Callable[[], Any] | None = None):
+        self.client = client
+        self.load_local = load_local
+        self._local_model: Any | None = None
+        self._lock = threading.Lock()
+
+    def _request(self, header: dict[str, Any]) -> np.ndarray | None:
+        """Réponse du serveur, ou None s'il est injoignable et qu'un repli local existe."""
+        try:
+            return self.client.request(header)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            if self.load_local is None:
+                raise
+            logger.warning(
+                "Serveur d'inférence injoignable (%s), modèle local utilisé: %s",
+                self.client.socket_path,
+                e,
+            )
+            return None
+
+    def _local(self) -> Any:
+        with self._lock:
+            if self._local_model is None:
+                self._local_model = self.load_local()
+            return self._local_model
+
+
+class RemoteEmbedder(_RemoteModel):
+    """Même interface que `SentenceTransformer.encode`, servie par le serveur d'inférence."""
+
+    def encode(self, sentences: str | list[str], **kwargs: Any) -> np.ndarray:
+        texts = [sentences] if isinstance(sentences, str) else list(sentences)
+        result = self._request({"op": "embed", "texts": texts})
+        if result is None:
+            return self._local().encode(sentences, **kwargs)
+        return result[0] if isinstance(sentences, str) else result
+
+
+class RemoteReranker(_RemoteModel):
+    """Même interface que `CrossEncoder.predict`, servie par le serveur d'inférence."""
+
+    def predict(self, pairs: list[list[str]], **kwargs: Any) -> np.ndarray:
+        result = self._request({"op": "rerank", "pairs": [list(p) for p in pairs]})
+        if result is None:
+            return self._local().predict(pairs, **kwargs)
+        return result
+
+
+_client: InferenceClient | None = None
+
+
+def get_inference_client() -> InferenceClient:
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = InferenceClient(settings.inference_socket_path, settings.inference_timeout)
+    return _client
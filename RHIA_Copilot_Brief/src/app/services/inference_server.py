@@ -0,0 +1,90 @@
+"""
+Serveur d'inférence local : un seul process par hôte détient l'embedder et le cross-encoder,
+les workers uvicorn l'interrogent via une socket Unix (`inference_mode="sidecar"`).
+Les requêtes de tous les workers sont regroupées en micro-batches.
+
+Lancement :
+    python -m app.services.inference_server --socket /tmp/rhia-inference.sock
+"""
+import argparse
+import asyncio
+import json
+import os
+
+import numpy as np
+from app.core.settings import get_settings
+from app.services.batching import MicroBatcher
+from app.services.inference_client import FRAME_HEADER, encode_frame
+from app.services.model_loader import load_embedder, load_reranker
+from app.telemetry.logging import logger
+
+
+class InferenceServer:
+    def __init__(self, socket_path: str, max_batch: int, max_wait_ms: float):
+        self.socket_path = socket_path
+        embedder = load_embedder()
+        reranker = load_reranker()
+        self.batchers = {
+            "embed": MicroBatcher(
+                lambda texts: np.asarray(embedder.encode(texts), dtype=np.float32),
+                max_batch=max_batch,
+                max_wait_ms=max_wait_ms,
+                name="sidecar_embed",
+            ),
+            "rerank": MicroBatcher(
+                lambda pairs: np.asarray(reranker.predict(pairs), dtype=np.float32),
+                max_batch=max_batch,
+                max_wait_ms=max_wait_ms,
+                name="sidecar_rerank",
+            ),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    raw = await reader.readexactly(FRAME_HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                header_len, payload_len = FRAME_HEADER.unpack(raw)
+                request = json.loads(await reader.readexactly(header_len))
+                await reader.readexactly(payload_len)
+
+                try:
+                    op = request["op"]
+                    if op == "embed":
+                        items = request["texts"]
+                    else:
+                        items = [tuple(p) for p in request["pairs"]]
+                    result = np.asarray(await self.batchers[op].submit(items), dtype=np.float32)
+                    writer.write(encode_frame({"shape": list(result.shape)}, result.tobytes()))
+                except Exception as e:
+                    writer.write(encode_frame({"error": str(e)}))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_forever(self) -> None:
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        logger.info("Serveur d'inférence à l'écoute sur %s", self.socket_path)
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                for batcher in self.batchers.values():
+                    await batcher.close()
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        description="Serveur d'inférence partagé (embedder + reranker)."
+    )
+    parser.add_argument("--socket", type=str, default=settings.inference_socket_path)
+    parser.add_argument("--max-batch", type=int, default=settings.inference_max_batch)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.inference_max_wait_ms)
+    args = parser.parse_args()
+
+    asyncio.run(InferenceServer(args.socket, args.max_batch, args.max_wait_ms).serve_forever())
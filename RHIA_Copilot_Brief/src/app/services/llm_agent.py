@@ -1,46 +1,44 @@
-from typing import Dict, Any
-from app.services.prompt_builder import build_prompt, build_feedback_prompt
-from app.services.llm_client import call_llm
+from typing import Any
+
 from app.core.constants import THRESHOLD_CONFIDENCE_LLM
+from app.services.llm_cache import cache_scope
+from app.services.llm_client import call_llm
 
 
 class LLMAgent:
     def __init__(self):
         pass
 
-    async def generate_section(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        prompt = build_prompt(
-            section_id=state["section_id"],
-            rag_chunks=state.get("rag_chunks", []),
-            brief_data=state["brief_data"],
-            user_preferences=state["user_preferences"],
+    async def generate_section(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Draft de la section à partir du prompt du nœud `PromptBuilder` (delta d'état)."""
+        # Une relance après confiance faible doit produire un nouveau draft, pas le même en cache
+        response = await call_llm(
+            state["prompt"],
+            state["section_id"],
+            seniority=state["user_preferences"].get("seniority"),
+            bypass_cache=state.get("bypass_cache", False) or state.get("retry_count", 0) > 0,
+            scope=cache_scope(state.get("brief_data")),
         )
 
-        response = await call_llm(prompt, state["section_id"])
-
         return {
-            **state,
-            "prompt": prompt,
             "draft": response["output"],
             "confidence": response["confidence"],
-            "fallback_needed": response["confidence"] < THRESHOLD_CONFIDENCE_LLM
+            "fallback_needed": response["confidence"] < THRESHOLD_CONFIDENCE_LLM,
+            # Mode structuré : auto-évaluation reprise par AnswerScorer (pas de second appel)
+            "self_confidence": response.get("self_confidence"),
+            "missing_fields": response.get("missing_fields"),
         }
 
-    async def revise_section(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        prompt = build_feedback_prompt(
-            section_id=state["section_id"],
-            previous_output=state["previous_output"],
-            user_feedback=state["user_feedback"],
-            brief_data=state["brief_data"],
-            user_preferences=state["user_preferences"]
-        )
-
-        response = await call_llm(prompt, state["section_id"])
+    async def revise_section(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Reformulation à partir du prompt construit par `FeedbackPromptBuilder` (delta d'état)."""
+        response = await call_llm(
+            state["prompt"], state["section_id"], bypass_cache=state.get("bypass_cache", False)
+        )
 
         return {
-            **state,
-            "prompt": prompt,
             "draft": response["output"],
             "confidence": response["confidence"],
-            "fallback_needed": False  # l'humain vient de guider : pas de boucle
+            "fallback_needed": False,  # l'humain vient de guider : pas de boucle
+            "self_confidence": response.get("self_confidence"),
+            "missing_fields": response.get("missing_fields"),
         }
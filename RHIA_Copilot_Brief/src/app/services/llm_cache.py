@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+from app.telemetry.metrics import LLM_CACHE_HITS, LLM_CACHE_MISSES
+
+# Entrée de l'index sémantique : digest de la clé exacte (32 octets) puis vecteur float32
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def _prompt_embedding(prompt: str) -> np.ndarray:
+    """Embedding du prompt complet (CPU, thread)."""
+    from app.services.rag_retriever import embed_long_texts
+
+    return embed_long_texts([prompt])[0]
+
+
+def cache_scope(brief_data: dict[str, Any] | None) -> str | None:
+    """Portée du cache sémantique : hash des données du brief (None si elles sont absentes)."""
+    if not brief_data:
+        return None
+    raw = json.dumps(brief_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Cache des réponses `call_llm` :
+    1. exact : (modèle, température, message système, hash du prompt) → draft, dans Redis avec TTL ;
+    2. sémantique (optionnel) : réutilise un draft de la même section, séniorité et portée
+       (`cache_scope` des données du brief) si l'embedding du prompt est à moins de
+       `max_distance` (cosinus). Sans portée, deux briefs aux prompts proches (mêmes chunks
+       RAG, même poste) pourraient se partager un draft : le niveau sémantique est alors ignoré.
+       L'index ne contient que les vecteurs et la clé exacte de chaque draft : la réponse
+       n'est lue qu'en cas de hit.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        temperature: float,
+        ttl: int,
+        semantic: bool,
+        max_distance: float,
+        max_entries: int,
+    ):
+        self.model = model
+        self.temperature = temperature
+        self.ttl = ttl
+        self.semantic = semantic
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+
+    def _exact_digest(self, system_message: str, prompt: str) -> bytes:
+        return hashlib.sha256(
+            "\x1f".join([self.model, str(self.temperature), system_message, prompt]).encode("utf-8")
+        ).digest()
+
+    def exact_key(self, system_message: str, prompt: str) -> str:
+        return f"llm:exact:{self._exact_digest(system_message, prompt).hex()}"
+
+    def semantic_key(self, system_message: str, section_id: str, seniority: str, scope: str) -> str:
+        digest = hashlib.sha1(
+            "\x1f".join([self.model, system_message, section_id, seniority, scope]).encode("utf-8")
+        ).hexdigest()
+        return f"llm:semantic:vectors:{digest}"
+
+    async def lookup(
+        self,
+        system_message: str,
+        prompt: str,
+        section_id: str,
+        seniority: str | None,
+        scope: str | None = None,
+    ) -> str | None:
+        from app.redis_client import get_redis
+
+        try:
+            cached = await get_redis().get(self.exact_key(system_message, prompt))
+        except Exception as e:
+            logger.warning("LLM cache (redis) indisponible: %s", e)
+            return None
+        if cached is not None:
+            LLM_CACHE_HITS.labels("exact").inc()
+            return json.loads(cached)["output"]
+        LLM_CACHE_MISSES.labels("exact").inc()
+
+        if not (self.semantic and seniority and scope):
+            return None
+        key = self.semantic_key(system_message, section_id, seniority, scope)
+        output = await self._semantic_lookup(key, prompt)
+        if output is not None:
+            LLM_CACHE_HITS.labels("semantic").inc()
+        else:
+            LLM_CACHE_MISSES.labels("semantic").inc()
+        return output
+
+    async def _semantic_lookup(self, key: str, prompt: str) -> str | None:
+        from app.redis_client import get_redis, get_redis_bytes
+
+        try:
+            entries = await get_redis_bytes().lrange(key, 0, -1)
+        except Exception as e:
+            logger.warning("LLM cache sémantique (redis) indisponible: %s", e)
+            return None
+        if not entries:
+            return None
+
+        vectors = np.stack(
+            [np.frombuffer(entry[DIGEST_SIZE:], dtype=np.float32) for entry in entries]
+        )
+        query = await asyncio.to_thread(_prompt_embedding, prompt)
+        similarities = vectors @ query
+        best = int(np.argmax(similarities))
+        if 1.0 - float(similarities[best]) > self.max_distance:
+            return None
+
+        try:
+            cached = await get_redis().get(f"llm:exact:{entries[best][:DIGEST_SIZE].hex()}")
+        except Exception as e:
+            logger.warning("LLM cache sémantique (redis) indisponible: %s", e)
+            return None
+        # Draft expiré (même TTL, mais écrit avant le dernier `expire` de l'index)
+        return json.loads(cached)["output"] if cached is not None else None
+
+    async def store(
+        self,
+        system_message: str,
+        prompt: str,
+        section_id: str,
+        seniority: str | None,
+        output: str,
+        scope: str | None = None,
+    ) -> None:
+        from app.redis_client import get_redis, get_redis_bytes
+
+        try:
+            await get_redis().set(
+                self.exact_key(system_message, prompt), json.dumps({"output": output}), ex=self.ttl
+            )
+            if self.semantic and seniority and scope:
+                vector = (await asyncio.to_thread(_prompt_embedding, prompt)).tobytes()
+                entry = self._exact_digest(system_message, prompt) + vector
+                key = self.semantic_key(system_message, section_id, seniority, scope)
+                async with get_redis_bytes().pipeline(transaction=False) as pipe:
+                    pipe.lpush(key, entry)
+                    pipe.ltrim(key, 0, self.max_entries - 1)
+                    pipe.expire(key, self.ttl)
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning("LLM cache (redis) indisponible: %s", e)
+
+
+_cache: LLMResponseCache | None = None
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    global _cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    if _cache is None:
+        _cache = LLMResponseCache(
+            model=settings.openai_model,
+            temperature=settings.temperature,
+            ttl=settings.llm_cache_ttl,
+            semantic=settings.llm_semantic_cache,
+            max_distance=settings.llm_semantic_max_distance,
+            max_entries=settings.llm_semantic_max_entries,
+        )
+    return _cache
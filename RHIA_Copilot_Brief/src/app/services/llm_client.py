@@ -1,39 +1,324 @@
-from openai import AsyncOpenAI
+import asyncio
+import json
+from collections.abc import Awaitable
+
 from app.core.settings import get_settings
+from app.services.hedging import Hedger, get_hedger
+from app.services.llm_cache import get_llm_cache
+from app.services.llm_governor import PRIORITY_GENERATION, estimate_tokens, get_llm_governor
+from app.services.openai_transport import close_openai_http_client, get_openai_http_client
+from app.services.streaming import emit_token, token_sink
+from app.telemetry.metrics import LLM_TOKENS
 
 settings = get_settings()
 
-client = AsyncOpenAI(
-    api_key=settings.openai_api_key,
-    timeout=settings.llm_timeout
+MAX_TOKENS = 800
+
+# Mode structuré : draft + auto-évaluation + champs manquants en une seule complétion
+STRUCTURED_INSTRUCTIONS = (
+    " Réponds en JSON : `markdown` (le texte de la section en Markdown), `confidence` "
+    "(de 0 à 1, ta confiance dans l'exactitude et la complétude de la section) et "
+    "`missing_fields` (les informations manquantes, signalées (à compléter) dans le texte)."
 )
+STRUCTURED_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "section_draft",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "markdown": {"type": "string"},
+                "confidence": {"type": "number"},
+                "missing_fields": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["markdown", "confidence", "missing_fields"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+_client = None
+
+
+def get_openai_client():
+    """Client OpenAI partagé, créé au premier appel (import d'openai différé)."""
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.llm_timeout,
+            max_retries=0,  # les 429 sont rejoués par le gouverneur
+            http_client=get_openai_http_client()
+        )
+    return _client
+
+
+async def close_openai_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+    await close_openai_http_client()
+
+
+def _record_usage(usage) -> None:
+    if usage is not None:
+        LLM_TOKENS.labels(settings.openai_model, "prompt").inc(usage.prompt_tokens)
+        LLM_TOKENS.labels(settings.openai_model, "completion").inc(usage.completion_tokens)
+
+
+async def _stream_completion(messages: list[dict]) -> str:
+    stream = await get_openai_client().chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        temperature=settings.temperature,
+        max_tokens=MAX_TOKENS,
+        stream=True,
+        stream_options={"include_usage": True}  # dernier chunk : usage, sans choices
+    )
+    parts = []
+    async for chunk in stream:
+        _record_usage(chunk.usage)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            emit_token(delta)
+    return "".join(parts)
+
+
+async def _complete(
+    messages: list[dict], structured: bool, temperature: float | None = None, stream: bool = True
+) -> str:
+    # Le JSON du mode structuré n'est pas relayé token par token
+    streaming = stream and token_sink.get() is not None and not structured
+
+    if settings.llm_provider == "fake":
+        from app.services.fake_llm import get_fake_llm
+
+        return await get_fake_llm().complete(
+            messages, MAX_TOKENS, stream=streaming, json_output=structured
+        )
+
+    if streaming:
+        # Requête SSE : on relaie les tokens au fil de l'eau
+        return await _stream_completion(messages)
+
+    extra = {"response_format": STRUCTURED_RESPONSE_FORMAT} if structured else {}
+    response = await get_openai_client().chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        temperature=settings.temperature if temperature is None else temperature,
+        max_tokens=MAX_TOKENS,
+        **extra
+    )
+    _record_usage(response.usage)
+    return response.choices[0].message.content
+
+
+async def _complete_choices(messages: list[dict], structured: bool, n: int) -> list[str]:
+    """N complétions du même prompt en une seule requête (paramètre `n`)."""
+    if settings.llm_provider == "fake":
+        from app.services.fake_llm import get_fake_llm
+
+        return await get_fake_llm().complete_many(messages, MAX_TOKENS, n, json_output=structured)
+
+    extra = {"response_format": STRUCTURED_RESPONSE_FORMAT} if structured else {}
+    response = await get_openai_client().chat.completions.create(
+        model=settings.openai_model,
+        messages=messages,
+        temperature=settings.temperature,
+        max_tokens=MAX_TOKENS,
+        n=n,
+        **extra
+    )
+    _record_usage(response.usage)
+    return [choice.message.content for choice in response.choices]
+
+
+async def _governed_complete(
+    messages: list[dict], tokens: int, structured: bool, hedger: Hedger | None = None
+) -> str:
+    """
+    Appel admis par le gouverneur. La couverture (hedging) se fait à l'intérieur : le seuil
+    ne mesure que la durée de l'appel admis, hors file d'attente et attente de budget, et la
+    requête de couverture ne repasse pas par la file (pas d'amplification sous saturation).
+    """
+
+    def call() -> Awaitable[str]:
+        if hedger is None:
+            return _complete(messages, structured)
+        return hedger.run(settings.openai_model, lambda: _complete(messages, structured))
+
+    return await get_llm_governor().run(
+        call,
+        model=settings.openai_model,
+        tokens=tokens,
+        priority=PRIORITY_GENERATION,
+    )
+
+
+def _system_message(section_id: str, structured: bool) -> str:
+    system_message = (
+        "Tu es un expert RH chargé de rédiger uniquement la section '"
+        f"{section_id}" "' d'un brief de poste. Ne génère aucune autre section."
+    )
+    if structured:
+        system_message += STRUCTURED_INSTRUCTIONS
+    return system_message
+
 
-async def call_llm(prompt: str, section_id: str) -> dict:
+def _text_result(output: str) -> dict:
+    # Heuristique simple : si contenu incomplet, baisse de confiance
+    confidence = 0.95 if "(à compléter)" not in output else 0.75
+    return {"output": output, "confidence": confidence}
+
+
+def _structured_result(raw: str) -> dict:
+    """Réponse JSON du mode structuré → draft, auto-évaluation et champs manquants."""
+    try:
+        data = json.loads(raw)
+        output = str(data["markdown"]).strip()
+        self_confidence = min(1.0, max(0.0, float(data["confidence"])))
+        missing_fields = [str(field) for field in data.get("missing_fields", [])]
+    except (ValueError, KeyError, TypeError):
+        # JSON invalide (modèle sans structured outputs...) : texte brut, sans auto-évaluation
+        return _text_result(raw)
+    return {
+        "output": output,
+        "confidence": 0.95 if not missing_fields else 0.75,
+        "self_confidence": self_confidence,
+        "missing_fields": missing_fields,
+    }
+
+
+async def call_llm(
+    prompt: str,
+    section_id: str,
+    seniority: str | None = None,
+    bypass_cache: bool = False,
+    scope: str | None = None,
+) -> dict:
     """
     Envoie un prompt au LLM (OpenAI) et renvoie la réponse + estimation de confiance.
+    Le cache (exact, puis sémantique si `seniority` et `scope` sont fournis, voir
+    `llm_cache.cache_scope`) est consulté sauf si `bypass_cache` ; la réponse fraîche y est
+    toujours enregistrée.
+    En mode `structured`, la même complétion renvoie aussi `self_confidence` et `missing_fields`.
     """
+    cache = get_llm_cache()
+    structured = settings.generation_mode == "structured"
     try:
-        system_message = (
-            "Tu es un expert RH chargé de rédiger uniquement la section '"
-            f"{section_id}" "' d'un brief de poste. Ne génère aucune autre section."
-        )
-
-        response = await client.chat.completions.create(
-            model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=settings.temperature,
-            max_tokens=800
-        )
+        system_message = _system_message(section_id, structured)
 
-        output = response.choices[0].message.content.strip()
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ]
 
-        # Heuristique simple : si contenu incomplet, baisse de confiance
-        confidence = 0.95 if "(à compléter)" not in output else 0.75
+        raw = None
+        if cache is not None and not bypass_cache:
+            raw = await cache.lookup(system_message, prompt, section_id, seniority, scope)
+        streamed = raw is None and token_sink.get() is not None and not structured
 
-        return {"output": output, "confidence": confidence}
+        if raw is None:
+            tokens = estimate_tokens(system_message + prompt, MAX_TOKENS)
+            # Pas de couverture en streaming : les tokens seraient relayés deux fois
+            hedger = None if streamed else get_hedger()
+            raw = await _governed_complete(messages, tokens, structured, hedger)
+            raw = raw.strip()
+            if cache is not None:
+                await cache.store(system_message, prompt, section_id, seniority, raw, scope)
+
+        result = _structured_result(raw) if structured else _text_result(raw)
+        if not streamed:
+            # Réponse en cache ou JSON : le draft part en un seul fragment
+            emit_token(result["output"])
+        return result
 
     except Exception as e:
-        raise RuntimeError(f"[LLM error] {str(e)}")
+        raise RuntimeError(f"[LLM error] {str(e)}") from e
+
+
+async def generate_candidates(
+    prompt: str,
+    section_id: str,
+    n: int,
+    seniority: str | None = None,
+    bypass_cache: bool = False,
+    scope: str | None = None,
+) -> list[dict]:
+    """
+    Stratégie best-of-N : N drafts candidats (même format que `call_llm`, plus `raw` et
+    `temperature`), via le paramètre `n` (une requête) ou N requêtes parallèles à
+    températures étagées. Un draft en cache est renvoyé seul. Rien n'est relayé en SSE ni mis
+    en cache ici : voir `remember_output` une fois le meilleur candidat choisi.
+    """
+    cache = get_llm_cache()
+    structured = settings.generation_mode == "structured"
+    system_message = _system_message(section_id, structured)
+    parse = _structured_result if structured else _text_result
+    try:
+        if cache is not None and not bypass_cache:
+            raw = await cache.lookup(system_message, prompt, section_id, seniority, scope)
+            if raw is not None:
+                return [{**parse(raw), "raw": raw, "temperature": settings.temperature}]
+
+        messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt}
+        ]
+        governor = get_llm_governor()
+        if settings.best_of_n_mode == "n":
+            temperatures = [settings.temperature] * n
+            raws = await governor.run(
+                lambda: _complete_choices(messages, structured, n),
+                model=settings.openai_model,
+                tokens=estimate_tokens(system_message + prompt, n * MAX_TOKENS),
+                priority=PRIORITY_GENERATION,
+            )
+        else:
+            spread = settings.best_of_n_temperature_spread
+            temperatures = [
+                min(1.0, max(0.0, settings.temperature + spread * (i - (n - 1) / 2)))
+                for i in range(n)
+            ]
+            tokens = estimate_tokens(system_message + prompt, MAX_TOKENS)
+            raws = await asyncio.gather(*(
+                governor.run(
+                    lambda t=t: _complete(messages, structured, temperature=t, stream=False),
+                    model=settings.openai_model,
+                    tokens=tokens,
+                    priority=PRIORITY_GENERATION,
+                )
+                for t in temperatures
+            ))
+        return [
+            {**parse(raw.strip()), "raw": raw.strip(), "temperature": t}
+            for raw, t in zip(raws, temperatures, strict=True)
+        ]
+
+    except Exception as e:
+        raise RuntimeError(f"[LLM error] {str(e)}") from e
+
+
+async def remember_output(
+    prompt: str,
+    section_id: str,
+    seniority: str | None,
+    raw: str,
+    scope: str | None = None,
+    temperature: float | None = None,
+) -> None:
+    """
+    Met en cache le candidat retenu (même clé qu'un appel `call_llm`). La clé porte la
+    température par défaut : un candidat généré à une autre température n'est pas mis en cache.
+    """
+    cache = get_llm_cache()
+    if cache is not None and temperature in (None, cache.temperature):
+        system_message = _system_message(section_id, settings.generation_mode == "structured")
+        await cache.store(system_message, prompt, section_id, seniority, raw, scope)
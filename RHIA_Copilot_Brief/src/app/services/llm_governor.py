@@ -0,0 +1,239 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+from app.telemetry.metrics import (
+    LLM_CONCURRENCY_LIMIT,
+    LLM_GOVERNOR_WAIT_SECONDS,
+    LLM_IN_FLIGHT,
+    LLM_RATE_LIMITED,
+)
+
+T = TypeVar("T")
+
+# Priorités de la file d'attente (plus petit = servi en premier)
+PRIORITY_GENERATION = 0
+PRIORITY_SCORING = 1
+
+# Estimation grossière du nombre de tokens d'un texte (pas de tokenizer côté API)
+CHARS_PER_TOKEN = 4
+
+# Deux token buckets (requêtes/min et tokens/min) consommés atomiquement, partagés entre réplicas.
+# Renvoie l'attente en secondes avant que la demande puisse passer ("0" = autorisée et débitée).
+TOKEN_BUCKET_LUA = """
+local now = redis.call('TIME')
+local t = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local function level(key, capacity)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or t
+    return math.min(capacity, tokens + (t - ts) * capacity / 60)
+end
+local rpm_cap = tonumber(ARGV[1])
+local tpm_cap = tonumber(ARGV[2])
+local cost = math.min(tonumber(ARGV[3]), tpm_cap)
+local requests = level(KEYS[1], rpm_cap)
+local tokens = level(KEYS[2], tpm_cap)
+local wait = 0
+if requests < 1 then wait = math.max(wait, (1 - requests) * 60 / rpm_cap) end
+if tokens < cost then wait = math.max(wait, (cost - tokens) * 60 / tpm_cap) end
+if wait == 0 then
+    requests = requests - 1
+    tokens = tokens - cost
+end
+redis.call('HSET', KEYS[1], 'tokens', requests, 'ts', t)
+redis.call('HSET', KEYS[2], 'tokens', tokens, 'ts', t)
+redis.call('EXPIRE', KEYS[1], 120)
+redis.call('EXPIRE', KEYS[2], 120)
+return tostring(wait)
+"""
+
+
+def estimate_tokens(text: str, max_tokens: int) -> int:
+    """Coût d'un appel : longueur du prompt (≈ 4 caractères/token) + `max_tokens` réservés."""
+    return len(text) // CHARS_PER_TOKEN + max_tokens
+
+
+def _retry_after(error: Exception) -> float | None:
+    """Délai imposé par OpenAI sur une réponse 429 (`Retry-After`), si présent."""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 0))
+    except ValueError:
+        return 0.0
+
+
+class LLMGovernor:
+    """
+    Régule tous les appels OpenAI du process (génération et scoring) :
+    - budget RPM/TPM par modèle, partagé entre réplicas via des token buckets Redis ;
+    - concurrence locale adaptative (AIMD) : +1/limite par succès rapide,
+      réduction multiplicative sur 429 ou latence au-delà de la cible ;
+    - file d'attente équitable (FIFO par priorité) : les appelants attendent au lieu d'échouer,
+      et un 429 est rejoué après backoff.
+    Le budget est acquis avant la place de concurrence : un appel en attente de budget ne
+    bloque pas une place dont un appel prioritaire (ou d'un autre modèle) aurait besoin.
+    """
+
+    def __init__(
+        self,
+        rpm_limit: int,
+        tpm_limit: int,
+        initial_concurrency: int,
+        max_concurrency: int,
+        latency_target: float,
+        max_retries: int,
+    ):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self._limit = float(initial_concurrency)
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._script = None
+        LLM_CONCURRENCY_LIMIT.set(self._limit)
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    # --- Concurrence locale ---
+
+    async def _enter(self, priority: int) -> None:
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            LLM_IN_FLIGHT.set(self._in_flight)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Place accordée juste avant l'annulation : on la rend
+                self._leave()
+            raise
+
+    def _leave(self) -> None:
+        self._in_flight -= 1
+        LLM_IN_FLIGHT.set(self._in_flight)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            self._in_flight += 1
+            future.set_result(None)
+        LLM_IN_FLIGHT.set(self._in_flight)
+
+    def _increase(self) -> None:
+        self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+        LLM_CONCURRENCY_LIMIT.set(self._limit)
+        self._wake()
+
+    def _decrease(self, factor: float) -> None:
+        self._limit = max(1.0, self._limit * factor)
+        LLM_CONCURRENCY_LIMIT.set(self._limit)
+
+    # --- Budget distribué ---
+
+    async def _acquire_budget(self, model: str, tokens: int) -> None:
+        from app.redis_client import get_redis
+
+        while True:
+            try:
+                if self._script is None:
+                    self._script = get_redis().register_script(TOKEN_BUCKET_LUA)
+                wait = float(
+                    await self._script(
+                        # Hash tag : les deux clés d'un modèle restent sur le même slot Redis
+                        keys=[f"llm:{{{model}}}:rpm", f"llm:{{{model}}}:tpm"],
+                        args=[self.rpm_limit, self.tpm_limit, tokens],
+                    )
+                )
+            except Exception as e:
+                # Redis indisponible : on ne bloque pas la génération,
+                # seule la concurrence locale s'applique
+                logger.warning("Budget LLM (redis) indisponible: %s", e)
+                self._script = None
+                return
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait + random.uniform(0, 0.05))
+
+    # --- Point d'entrée ---
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        model: str,
+        tokens: int,
+        priority: int = PRIORITY_GENERATION,
+    ) -> T:
+        """Exécute `call` dès qu'une place et le budget sont disponibles ; rejoue les 429."""
+        for attempt in range(self.max_retries + 1):
+            queued_at = time.perf_counter()
+            await self._acquire_budget(model, tokens)
+            await self._enter(priority)
+            LLM_GOVERNOR_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+            delay = None
+            try:
+                started = time.perf_counter()
+                try:
+                    result = await call()
+                except Exception as e:
+                    delay = _retry_after(e)
+                    if delay is None:
+                        raise
+                    LLM_RATE_LIMITED.inc()
+                    self._decrease(0.5)
+                    if attempt == self.max_retries:
+                        raise
+                else:
+                    if time.perf_counter() - started > self.latency_target:
+                        self._decrease(0.9)
+                    else:
+                        self._increase()
+                    return result
+            finally:
+                self._leave()
+
+            backoff = max(delay, min(30.0, 2 ** attempt)) + random.uniform(0, 0.5)
+            logger.warning("OpenAI 429 sur %s, nouvel essai dans %.1fs", model, backoff)
+            await asyncio.sleep(backoff)
+
+        raise RuntimeError("unreachable")
+
+
+_governor: LLMGovernor | None = None
+
+
+def get_llm_governor() -> LLMGovernor:
+    global _governor
+    if _governor is None:
+        settings = get_settings()
+        _governor = LLMGovernor(
+            rpm_limit=settings.llm_rpm_limit,
+            tpm_limit=settings.llm_tpm_limit,
+            initial_concurrency=settings.llm_concurrency_initial,
+            max_concurrency=settings.llm_concurrency_max,
+            latency_target=settings.llm_latency_target,
+            max_retries=settings.llm_rate_limit_retries,
+        )
+    return _governor
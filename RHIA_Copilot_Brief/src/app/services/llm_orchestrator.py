@@ -1,4 +1,5 @@
 from typing import List, Dict, Any
+from app.models.chunk import Chunk
 from app.models.user_pref import UserPreferences
 from app.services.prompt_builder import build_prompt
 from app.services.llm_client import call_llm
@@ -6,7 +7,7 @@ from app.services.llm_client import call_llm
 
 async def generate_section(
     section_id: str,
-    chunks: List[Dict[str, Any]],
+    chunks: List[Chunk],
     brief_data: Dict[str, Any],
     user_preferences: UserPreferences
 ) -> Dict[str, Any]:
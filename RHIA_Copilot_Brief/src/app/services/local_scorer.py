@@ -0,0 +1,92 @@
+import asyncio
+import re
+
+import numpy as np
+from app.core.settings import get_settings
+
+MISSING_MARKER = "(à compléter)"
+# Pénalité par information manquante signalée dans le draft, plafonnée
+MISSING_PENALTY = 0.15
+MISSING_PENALTY_MAX = 0.45
+SEMANTIC_WEIGHT = 0.6
+STRUCTURE_WEIGHT = 0.4
+
+_HEADING = re.compile(r"^#{1,6}[^#\s]")
+
+
+def markdown_score(text: str) -> float:
+    """Contrôles Markdown bon marché : blocs de code et gras fermés, titres bien formés."""
+    lines = text.splitlines()
+    checks = [
+        text.count("```") % 2 == 0,
+        text.replace("```", "").count("**") % 2 == 0,
+        not any(_HEADING.match(line) for line in lines),
+        bool(text.strip()),
+    ]
+    return sum(checks) / len(checks)
+
+
+def length_score(text: str, min_words: int, max_words: int) -> float:
+    """1 dans la plage attendue, décroissance linéaire en dehors."""
+    words = len(text.split())
+    if words < min_words:
+        return words / min_words
+    if words > max_words:
+        return max(0.0, 1.0 - (words - max_words) / max_words)
+    return 1.0
+
+
+async def _semantic_scores(prompt: str, answers: list[str], rag_context: str) -> np.ndarray:
+    """
+    Pertinence de chaque draft vis-à-vis du prompt et, si présent, du contexte RAG,
+    bornée à [0, 1] et moyennée ; un seul batch modèle pour tous les drafts.
+    """
+    settings = get_settings()
+    references = [prompt] + ([rag_context] if rag_context else [])
+
+    if settings.local_scorer_model == "cross_encoder":
+        from app.services.rerank_service import get_rerank_batcher
+
+        batcher = get_rerank_batcher()
+        if batcher is not None:
+            pairs = [[reference, answer] for answer in answers for reference in references]
+            logits = np.asarray(await batcher.submit(pairs), dtype=np.float32)
+            scores = 1.0 / (1.0 + np.exp(-logits))
+            return scores.reshape(len(answers), len(references)).mean(axis=1)
+
+    from app.services.rag_retriever import embed_long_texts
+
+    vectors = await asyncio.to_thread(embed_long_texts, [*answers, *references])
+    similarities = vectors[: len(answers)] @ vectors[len(answers):].T
+    # Calibration linéaire : `low` (hors sujet) → 0, `high` (pertinent) → 1
+    low, high = settings.local_scorer_similarity_range
+    return np.clip((similarities - low) / (high - low), 0.0, 1.0).mean(axis=1)
+
+
+def _structure_score(answer: str) -> float:
+    settings = get_settings()
+    structure = (
+        markdown_score(answer)
+        + length_score(answer, settings.local_scorer_min_words, settings.local_scorer_max_words)
+    ) / 2
+    penalty = min(MISSING_PENALTY_MAX, MISSING_PENALTY * answer.count(MISSING_MARKER))
+    return STRUCTURE_WEIGHT * structure - penalty
+
+
+async def score_locally_many(prompt: str, answers: list[str], rag_context: str = "") -> list[float]:
+    """
+    Note de qualité de chaque draft sur [0, 1], sans appel LLM : similarité sémantique
+    (embeddings ou cross-encoder) + contrôles de structure, moins les informations manquantes.
+    """
+    scores = [0.0] * len(answers)
+    scored = [i for i, answer in enumerate(answers) if answer.strip()]
+    if scored:
+        semantic = await _semantic_scores(prompt, [answers[i] for i in scored], rag_context)
+        for i, value in zip(scored, semantic, strict=True):
+            total = SEMANTIC_WEIGHT * float(value) + _structure_score(answers[i])
+            scores[i] = float(np.clip(total, 0.0, 1.0))
+    return scores
+
+
+async def score_locally(prompt: str, answer: str, rag_context: str = "") -> float:
+    return (await score_locally_many(prompt, [answer], rag_context))[0]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from collections.abc import Sequence
+from itertools import product
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+from app.core.constants import QDRANT_COLLECTION_BRIEF, SECTION_LABELS_TO_SLUGS, SENIORITY_LEVELS
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+
+if TYPE_CHECKING:
+    from qdrant_client.models import Filter, SearchRequest
+
+
+class MemoryPoint(NamedTuple):
+    """Même forme qu'un `ScoredPoint` Qdrant pour `_to_chunks`."""
+
+    id: str
+    score: float
+    payload: dict[str, Any]
+    vector: np.ndarray | None
+
+
+def matches(payload: dict[str, Any], query_filter: Filter | None) -> bool:
+    """Sémantique des filtres de `build_filter` : toutes les conditions `must` en égalité exacte."""
+    if query_filter is None:
+        return True
+    return all(payload.get(cond.key) == cond.match.value for cond in query_filter.must or [])
+
+
+class InMemoryVectorStore:
+    """
+    Substitut de Qdrant pour les tests de charge hors ligne : recherche exacte (cosinus)
+    en NumPy, mêmes filtres et même interface `search_batch` que le client Qdrant.
+    """
+
+    def __init__(self):
+        self._collections: dict[str, tuple[list[str], np.ndarray, list[dict[str, Any]]]] = {}
+
+    def upsert(self, collection: str, vectors: np.ndarray, payloads: list[dict[str, Any]]) -> None:
+        empty = ([], np.empty((0, vectors.shape[1]), np.float32), [])
+        ids, matrix, stored = self._collections.get(collection, empty)
+        unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        self._collections[collection] = (
+            ids + [str(uuid.uuid4()) for _ in payloads],
+            np.vstack([matrix, unit.astype(np.float32)]),
+            stored + list(payloads),
+        )
+
+    def count(self, collection: str) -> int:
+        return len(self._collections.get(collection, ([], None, []))[0])
+
+    def _search(self, collection: str, request: SearchRequest) -> list[MemoryPoint]:
+        if collection not in self._collections:
+            return []
+        ids, matrix, payloads = self._collections[collection]
+        mask = np.fromiter(
+            (matches(p, request.filter) for p in payloads), dtype=bool, count=len(payloads)
+        )
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        query = np.asarray(request.vector, dtype=np.float32)
+        scores = matrix[candidates] @ (query / max(float(np.linalg.norm(query)), 1e-12))
+        top = np.argsort(-scores)[: request.limit]
+        return [
+            MemoryPoint(
+                id=ids[candidates[i]],
+                score=float(scores[i]),
+                payload=payloads[candidates[i]],
+                vector=matrix[candidates[i]] if request.with_vector else None,
+            )
+            for i in top
+        ]
+
+    def search_batch(
+        self, collection_name: str, requests: Sequence[SearchRequest]
+    ) -> list[list[MemoryPoint]]:
+        return [self._search(collection_name, request) for request in requests]
+
+
+class AsyncInMemoryVectorStore:
+    """Façade asynchrone (même appel que `AsyncQdrantClient.search_batch`)."""
+
+    def __init__(self, store: InMemoryVectorStore):
+        self.store = store
+
+    async def search_batch(
+        self, collection_name: str, requests: Sequence[SearchRequest]
+    ) -> list[list[MemoryPoint]]:
+        return self.store.search_batch(collection_name, requests)
+
+
+def _load_documents(path: str) -> list[dict[str, Any]]:
+    """Fichier JSONL au format de `scripts/seed_qdrant.py` (text + metadata), même chunkage."""
+    payloads = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            doc = json.loads(line)
+            for chunk in (p.strip() for p in doc["text"].split("\n\n")):
+                if len(chunk) > 30:
+                    payloads.append(
+                        {"text": chunk, **doc.get("metadata", {}), "type": QDRANT_COLLECTION_BRIEF}
+                    )
+    return payloads
+
+
+def _synthetic_documents(
+    job_functions: Sequence[str], chunks_per_filter: int
+) -> list[dict[str, Any]]:
+    """Corpus synthétique : N chunks pour chaque (section, séniorité, métier, langue)."""
+    payloads = []
+    for section, seniority, job_function, language in product(
+        SECTION_LABELS_TO_SLUGS.values(), SENIORITY_LEVELS, job_functions, ("fr", "en")
+    ):
+        for i in range(chunks_per_filter):
+            payloads.append({
+                "text": (
+                    f"Exemple {i + 1} de section {section} "
+                    f"pour un poste de {job_function} ({seniority})."
+                ),
+                "source": f"synthetic-{i + 1}",
+                "section": section,
+                "job_function": job_function,
+                "seniority_level": seniority,
+                "language": language,
+                "type": QDRANT_COLLECTION_BRIEF,
+            })
+    return payloads
+
+
+_store: InMemoryVectorStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_memory_store() -> InMemoryVectorStore:
+    """Store partagé, chargé (fichier JSONL ou corpus synthétique) et encodé au premier appel."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            from app.services.rag_retriever import get_embedder
+
+            settings = get_settings()
+            if settings.memory_store_path:
+                payloads = _load_documents(settings.memory_store_path)
+            else:
+                payloads = _synthetic_documents(
+                    settings.memory_store_job_functions, settings.memory_store_chunks_per_filter
+                )
+            texts = [p["text"] for p in payloads]
+            vectors = np.asarray(get_embedder().encode(texts), dtype=np.float32)
+            store = InMemoryVectorStore()
+            store.upsert(QDRANT_COLLECTION_BRIEF, vectors, payloads)
+            logger.info("Vector store mémoire : %d chunks", store.count(QDRANT_COLLECTION_BRIEF))
+            _store = store
+    return _store
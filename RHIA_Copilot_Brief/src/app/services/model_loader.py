@@ -0,0 +1,38 @@
+import os
+
+from app.core.settings import get_settings
+
+# Pas de repli silencieux sur torch : les caches d'embeddings et de scores sont indexés par
+# `inference_backend`, des vecteurs torch y seraient rangés sous la clé ONNX.
+
+
+def load_embedder():
+    """Charge le modèle d'embedding dans le process courant (ONNX si configuré, sinon torch)."""
+    settings = get_settings()
+    if settings.inference_backend == "onnx":
+        try:
+            from app.services.onnx_backend import OnnxEmbedder
+
+            return OnnxEmbedder(os.path.join(settings.onnx_model_dir, "embedder"))
+        except Exception as e:
+            raise RuntimeError(f"Embedder ONNX indisponible: {e}") from e
+
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(settings.embedding_model)
+
+
+def load_reranker():
+    """Charge le cross-encoder dans le process courant (ONNX si configuré, sinon torch)."""
+    settings = get_settings()
+    if settings.inference_backend == "onnx":
+        try:
+            from app.services.onnx_backend import OnnxReranker
+
+            return OnnxReranker(os.path.join(settings.onnx_model_dir, "reranker"))
+        except Exception as e:
+            raise RuntimeError(f"Reranker ONNX indisponible: {e}") from e
+
+    from sentence_transformers import CrossEncoder
+
+    return CrossEncoder(settings.reranker_model)
@@ -0,0 +1,76 @@
+"""
+Backend ONNX Runtime (CPU) pour l'embedder et le cross-encoder.
+Les modèles sont exportés et quantifiés en int8 par `scripts/export_onnx.py` :
+
+    {onnx_model_dir}/embedder/model.int8.onnx + tokenizer.json
+    {onnx_model_dir}/reranker/model.int8.onnx + tokenizer.json
+"""
+import os
+from typing import Any
+
+import numpy as np
+
+ONNX_MODEL_FILE = "model.int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class _OnnxModel:
+    def __init__(self, model_dir: str, max_length: int):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, ONNX_MODEL_FILE),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    def _run(self, encodings) -> tuple[np.ndarray, np.ndarray]:
+        feed = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+        }
+        if "token_type_ids" in self._input_names:
+            feed["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+        output = self.session.run(None, feed)[0]
+        return output, feed["attention_mask"]
+
+
+class OnnxEmbedder(_OnnxModel):
+    """Équivalent de `SentenceTransformer.encode` pour all-MiniLM-L6-v2 (mean pooling + L2)."""
+
+    def __init__(self, model_dir: str, max_length: int = 256):
+        super().__init__(model_dir, max_length)
+
+    def encode(self, sentences: str | list[str], **_: Any) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self.encode([sentences])[0]
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+
+        token_embeddings, mask = self._run(self.tokenizer.encode_batch(list(sentences)))
+        mask = mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+class OnnxReranker(_OnnxModel):
+    """Équivalent de `CrossEncoder.predict` (logits bruts, une sortie par paire)."""
+
+    def __init__(self, model_dir: str, max_length: int = 512):
+        super().__init__(model_dir, max_length)
+
+    def predict(self, pairs: list[list[str]], **_: Any) -> np.ndarray:
+        if not len(pairs):
+            return np.empty((0,), dtype=np.float32)
+
+        logits, _ = self._run(self.tokenizer.encode_batch([tuple(p) for p in pairs]))
+        return logits[:, 0].astype(np.float32)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from app.core.settings import get_settings
+
+if TYPE_CHECKING:
+    import httpx
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_openai_http_client() -> httpx.AsyncClient:
+    """
+    Transport HTTP unique pour tout le trafic OpenAI (génération via `AsyncOpenAI`,
+    scoring via `ChatOpenAI`) : un seul pool keep-alive, HTTP/2 si activé.
+    """
+    global _http_client
+    if _http_client is None:
+        import httpx
+
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            http2=settings.openai_http2,
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive,
+                keepalive_expiry=settings.openai_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout, connect=settings.openai_connect_timeout),
+        )
+    return _http_client
+
+
+async def close_openai_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
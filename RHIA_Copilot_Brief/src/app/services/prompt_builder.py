@@ -1,5 +1,7 @@
 from typing import Dict, Any, List
 
+from app.models.chunk import Chunk
+
 
 def format_user_data(section_id: str, data: Dict[str, Any]) -> str:
     """Return a readable string from raw user data for a section."""
@@ -50,30 +52,29 @@ def format_user_data(section_id: str, data: Dict[str, Any]) -> str:
 
     return "; ".join(f"{k}: {v}" for k, v in data.items())
 
+def format_chunk(chunk: Chunk) -> str:
+    """Texte du chunk suivi de ses métadonnées autorisées, tel qu'injecté dans le prompt."""
+    meta_str = ", ".join(f"{k}: {v}" for k, v in chunk.metadata.items())
+    return f"{chunk.text}\n[{meta_str}]" if meta_str else chunk.text
+
+
 def build_prompt(
     section_id: str,
     rag_context: str | None = None,
     brief_data: Dict[str, Any] | None = None,
     user_preferences: Dict[str, Any] | None = None,
-    rag_chunks: List[Dict[str, Any]] | None = None,
+    rag_chunks: List[Chunk] | None = None,
+    previous_sections: Dict[str, str] | None = None,
 ) -> str:
     """
     Construit un prompt structuré pour le LLM à partir des données utilisateur + contexte RAG.
+    `previous_sections` (libellé → markdown) : sections dont celle-ci dépend, déjà rédigées.
     """
     brief_data = brief_data or {}
     user_preferences = user_preferences or {}
 
     if rag_chunks is not None:
-        formatted_chunks = []
-        for chunk in rag_chunks:
-            text = chunk.get("text", "")
-            metadata = chunk.get("metadata", {})
-            meta_str = ", ".join(f"{k}: {v}" for k, v in metadata.items() if k != "text")
-            if meta_str:
-                formatted_chunks.append(f"{text}\n[{meta_str}]")
-            else:
-                formatted_chunks.append(text)
-        rag_context = "\n\n".join(formatted_chunks)
+        rag_context = "\n\n".join(format_chunk(chunk) for chunk in rag_chunks)
     else:
         rag_context = rag_context or ""
 
@@ -88,12 +89,18 @@ def build_prompt(
     user_data = brief_data.get(section_id, {})
     user_data_str = format_user_data(section_id, user_data)
 
+    previous_block = ""
+    if previous_sections:
+        previous_block = "\n\n## SECTIONS DÉJÀ RÉDIGÉES (à garder cohérentes)\n" + "\n\n".join(
+            f"### {label}\n{markdown}" for label, markdown in previous_sections.items()
+        )
+
     return f"""
 Tu es un expert RH en charge de rédiger une seule section de brief de poste.
 Respecte les bonnes pratiques RH : clarté, inclusivité, précision.
 
 ## CONTEXTE SEMANTIQUE (issu de documents similaires)
-{rag_context}
+{rag_context}{previous_block}
 
 ## INSTRUCTIONS
 - Section : {section_id}
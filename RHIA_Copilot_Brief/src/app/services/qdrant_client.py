@@ -1,7 +1,19 @@
+from __future__ import annotations
+
 import os
-from qdrant_client import QdrantClient
+from typing import TYPE_CHECKING
+
+from app.core.settings import get_settings
+
+if TYPE_CHECKING:
+    from qdrant_client import AsyncQdrantClient, QdrantClient
+
+_async_client: AsyncQdrantClient | None = None
+
 
 def get_qdrant_client() -> QdrantClient:
+    from qdrant_client import QdrantClient
+
     qdrant_host = os.getenv("QDRANT_HOST", "http://qdrant:6333")
     qdrant_api_key = os.getenv("QDRANT_API_KEY", "")
 
@@ -9,4 +21,64 @@ def get_qdrant_client() -> QdrantClient:
         return QdrantClient(url=qdrant_host, api_key=qdrant_api_key)
     else:
         # Connexion locale sans authentification
-        return QdrantClient(host=qdrant_host.replace("http://", "").replace("https://", ""))
\ No newline at end of file
+        return QdrantClient(host=qdrant_host.replace("http://", "").replace("https://", ""))
+
+
+def create_async_qdrant_client() -> AsyncQdrantClient:
+    """
+    Client Qdrant asynchrone (REST httpx ou gRPC) avec pool de connexions dimensionné
+    par les settings.
+    """
+    import httpx
+    from qdrant_client import AsyncQdrantClient
+
+    settings = get_settings()
+    qdrant_host = os.getenv("QDRANT_HOST", "http://qdrant:6333")
+    qdrant_api_key = os.getenv("QDRANT_API_KEY", "")
+
+    limits = httpx.Limits(
+        max_connections=settings.qdrant_pool_size,
+        max_keepalive_connections=settings.qdrant_pool_size,
+        keepalive_expiry=settings.qdrant_keepalive_expiry,
+    )
+    grpc_options = {
+        "grpc.keepalive_time_ms": int(settings.qdrant_keepalive_expiry * 1000),
+        "grpc.keepalive_permit_without_calls": 1,
+    }
+
+    if qdrant_api_key:
+        location = {"url": qdrant_host, "api_key": qdrant_api_key}
+    else:
+        location = {"host": qdrant_host.replace("http://", "").replace("https://", "")}
+
+    return AsyncQdrantClient(
+        **location,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+        grpc_port=settings.qdrant_grpc_port,
+        grpc_options=grpc_options,
+        timeout=settings.qdrant_timeout,
+        limits=limits,
+    )
+
+
+async def init_async_qdrant_client() -> AsyncQdrantClient:
+    """Ouvre le client partagé (appelé dans le lifespan FastAPI)."""
+    global _async_client
+    if _async_client is None:
+        _async_client = create_async_qdrant_client()
+    return _async_client
+
+
+def get_async_qdrant_client() -> AsyncQdrantClient:
+    global _async_client
+    if _async_client is None:
+        # Hors lifespan (scripts, shell) : création paresseuse
+        _async_client = create_async_qdrant_client()
+    return _async_client
+
+
+async def close_async_qdrant_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
@@ -1,49 +1,257 @@
-from sentence_transformers import SentenceTransformer
-from qdrant_client.models import Filter, FieldCondition, MatchValue, SearchParams
-from app.services.qdrant_client import get_qdrant_client
-from app.core.constants import QDRANT_COLLECTION_BRIEF
+from __future__ import annotations
+
 import asyncio
-
-qdrant = get_qdrant_client()
-
-def get_embedder():
-    if not hasattr(get_embedder, "_model"):
-        get_embedder._model = SentenceTransformer("all-MiniLM-L6-v2")
-    return get_embedder._model
-
-def _retrieve_chunks_sync(section: str, job_function: str, seniority: str, language: str) -> list[dict]:
-    """Blocking Qdrant search used in async wrapper."""
-    query = f"{section} pour un rôle de {job_function} niveau {seniority}"
-    embedder = get_embedder()
-    vector = embedder.encode(query).tolist()
-
-    filters = Filter(
-        must=[
-            FieldCondition(key="type", match=MatchValue(value="brief")),
-            FieldCondition(key="section", match=MatchValue(value=section)),
-            FieldCondition(key="job_function", match=MatchValue(value=job_function)),
-            FieldCondition(key="seniority_level", match=MatchValue(value=seniority)),
-            FieldCondition(key="language", match=MatchValue(value=language))
-        ]
-    )
-
-    results = qdrant.search(
-        collection_name=QDRANT_COLLECTION_BRIEF,
-        query_vector=vector,
-        query_filter=filters,
-        limit=6,
-        search_params=SearchParams(hnsw_ef=64)
+from collections.abc import Sequence
+from itertools import product
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from app.core.constants import QDRANT_COLLECTION_BRIEF, SECTION_LABELS_TO_SLUGS, SENIORITY_LEVELS
+from app.core.settings import get_settings
+from app.models.chunk import Chunk
+from app.services.embedding_cache import get_embedding_cache
+from app.services.inference_client import RemoteEmbedder, get_inference_client
+from app.services.model_loader import load_embedder
+from app.services.qdrant_client import get_async_qdrant_client, get_qdrant_client
+from app.services.retrieval_cache import get_retrieval_cache
+from app.telemetry.logging import logger
+from app.telemetry.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+    from qdrant_client.models import Filter, SearchRequest
+
+RAG_TOP_K = 6
+RAG_HNSW_EF = 64
+PREWARM_BATCH_SIZE = 256
+# Fenêtres de texte encodées séparément (MiniLM tronque au-delà de ~256 tokens)
+LONG_TEXT_WINDOW_WORDS = 150
+
+_qdrant: QdrantClient | None = None
+
+
+class RetrievalRequest(NamedTuple):
+    """Une recherche RAG pour une section donnée (mêmes filtres que `retrieve_chunks`)."""
+
+    section: str
+    job_function: str
+    seniority: str
+    language: str
+
+
+def get_sync_qdrant() -> QdrantClient:
+    global _qdrant
+    if _qdrant is None:
+        _qdrant = get_qdrant_client()
+    return _qdrant
+
+
+def get_vector_store():
+    """Client de recherche bloquant : Qdrant, ou store mémoire si `vector_store="memory"`."""
+    if get_settings().vector_store == "memory":
+        from app.services.memory_store import get_memory_store
+
+        return get_memory_store()
+    return get_sync_qdrant()
+
+
+async def get_async_vector_store():
+    """Client de recherche asynchrone : Qdrant, ou store mémoire si `vector_store="memory"`."""
+    if get_settings().vector_store == "memory":
+        from app.services.memory_store import AsyncInMemoryVectorStore, get_memory_store
+
+        # Premier appel : chargement + encodage du corpus, hors event loop
+        return AsyncInMemoryVectorStore(await asyncio.to_thread(get_memory_store))
+    return get_async_qdrant_client()
+
+
+def get_embedder():
+    if not hasattr(get_embedder, "_model"):
+        if get_settings().inference_mode == "sidecar":
+            get_embedder._model = RemoteEmbedder(get_inference_client(), load_embedder)
+        else:
+            get_embedder._model = load_embedder()
+    return get_embedder._model
+
+
+def build_query(request: RetrievalRequest) -> str:
+    return f"{request.section} pour un rôle de {request.job_function} niveau {request.seniority}"
+
+
+def build_filter(request: RetrievalRequest) -> Filter:
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+    return Filter(
+        must=[
+            FieldCondition(key="type", match=MatchValue(value="brief")),
+            FieldCondition(key="section", match=MatchValue(value=request.section)),
+            FieldCondition(key="job_function", match=MatchValue(value=request.job_function)),
+            FieldCondition(key="seniority_level", match=MatchValue(value=request.seniority)),
+            FieldCondition(key="language", match=MatchValue(value=request.language))
+        ]
     )
-
-    return [{"text": r.payload.get("text"), "score": r.score, "metadata": r.payload} for r in results]
-
-
-async def retrieve_chunks(section: str, job_function: str, seniority: str, language: str) -> list[dict]:
-    """Asynchronous wrapper around the blocking Qdrant search."""
-    return await asyncio.to_thread(
-        _retrieve_chunks_sync,
-        section,
-        job_function,
-        seniority,
-        language,
+
+
+def _encode(queries: list[str]) -> np.ndarray:
+    """CPU only : encode les requêtes en un seul batch."""
+    return np.asarray(get_embedder().encode(queries), dtype=np.float32)
+
+
+def embed_long_texts(texts: Sequence[str]) -> np.ndarray:
+    """
+    CPU only : un vecteur normalisé par texte long (prompt, draft), moyenne des fenêtres
+    de `LONG_TEXT_WINDOW_WORDS` mots, toutes encodées en un seul batch. Pas de cache.
+    """
+    windows, owners = [], []
+    for i, text in enumerate(texts):
+        words = text.split()
+        for start in range(0, max(len(words), 1), LONG_TEXT_WINDOW_WORDS):
+            windows.append(" ".join(words[start:start + LONG_TEXT_WINDOW_WORDS]))
+            owners.append(i)
+
+    encoded = _encode(windows)
+    owners = np.asarray(owners)
+    means = np.stack([encoded[owners == i].mean(axis=0) for i in range(len(texts))])
+    return means / np.maximum(np.linalg.norm(means, axis=1, keepdims=True), 1e-12)
+
+
+def embed_queries_sync(queries: Sequence[str]) -> list[np.ndarray]:
+    """Version bloquante : seul le LRU mémoire est consulté."""
+    cache = get_embedding_cache()
+    keys = [cache.key(q) for q in queries]
+    vectors = [cache.get_local(k) for k in keys]
+
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    EMBEDDING_CACHE_HITS.labels("memory").inc(len(keys) - len(missing))
+    EMBEDDING_CACHE_MISSES.inc(len(missing))
+    if missing:
+        encoded = _encode([queries[i] for i in missing])
+        for i, vector in zip(missing, encoded, strict=True):
+            cache.put_local(keys[i], vector)
+            vectors[i] = vector
+    return vectors
+
+
+async def embed_queries(queries: Sequence[str]) -> list[np.ndarray]:
+    """
+    Embeddings des requêtes via le cache (mémoire puis Redis) ;
+    seules les requêtes absentes passent par le modèle, en un seul batch.
+    """
+    cache = get_embedding_cache()
+    vectors = await cache.get_many(queries)
+
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        misses = [queries[i] for i in missing]
+        encoded = await asyncio.to_thread(_encode, misses)
+        await cache.put_many(misses, encoded)
+        for i, vector in zip(missing, encoded, strict=True):
+            vectors[i] = vector
+    return vectors
+
+
+async def prewarm_embeddings(job_functions: Sequence[str]) -> int:
+    """
+    Pré-calcule les embeddings de toutes les requêtes possibles :
+    sections × niveaux de séniorité × fonctions métier fournies.
+    """
+    sections = [*SECTION_LABELS_TO_SLUGS.values(), "Rémunération & avantages", "Compétences"]
+    queries = [
+        build_query(RetrievalRequest(section, job_function, seniority, ""))
+        for section, seniority, job_function in product(sections, SENIORITY_LEVELS, job_functions)
+    ]
+    for start in range(0, len(queries), PREWARM_BATCH_SIZE):
+        await embed_queries(queries[start:start + PREWARM_BATCH_SIZE])
+
+    logger.info("Embeddings pré-calculés : %d requêtes", len(queries))
+    return len(queries)
+
+
+def _build_searches(requests: Sequence[RetrievalRequest], vectors) -> list[SearchRequest]:
+    from qdrant_client.models import SearchParams, SearchRequest
+
+    return [
+        SearchRequest(
+            vector=vector.tolist(),
+            filter=build_filter(req),
+            limit=RAG_TOP_K,
+            params=SearchParams(hnsw_ef=RAG_HNSW_EF),
+            with_payload=True,
+            with_vector=True,  # pour la sélection MMR du contexte
+        )
+        for req, vector in zip(requests, vectors, strict=True)
+    ]
+
+
+def _to_vector(vector) -> np.ndarray | None:
+    if isinstance(vector, list | np.ndarray):
+        return np.asarray(vector, dtype=np.float32)
+    return None
+
+
+def _to_chunks(results) -> list[Chunk]:
+    return [
+        Chunk.from_payload(str(r.id), r.score, r.payload, _to_vector(r.vector)) for r in results
+    ]
+
+
+def _retrieve_chunks_many_sync(requests: Sequence[RetrievalRequest]) -> list[list[Chunk]]:
+    """Blocking batched search: un seul `encode` et un seul `search_batch` pour N sections."""
+    if not requests:
+        return []
+
+    vectors = embed_queries_sync([build_query(req) for req in requests])
+    searches = _build_searches(requests, vectors)
+    results = get_vector_store().search_batch(
+        collection_name=QDRANT_COLLECTION_BRIEF, requests=searches
     )
+    return [_to_chunks(points) for points in results]
+
+
+def _retrieve_chunks_sync(
+    section: str, job_function: str, seniority: str, language: str
+) -> list[Chunk]:
+    """Blocking Qdrant search (scripts / usage hors event loop)."""
+    request = RetrievalRequest(section, job_function, seniority, language)
+    return _retrieve_chunks_many_sync([request])[0]
+
+
+async def retrieve_chunks_many(requests: Sequence[RetrievalRequest]) -> list[list[Chunk]]:
+    """
+    Recherche groupée : renvoie, dans l'ordre des requêtes, la liste de chunks de chaque section
+    (même format que `retrieve_chunks`).
+    Seul l'encodage part dans un thread ; la recherche passe par le client Qdrant asynchrone.
+    Les résultats déjà en cache (même filtres, même version de collection) ne sont pas recherchés.
+    """
+    requests = list(requests)
+    if not requests:
+        return []
+
+    cache = get_retrieval_cache()
+    version = await cache.get_version(QDRANT_COLLECTION_BRIEF)
+    keys = [(QDRANT_COLLECTION_BRIEF, version, *req) for req in requests]
+    results = [cache.get(key) for key in keys]
+
+    missing = [i for i, chunks in enumerate(results) if chunks is None]
+    if missing:
+        misses = [requests[i] for i in missing]
+        vectors = await embed_queries([build_query(req) for req in misses])
+        store = await get_async_vector_store()
+        found = await store.search_batch(
+            collection_name=QDRANT_COLLECTION_BRIEF,
+            requests=_build_searches(misses, vectors),
+        )
+        for i, points in zip(missing, found, strict=True):
+            chunks = _to_chunks(points)
+            cache.put(keys[i], chunks)
+            results[i] = chunks
+    return results
+
+
+async def retrieve_chunks(
+    section: str, job_function: str, seniority: str, language: str
+) -> list[Chunk]:
+    """Recherche RAG pour une seule section."""
+    request = RetrievalRequest(section, job_function, seniority, language)
+    results = await retrieve_chunks_many([request])
+    return results[0]
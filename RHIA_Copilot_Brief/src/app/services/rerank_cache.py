@@ -0,0 +1,100 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+from app.telemetry.metrics import RERANK_CACHE_HITS, RERANK_CACHE_MISSES
+
+
+class RerankScoreCache:
+    """
+    Scores cross-encoder indexés par (modèle, hash de la requête, id du point Qdrant) :
+    LRU en mémoire, avec un niveau Redis optionnel partagé entre workers.
+    """
+
+    def __init__(self, model_name: str, maxsize: int, ttl: int, use_redis: bool):
+        self.model_name = model_name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._lru: OrderedDict[str, float] = OrderedDict()
+
+    def key(self, query: str, point_id: str) -> str:
+        query_hash = hashlib.sha1(query.encode("utf-8")).hexdigest()
+        return f"rerank:{self.model_name}:{query_hash}:{point_id}"
+
+    def _put_local(self, key: str, score: float) -> None:
+        self._lru[key] = score
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    async def get_many(self, query: str, point_ids: Sequence[str | None]) -> list[float | None]:
+        """Un score par id ; None si absent (ou si le chunk n'a pas d'id)."""
+        keys = [self.key(query, pid) if pid else None for pid in point_ids]
+        scores: list[float | None] = []
+        for key in keys:
+            score = self._lru.get(key) if key else None
+            if score is not None:
+                self._lru.move_to_end(key)
+            scores.append(score)
+
+        missing = [i for i, s in enumerate(scores) if s is None and keys[i]]
+        if self.use_redis and missing:
+            from app.redis_client import get_redis
+
+            try:
+                values = await get_redis().mget([keys[i] for i in missing])
+            except Exception as e:
+                logger.warning("Rerank cache (redis) indisponible: %s", e)
+                values = [None] * len(missing)
+            for i, value in zip(missing, values, strict=True):
+                if value is not None:
+                    scores[i] = float(value)
+                    self._put_local(keys[i], scores[i])
+
+        hits = sum(s is not None for s in scores)
+        RERANK_CACHE_HITS.inc(hits)
+        RERANK_CACHE_MISSES.inc(len(scores) - hits)
+        return scores
+
+    async def put_many(
+        self, query: str, point_ids: Sequence[str | None], scores: Sequence[float]
+    ) -> None:
+        entries = {
+            self.key(query, pid): float(score)
+            for pid, score in zip(point_ids, scores, strict=True)
+            if pid
+        }
+        for key, score in entries.items():
+            self._put_local(key, score)
+
+        if not (self.use_redis and entries):
+            return
+
+        from app.redis_client import get_redis
+
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for key, score in entries.items():
+                    pipe.set(key, repr(score), ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Rerank cache (redis) indisponible: %s", e)
+
+
+_cache: RerankScoreCache | None = None
+
+
+def get_rerank_cache() -> RerankScoreCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = RerankScoreCache(
+            model_name=f"{settings.reranker_model}:{settings.inference_backend}",
+            maxsize=settings.rerank_cache_size,
+            ttl=settings.rerank_cache_ttl,
+            use_redis=settings.rerank_cache_redis,
+        )
+    return _cache
@@ -0,0 +1,55 @@
+import numpy as np
+from app.core.settings import get_settings
+from app.models.chunk import Chunk
+from app.services.batching import MicroBatcher
+from app.services.confidence_scoring import apply_rerank_scores, get_reranker
+from app.services.rerank_cache import get_rerank_cache
+
+_batcher: MicroBatcher | None = None
+
+
+def get_rerank_batcher() -> MicroBatcher | None:
+    """File de micro-batching partagée par toutes les requêtes du process."""
+    global _batcher
+    if _batcher is None:
+        model = get_reranker()
+        if model is None:
+            return None
+        settings = get_settings()
+        _batcher = MicroBatcher(
+            lambda pairs: np.asarray(model.predict(pairs), dtype=np.float32),
+            max_batch=settings.inference_max_batch,
+            max_wait_ms=settings.inference_max_wait_ms,
+            name="rerank",
+        )
+    return _batcher
+
+
+async def arerank_chunks(query: str, chunks: list[Chunk]) -> list[Chunk]:
+    """
+    Version asynchrone de `rerank_chunks` : les scores déjà connus viennent du cache,
+    seules les paires manquantes rejoignent le prochain micro-batch du cross-encoder.
+    """
+    batcher = get_rerank_batcher()
+    if batcher is None or not chunks:
+        return chunks
+
+    cache = get_rerank_cache()
+    point_ids = [c.id for c in chunks]
+    scores = await cache.get_many(query, point_ids)
+
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if missing:
+        computed = await batcher.submit([[query, chunks[i].text] for i in missing])
+        await cache.put_many(query, [point_ids[i] for i in missing], computed)
+        for i, score in zip(missing, computed, strict=True):
+            scores[i] = float(score)
+
+    return apply_rerank_scores(chunks, scores)
+
+
+async def close_rerank_batcher() -> None:
+    global _batcher
+    if _batcher is not None:
+        await _batcher.close()
+        _batcher = None
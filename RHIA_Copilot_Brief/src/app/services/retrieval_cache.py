@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from app.core.settings import get_settings
+from app.models.chunk import Chunk
+from app.telemetry.logging import logger
+from app.telemetry.metrics import RETRIEVAL_CACHE_HITS, RETRIEVAL_CACHE_MISSES
+
+
+def collection_version_key(collection: str) -> str:
+    return f"qdrant:version:{collection}"
+
+
+def bump_collection_version_sync(collection: str) -> int:
+    """
+    Incrémente la version d'une collection (à appeler après chaque upsert) :
+    toutes les entrées de cache de l'ancienne version deviennent inaccessibles.
+    """
+    from app.redis_client import get_sync_redis
+
+    return int(get_sync_redis().incr(collection_version_key(collection)))
+
+
+class RetrievalCache:
+    """
+    Cache TTL borné des résultats `retrieve_chunks`, indexé par les filtres de la recherche
+    et la version de la collection Qdrant.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, version_refresh: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_refresh = version_refresh
+        self._entries: OrderedDict[Hashable, tuple[float, tuple[Chunk, ...]]] = OrderedDict()
+        self._versions: dict[str, tuple[float, str]] = {}
+
+    async def get_version(self, collection: str) -> str:
+        """Version courante de la collection, relue dans Redis au plus toutes les N secondes."""
+        now = time.monotonic()
+        cached = self._versions.get(collection)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        from app.redis_client import get_redis
+
+        try:
+            version = await get_redis().get(collection_version_key(collection)) or "0"
+        except Exception as e:
+            logger.warning("Version de collection indisponible (redis): %s", e)
+            # Sans version fiable, on garde la précédente
+            version = cached[1] if cached else "0"
+
+        self._versions[collection] = (now + self.version_refresh, version)
+        return version
+
+    def get(self, key: Hashable) -> list[Chunk] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            RETRIEVAL_CACHE_MISSES.inc()
+            return None
+
+        self._entries.move_to_end(key)
+        RETRIEVAL_CACHE_HITS.inc()
+        # Chunks immuables : partagés sans copie (le reranking crée de nouveaux records)
+        return list(entry[1])
+
+    def put(self, key: Hashable, chunks: list[Chunk]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, tuple(chunks))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+_cache: RetrievalCache | None = None
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        _cache = RetrievalCache(
+            maxsize=settings.retrieval_cache_size,
+            ttl=settings.retrieval_cache_ttl,
+            version_refresh=settings.retrieval_version_refresh,
+        )
+    return _cache
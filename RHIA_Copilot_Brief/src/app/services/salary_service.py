@@ -26,9 +26,9 @@ class SalaryService:
         )
 
         for chunk in chunks:
-            score = chunk.get("score", 0.0)
+            score = chunk.score
             if score >= THRESHOLD_RAG_SIMILARITY:
-                min_sal, max_sal = extract_salary_range(chunk["text"])
+                min_sal, max_sal = extract_salary_range(chunk.text)
                 if min_sal and max_sal:
                     return {
                         "min_salary": min_sal,
@@ -0,0 +1,244 @@
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.settings import get_settings
+from app.telemetry.logging import logger
+
+# Compare-and-delete : seul le leader qui a posé le verrou le libère
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Renouvellement du verrou, par le seul leader qui l'a posé
+RENEW_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class IdempotencyKeyReused(ValueError):
+    """`Idempotency-Key` déjà utilisée pour une requête différente."""
+
+
+class SingleFlightError(RuntimeError):
+    """Échec du leader, relayé aux requêtes qui attendaient son résultat."""
+
+    def __init__(self, detail: str, status_code: int = 500):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Hash stable (clés triées) des données qui déterminent le résultat d'une requête."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _error_payload(error: Exception) -> dict[str, Any]:
+    return {
+        "status_code": getattr(error, "status_code", 500),
+        "detail": str(getattr(error, "detail", None) or error),
+    }
+
+
+class SingleFlight:
+    """
+    Regroupe les requêtes identiques en cours d'exécution :
+    - dans le process, les doublons attendent la même tâche ;
+    - entre réplicas, un verrou Redis élit un leader, les autres attendent son résultat
+      (canal pub/sub + copie courte durée pour ceux qui arrivent juste après) ;
+    - le leader renouvelle son verrou tant qu'il calcule : seul un leader disparu le perd,
+      et un suiveur reprend alors le calcul.
+    Le résultat doit être sérialisable en JSON.
+    """
+
+    def __init__(self, lock_ttl: int, result_ttl: int, wait_timeout: float):
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.wait_timeout = wait_timeout
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[dict[str, Any]]],
+        wait_timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """`wait_timeout` remplace l'attente par défaut d'un suiveur (calculs longs)."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._run_distributed(key, fn, wait_timeout or self.wait_timeout)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield : un client qui se déconnecte n'annule pas le calcul des autres
+        return await asyncio.shield(task)
+
+    async def _run_distributed(
+        self, key: str, fn: Callable[[], Awaitable[dict[str, Any]]], wait_timeout: float
+    ) -> dict[str, Any]:
+        from app.redis_client import get_redis
+
+        lock_key = f"singleflight:lock:{key}"
+        token = uuid.uuid4().hex
+        try:
+            redis = get_redis()
+            leader = await redis.set(lock_key, token, nx=True, ex=self.lock_ttl)
+        except Exception as e:
+            logger.warning("Single-flight (redis) indisponible: %s", e)
+            return await fn()
+
+        if not leader:
+            result = await self._follow(key, wait_timeout)
+            if result is not None:
+                return result
+            logger.warning("Leader single-flight disparu pour %s, reprise du calcul", key)
+            return await fn()
+
+        heartbeat = asyncio.create_task(self._heartbeat(lock_key, token))
+        try:
+            result = await fn()
+        except Exception as e:
+            await self._publish(key, {"error": _error_payload(e)})
+            raise
+        else:
+            await self._publish(key, {"result": result})
+            return result
+        finally:
+            heartbeat.cancel()
+            try:
+                await redis.eval(RELEASE_LOCK_LUA, 1, lock_key, token)
+            except Exception as e:
+                logger.warning("Libération du verrou single-flight impossible: %s", e)
+
+    async def _heartbeat(self, lock_key: str, token: str) -> None:
+        from app.redis_client import get_redis
+
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                await get_redis().eval(RENEW_LOCK_LUA, 1, lock_key, token, self.lock_ttl)
+            except Exception as e:
+                logger.warning("Renouvellement du verrou single-flight impossible: %s", e)
+
+    async def _publish(self, key: str, message: dict[str, Any]) -> None:
+        from app.redis_client import get_redis
+
+        data = json.dumps(message, ensure_ascii=False)
+        try:
+            redis = get_redis()
+            await redis.set(f"singleflight:result:{key}", data, ex=self.result_ttl)
+            await redis.publish(f"singleflight:done:{key}", data)
+        except Exception as e:
+            logger.warning("Publication single-flight impossible: %s", e)
+
+    async def _follow(self, key: str, wait_timeout: float) -> dict[str, Any] | None:
+        """Attend le résultat du leader ; None si le leader a disparu ou trop tardé."""
+        from app.redis_client import get_redis
+
+        redis = get_redis()
+        pubsub = redis.pubsub()
+        try:
+            # Abonnement avant la lecture de la copie : pas de fenêtre où le résultat serait manqué
+            await pubsub.subscribe(f"singleflight:done:{key}")
+            data = await redis.get(f"singleflight:result:{key}")
+            deadline = time.monotonic() + wait_timeout
+            while data is None and time.monotonic() < deadline:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is not None:
+                    data = message["data"]
+                elif not await redis.exists(f"singleflight:lock:{key}"):
+                    data = await redis.get(f"singleflight:result:{key}")
+                    if data is None:
+                        return None
+        except Exception as e:
+            logger.warning("Attente single-flight interrompue (redis): %s", e)
+            return None
+        finally:
+            await pubsub.close()
+
+        if data is None:
+            return None
+        message = json.loads(data)
+        if "error" in message:
+            raise SingleFlightError(**message["error"])
+        return message["result"]
+
+
+class IdempotencyStore:
+    """
+    Rejoue pendant `ttl` secondes la réponse d'une requête portant le même `Idempotency-Key`.
+    L'empreinte de la requête est conservée avec la réponse : une clé réutilisée pour une
+    autre requête lève `IdempotencyKeyReused` au lieu de rejouer une réponse étrangère.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @staticmethod
+    def key(scope: str, idempotency_key: str) -> str:
+        return f"idempotency:{scope}:{idempotency_key}"
+
+    async def get(
+        self, scope: str, idempotency_key: str, fingerprint: str
+    ) -> dict[str, Any] | None:
+        from app.redis_client import get_redis
+
+        try:
+            data = await get_redis().get(self.key(scope, idempotency_key))
+        except Exception as e:
+            logger.warning("Idempotency store (redis) indisponible: %s", e)
+            return None
+        if data is None:
+            return None
+        record = json.loads(data)
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReused(f"Idempotency-Key {idempotency_key} déjà utilisée")
+        return record["response"]
+
+    async def put(
+        self, scope: str, idempotency_key: str, fingerprint: str, result: dict[str, Any]
+    ) -> None:
+        from app.redis_client import get_redis
+
+        try:
+            record = {"fingerprint": fingerprint, "response": result}
+            payload = json.dumps(record, ensure_ascii=False)
+            await get_redis().set(self.key(scope, idempotency_key), payload, ex=self.ttl)
+        except Exception as e:
+            logger.warning("Idempotency store (redis) indisponible: %s", e)
+
+
+_single_flight: SingleFlight | None = None
+_idempotency_store: IdempotencyStore | None = None
+
+
+def get_single_flight() -> SingleFlight:
+    global _single_flight
+    if _single_flight is None:
+        settings = get_settings()
+        _single_flight = SingleFlight(
+            lock_ttl=settings.singleflight_lock_ttl,
+            result_ttl=settings.singleflight_result_ttl,
+            wait_timeout=settings.singleflight_wait_timeout,
+        )
+    return _single_flight
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _idempotency_store
+    if _idempotency_store is None:
+        _idempotency_store = IdempotencyStore(ttl=get_settings().idempotency_ttl)
+    return _idempotency_store
@@ -32,7 +32,7 @@ class SkillService:
         )
 
         for chunk in chunks:
-            text = chunk["text"]
+            text = chunk.text
             if "soft skills" in text.lower() or "compétences comportementales" in text:
                 hard = extract_skills(text, type="hard")
                 soft = extract_skills(text, type="soft")
@@ -40,7 +40,7 @@ class SkillService:
                     "hard_skills": hard,
                     "soft_skills": soft,
                     "source": "RAG",
-                    "confidence": chunk.get("score", 0.75)
+                    "confidence": chunk.score
                 }
 
         # Fallback
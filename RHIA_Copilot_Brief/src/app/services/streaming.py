@@ -0,0 +1,104 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any
+
+# File de sortie de la requête SSE en cours : `call_llm` y pousse les tokens du draft.
+# Le ContextVar est copié dans la tâche qui exécute le graphe, donc propre à chaque requête.
+token_sink: ContextVar[asyncio.Queue | None] = ContextVar("token_sink", default=None)
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def emit_token(delta: str) -> None:
+    """Pousse un fragment de draft vers le flux SSE courant (no-op hors streaming)."""
+    sink = token_sink.get()
+    if sink is not None:
+        sink.put_nowait(("token", {"delta": delta}))
+
+
+async def stream_graph(
+    graph: Any,
+    state: dict[str, Any],
+    to_final: Callable[[dict[str, Any]], dict[str, Any]],
+    config: dict[str, Any],
+    follow_up: Callable[[dict[str, Any]], Awaitable[dict[str, Any]]] | None = None,
+) -> AsyncIterator[str]:
+    """
+    Exécute le graphe et le traduit en Server-Sent Events :
+    `node` à la fin de chaque nœud, `token` pour chaque fragment du draft,
+    puis `final` (confiance, label...) ou `error`.
+    Quand le Verifier relance la génération, `draft_discarded` précède les tokens du nouveau
+    draft : le client doit vider ce qu'il a affiché.
+    Avec `follow_up` (scoring différé), le flux reste ouvert jusqu'à un dernier événement `score`.
+    Un run interrompu de la même requête reprend depuis ses checkpoints (voir `start_run`) ;
+    `final` est construit sur l'état complet du thread, pas seulement sur les nœuds rejoués.
+    """
+    from app.graph.checkpointing import mark_interrupted, release_thread, start_run
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run() -> None:
+        try:
+            graph_input, run_config = await start_run(graph, state, config)
+            try:
+                values = await _stream_updates(graph, graph_input, run_config, state, queue)
+            except (Exception, asyncio.CancelledError):
+                await mark_interrupted(graph, run_config)
+                raise
+            await release_thread(graph, run_config)
+            queue.put_nowait(("final", to_final(values)))
+            if follow_up is not None:
+                queue.put_nowait(("score", await follow_up(values)))
+        except Exception as e:
+            queue.put_nowait(("error", {"detail": str(e)}))
+        finally:
+            queue.put_nowait((None, None))
+
+    reset = token_sink.set(queue)
+    task = asyncio.create_task(run())
+    token_sink.reset(reset)
+
+    try:
+        while True:
+            event, data = await queue.get()
+            if event is None:
+                break
+            yield sse_event(event, data)
+    finally:
+        # Client déconnecté : on arrête le graphe
+        if not task.done():
+            task.cancel()
+
+
+async def _stream_updates(
+    graph: Any,
+    graph_input: dict[str, Any] | None,
+    config: dict[str, Any],
+    state: dict[str, Any],
+    queue: asyncio.Queue,
+) -> dict[str, Any]:
+    """Pousse un événement `node` par nœud terminé ; renvoie l'état final complet du thread."""
+    from app.graph.checkpointing import thread_values
+
+    values = dict(state)
+    if graph_input is None:
+        # Reprise : les clés écrites avant l'interruption ne repassent pas dans le flux
+        values = await thread_values(graph, config, values)
+    async for update in graph.astream(graph_input, config=config, stream_mode="updates"):
+        for node, delta in update.items():
+            delta = delta or {}
+            previous_retries = values.get("retry_count", 0)
+            values.update(delta)
+            event = {"node": node}
+            if "retry_count" in delta:
+                event["retry_count"] = delta["retry_count"]
+            queue.put_nowait(("node", event))
+            if delta.get("retry_count", previous_retries) > previous_retries:
+                queue.put_nowait(("draft_discarded", {"retry_count": delta["retry_count"]}))
+    return await thread_values(graph, config, values)
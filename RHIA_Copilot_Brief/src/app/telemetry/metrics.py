@@ -0,0 +1,184 @@
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+# === Cache RAG (retrieve_chunks) ===
+RETRIEVAL_CACHE_HITS = Counter(
+    "rhia_retrieval_cache_hits_total",
+    "Recherches RAG servies depuis le cache de résultats.",
+)
+RETRIEVAL_CACHE_MISSES = Counter(
+    "rhia_retrieval_cache_misses_total",
+    "Recherches RAG envoyées à Qdrant (absentes ou expirées du cache).",
+)
+
+# === Micro-batching (reranking, serveur d'inférence) ===
+BATCH_QUEUE_DEPTH = Gauge(
+    "rhia_batch_queue_depth",
+    # Compte les demandes, pas les éléments : une demande de reranking porte N paires
+    # (le nombre d'éléments par batch est dans rhia_batch_size)
+    "Demandes (appels submit) en attente d'un micro-batch.",
+    ["batcher"],
+    multiprocess_mode="livesum",
+)
+BATCH_SIZE = Histogram(
+    "rhia_batch_size",
+    "Nombre d'éléments par micro-batch exécuté.",
+    ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+BATCH_WAIT_SECONDS = Histogram(
+    "rhia_batch_wait_seconds",
+    "Attente d'une demande entre sa soumission et le départ de son batch.",
+    ["batcher"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# === Cache des scores de reranking ===
+RERANK_CACHE_HITS = Counter(
+    "rhia_rerank_cache_hits_total",
+    "Paires (requête, chunk) dont le score cross-encoder vient du cache.",
+)
+RERANK_CACHE_MISSES = Counter(
+    "rhia_rerank_cache_misses_total",
+    "Paires (requête, chunk) envoyées au cross-encoder.",
+)
+
+# === Cache des réponses LLM ===
+LLM_CACHE_HITS = Counter(
+    "rhia_llm_cache_hits_total",
+    "Réponses LLM servies depuis le cache, par niveau (exact, semantic).",
+    ["tier"],
+)
+LLM_CACHE_MISSES = Counter(
+    "rhia_llm_cache_misses_total",
+    "Appels LLM non servis par le cache, par niveau consulté.",
+    ["tier"],
+)
+
+# === Gouverneur des appels OpenAI ===
+LLM_CONCURRENCY_LIMIT = Gauge(
+    "rhia_llm_concurrency_limit",
+    "Limite de concurrence AIMD courante des appels LLM (somme des workers).",
+    multiprocess_mode="livesum",
+)
+LLM_IN_FLIGHT = Gauge(
+    "rhia_llm_in_flight",
+    "Appels LLM en cours (somme des workers).",
+    multiprocess_mode="livesum",
+)
+LLM_GOVERNOR_WAIT_SECONDS = Histogram(
+    "rhia_llm_governor_wait_seconds",
+    "Attente d'un appel LLM (file + budget RPM/TPM) avant son envoi.",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+LLM_RATE_LIMITED = Counter(
+    "rhia_llm_rate_limited_total",
+    "Réponses 429 d'OpenAI rejouées par le gouverneur.",
+)
+
+# === Requêtes LLM couvertes (hedging) ===
+LLM_HEDGES = Counter(
+    "rhia_llm_hedges_total",
+    "Secondes requêtes LLM lancées après dépassement du seuil de latence.",
+    ["model"],
+)
+LLM_HEDGE_WINS = Counter(
+    "rhia_llm_hedge_wins_total",
+    "Requête gagnante parmi les requêtes couvertes (primary ou hedge).",
+    ["model", "winner"],
+)
+LLM_HEDGE_THRESHOLD = Gauge(
+    "rhia_llm_hedge_threshold_seconds",
+    "Seuil de latence courant déclenchant une requête couverte.",
+    ["model"],
+    multiprocess_mode="max",
+)
+
+# === Stratégies de génération ===
+GENERATION_LATENCY_SECONDS = Histogram(
+    "rhia_generation_latency_seconds",
+    "Durée de génération d'une section (graphe complet), par stratégie (retry, best_of_n).",
+    ["strategy"],
+    buckets=(0.5, 1.0, 2.5, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 45.0, 60.0, 90.0),
+)
+
+# === Nœuds LangGraph (brief, feedback) ===
+GRAPH_NODE_SECONDS = Histogram(
+    "rhia_graph_node_seconds",
+    "Durée d'exécution d'un nœud de graphe.",
+    ["graph", "node"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0),
+)
+GRAPH_NODE_RUNS = Counter(
+    "rhia_graph_node_runs_total",
+    "Exécutions d'un nœud de graphe, par issue (ok, error).",
+    ["graph", "node", "outcome"],
+)
+GRAPH_RETRIES = Counter(
+    "rhia_graph_retries_total",
+    "Relances de génération décidées par le Verifier (confiance trop basse).",
+    ["graph"],
+)
+
+# === LLM ===
+LLM_TOKENS = Counter(
+    "rhia_llm_tokens_total",
+    "Tokens consommés par les complétions, par type (prompt, completion).",
+    ["model", "kind"],
+)
+
+# === RAG ===
+RAG_CHUNKS = Histogram(
+    "rhia_rag_chunks",
+    "Chunks par section et par étape (retrieved, filtered, selected).",
+    ["stage"],
+    buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 24),
+)
+RAG_RETRIEVAL_ERRORS = Counter(
+    "rhia_rag_retrieval_errors_total",
+    "Recherches RAG en échec (la section est générée sans contexte).",
+)
+
+# === Cache des embeddings de requêtes ===
+EMBEDDING_CACHE_HITS = Counter(
+    "rhia_embedding_cache_hits_total",
+    "Embeddings de requêtes servis depuis le cache, par niveau (memory, redis).",
+    ["tier"],
+)
+EMBEDDING_CACHE_MISSES = Counter(
+    "rhia_embedding_cache_misses_total",
+    "Embeddings de requêtes calculés par le modèle.",
+)
+
+# === Redis ===
+REDIS_COMMAND_SECONDS = Histogram(
+    "rhia_redis_command_seconds",
+    "Latence des commandes Redis (client asynchrone), par commande.",
+    ["command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Exposition Prometheus. Avec plusieurs workers uvicorn, définir `PROMETHEUS_MULTIPROC_DIR`
+    (répertoire vidé au démarrage du serveur) : chaque worker y écrit ses valeurs et
+    n'importe lequel agrège celles de tous les workers.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
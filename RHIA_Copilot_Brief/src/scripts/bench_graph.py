@@ -0,0 +1,207 @@
+"""
+Micro-benchmark du graphe de brief : latence et mémoire allouée par exécution complète,
+avec le faux LLM (latence ~nulle) et le vector store mémoire — seul le coût du graphe
+et de ses nœuds (RAG, prompt, scoring local) est mesuré.
+
+Le même graphe est mesuré deux fois, côte à côte :
+- `delta` : nœuds actuels (delta d'état, chunks compacts, prompt construit une fois) ;
+- `full_state` : mêmes nœuds enveloppés pour reproduire l'ancien comportement — chaque nœud
+  renvoie `{**state, ...}`, chaque chunk porte le payload complet (texte en double) et le
+  nœud LLM reconstruit le prompt. Les vecteurs conservés dans l'état ne sont pas reproduits :
+  l'écart mesuré est un minorant.
+
+Depuis src/ (Redis joignable de préférence) :
+    python scripts/bench_graph.py --runs 50
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import replace
+
+# Settings sensibles à la casse : noms de variables = noms des champs
+BENCH_ENV = {
+    "llm_provider": "fake",
+    "fake_llm_latency_median": "0.001",
+    "fake_llm_latency_sigma": "0",
+    "fake_llm_error_rate": "0",
+    "fake_llm_rate_limit_rate": "0",
+    "vector_store": "memory",
+    "llm_cache_enabled": "false",
+    "llm_hedging": "false",
+    "graph_checkpointing": "false",
+}
+# Champs obligatoires des settings, inutilisés ici
+REQUIRED_ENV = {
+    "OPENAI_API_KEY": "bench",
+    "SUPABASE_URL": "http://localhost",
+    "JWT_SECRET_KEY": "bench",
+}
+
+STATE = {
+    "session_id": "bench",
+    "current_section": "responsabilites_cles",
+    "brief_data": {"responsabilites_cles": {"job_function": "Data Scientist"}},
+    "user_preferences": {"seniority": "Senior", "language": "fr", "sections": [True] * 18},
+    "retry_count": 0,
+}
+# Relances du Verifier comprises (faux LLM : confiance aléatoire)
+CONFIG = {"recursion_limit": 25, "configurable": {"thread_id": "bench"}}
+
+
+MODES = ("full_state", "delta")
+
+
+def full_state_node(name: str, node):
+    """Ancien contrat des nœuds : état complet recopié, payload complet, prompt reconstruit."""
+    from app.services.prompt_builder import build_prompt
+
+    async def run(state: dict) -> dict:
+        if name == "call_llm":
+            # L'ancien LLMAgent reconstruisait le prompt à partir des chunks
+            prompt = build_prompt(
+                section_id=state["section_id"],
+                rag_context="\n\n".join(old_format_chunk(c) for c in state["rag_chunks"]),
+                brief_data=state.get("brief_data", {}),
+                user_preferences=state.get("user_preferences", {}),
+                previous_sections=state.get("previous_sections"),
+            )
+            state = {**state, "prompt": prompt}
+        result = node(state)
+        if inspect.isawaitable(result):
+            result = await result
+        if name == "retrieve_chunks":
+            chunks = [full_payload(chunk, state) for chunk in result["rag_chunks"]]
+            result = {**result, "rag_chunks": chunks}
+        return {**state, **result}
+
+    return run
+
+
+def old_format_chunk(chunk) -> str:
+    """Ancien `format_chunk` : métadonnées autorisées filtrées dans le payload complet."""
+    from app.models.chunk import RAG_METADATA_FIELDS
+
+    metadata = chunk.metadata
+    meta_str = ", ".join(
+        f"{k}: {metadata[k]}" for k in RAG_METADATA_FIELDS if metadata.get(k) not in (None, "")
+    )
+    return f"{chunk.text}\n[{meta_str}]" if meta_str else chunk.text
+
+
+def full_payload(chunk, state: dict):
+    """Chunk tel que stocké avant : tout le payload du point (texte compris) en métadonnées."""
+    preferences = state.get("user_preferences", {})
+    section = state["current_section"]
+    payload = {
+        "text": chunk.text,
+        **chunk.metadata,
+        "section": section,
+        "job_function": state["brief_data"].get(section, {}).get("job_function"),
+        "seniority_level": preferences.get("seniority"),
+        "language": preferences.get("language"),
+        "type": "brief",
+    }
+    return replace(chunk, metadata=payload)
+
+
+def build_graph(mode: str):
+    from app.graph import brief_generator
+
+    if mode == "delta":
+        return brief_generator.build_brief_graph()
+
+    instrument_node = brief_generator.instrument_node
+    brief_generator.instrument_node = lambda graph, name, node: full_state_node(
+        name, instrument_node(graph, name, node)
+    )
+    try:
+        return brief_generator.build_brief_graph()
+    finally:
+        brief_generator.instrument_node = instrument_node
+
+
+async def run_once(graph) -> None:
+    await graph.ainvoke(dict(STATE), config=CONFIG)
+
+
+async def bench(graphs: dict[str, object], runs: int) -> dict[str, dict]:
+    """Exécutions alternées d'un mode à l'autre : même état des caches, pas de biais d'ordre."""
+    # Premier passage : chargement des modèles, caches froids
+    for graph in graphs.values():
+        await run_once(graph)
+
+    latencies: dict[str, list[float]] = {mode: [] for mode in graphs}
+    for _ in range(runs):
+        for mode, graph in graphs.items():
+            start = time.perf_counter()
+            await run_once(graph)
+            latencies[mode].append(time.perf_counter() - start)
+
+    # Mesure mémoire séparée : tracemalloc ralentit fortement l'exécution
+    peaks: dict[str, list[int]] = {mode: [] for mode in graphs}
+    tracemalloc.start()
+    for _ in range(runs):
+        for mode, graph in graphs.items():
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            await run_once(graph)
+            peaks[mode].append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {mode: summarize(latencies[mode], peaks[mode]) for mode in graphs}
+
+
+def summarize(latencies: list[float], peaks: list[int]) -> dict:
+    latencies = sorted(latencies)
+    runs = len(latencies)
+    return {
+        "runs": runs,
+        "latency_ms_mean": statistics.fmean(latencies) * 1000,
+        "latency_ms_p50": latencies[runs // 2] * 1000,
+        "latency_ms_p95": latencies[min(runs - 1, int(0.95 * runs))] * 1000,
+        "peak_alloc_kib_mean": statistics.fmean(peaks) / 1024,
+    }
+
+
+async def bench_modes(runs: int) -> dict[str, dict]:
+    from app.services.memory_store import get_memory_store
+
+    get_memory_store()
+    return await bench({mode: build_graph(mode) for mode in MODES}, runs)
+
+
+def print_results(results: dict[str, dict]) -> None:
+    before, after = results["full_state"], results["delta"]
+    print(f"{'':>22}   {'full_state':>10}   {'delta':>10}")
+    for key, value in after.items():
+        if key == "runs":
+            continue
+        change = 100 * (value - before[key]) / before[key]
+        print(f"{key:>22} : {before[key]:10.2f}   {value:10.2f}   ({change:+.1f} %)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Latence et allocations par exécution du graphe de brief."
+    )
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--output", help="Écrit les résultats (JSON).")
+    args = parser.parse_args()
+
+    os.environ.update(BENCH_ENV)
+    for name, value in REQUIRED_ENV.items():
+        os.environ.setdefault(name, value)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    results = asyncio.run(bench_modes(args.runs))
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
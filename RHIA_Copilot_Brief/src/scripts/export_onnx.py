@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import torch
+from app.core.settings import get_settings
+from app.services.onnx_backend import ONNX_MODEL_FILE, OnnxEmbedder, OnnxReranker
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from sentence_transformers import CrossEncoder, SentenceTransformer
+
+# Phrases de contrôle pour la vérification de parité torch / ONNX
+PARITY_QUERIES = [
+    "Compétences & exigences pour un rôle de Product Manager niveau Senior",
+    "Rémunération & avantages pour un rôle de Data Analyst niveau Junior",
+    "Objectifs & KPIs pour un rôle de Directeur Financier niveau C-level",
+]
+PARITY_PASSAGES = [
+    "Maîtrise de SQL et Python, pratique de Power BI. Soft skills : rigueur, autonomie.",
+    "Salaire entre 38k et 45k selon expérience, tickets restaurant et télétravail partiel.",
+    "Piloter le budget annuel et réduire le DSO de 10 jours sur 12 mois.",
+]
+MIN_EMBEDDING_COSINE = 0.99
+MAX_RERANK_ABS_DIFF = 0.5
+
+
+def _export(
+    model: torch.nn.Module,
+    tokenizer,
+    output_dir: str,
+    output: tuple[str, dict[int, str]],
+    pairs: bool,
+):
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer.save_pretrained(output_dir)
+
+    sample = (PARITY_QUERIES[:2], PARITY_PASSAGES[:2]) if pairs else (PARITY_QUERIES[:2],)
+    inputs = tokenizer(*sample, padding=True, truncation=True, return_tensors="pt")
+    # Ordre positionnel de BertModel.forward
+    input_names = [n for n in ("input_ids", "attention_mask", "token_type_ids") if n in inputs]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    output_name, output_axes = output
+    dynamic_axes[output_name] = output_axes
+
+    fp32_path = os.path.join(output_dir, "model.fp32.onnx")
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(inputs[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+
+    quantize_dynamic(
+        fp32_path, os.path.join(output_dir, ONNX_MODEL_FILE), weight_type=QuantType.QInt8
+    )
+    print(f"✅ {output_dir}/{ONNX_MODEL_FILE}")
+
+
+def export_embedder(output_dir: str) -> None:
+    st = SentenceTransformer(get_settings().embedding_model)
+    transformer = st[0]
+    # (batch, sequence, hidden) : la longueur varie avec le padding de chaque batch
+    output = ("last_hidden_state", {0: "batch", 1: "sequence"})
+    _export(transformer.auto_model, transformer.tokenizer, output_dir, output, pairs=False)
+
+
+def export_reranker(output_dir: str) -> None:
+    ce = CrossEncoder(get_settings().reranker_model)
+    _export(ce.model, ce.tokenizer, output_dir, ("logits", {0: "batch"}), pairs=True)
+
+
+def parity_metrics(model_dir: str) -> dict[str, float | bool]:
+    """Écarts entre les sorties ONNX int8 et les sorties torch de référence."""
+    settings = get_settings()
+
+    reference = SentenceTransformer(settings.embedding_model).encode(PARITY_QUERIES)
+    candidate = OnnxEmbedder(os.path.join(model_dir, "embedder")).encode(PARITY_QUERIES)
+    cosines = (reference * candidate).sum(axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(candidate, axis=1)
+    )
+
+    pairs = [[q, p] for q in PARITY_QUERIES for p in PARITY_PASSAGES]
+    ref_scores = CrossEncoder(settings.reranker_model).predict(pairs)
+    onnx_scores = OnnxReranker(os.path.join(model_dir, "reranker")).predict(pairs)
+    max_diff = float(np.abs(ref_scores - onnx_scores).max())
+    step = len(PARITY_PASSAGES)
+    same_ranking = all(
+        np.argmax(ref_scores[i:i + step]) == np.argmax(onnx_scores[i:i + step])
+        for i in range(0, len(pairs), step)
+    )
+
+    return {
+        "min_cosine": float(cosines.min()),
+        "max_rerank_diff": max_diff,
+        "same_ranking": bool(same_ranking),
+    }
+
+
+def check_parity(model_dir: str) -> bool:
+    """Compare les sorties ONNX int8 aux sorties torch de référence."""
+    metrics = parity_metrics(model_dir)
+    min_cosine, max_diff = metrics["min_cosine"], metrics["max_rerank_diff"]
+    print(f"🧪 Embeddings : cosinus min = {min_cosine:.4f} (seuil {MIN_EMBEDDING_COSINE})")
+    print(f"🧪 Reranker : écart max = {max_diff:.4f} (seuil {MAX_RERANK_ABS_DIFF})")
+    print(f"🧪 Reranker : même top-1 = {metrics['same_ranking']}")
+    return bool(
+        min_cosine >= MIN_EMBEDDING_COSINE
+        and max_diff <= MAX_RERANK_ABS_DIFF
+        and metrics["same_ranking"]
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export + quantification int8 des modèles en ONNX."
+    )
+    parser.add_argument("--output", type=str, default=get_settings().onnx_model_dir)
+    parser.add_argument(
+        "--check-only", action="store_true", help="Vérifie la parité sans réexporter."
+    )
+    args = parser.parse_args()
+
+    if not args.check_only:
+        export_embedder(os.path.join(args.output, "embedder"))
+        export_reranker(os.path.join(args.output, "reranker"))
+
+    sys.exit(0 if check_parity(args.output) else 1)
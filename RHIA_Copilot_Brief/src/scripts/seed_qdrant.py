@@ -5,7 +5,9 @@ import argparse
 from typing import List, Dict
 from qdrant_client import QdrantClient
 from qdrant_client.http.models import PointStruct, VectorParams, Distance
+from app.core.constants import QDRANT_COLLECTION_BRIEF, QDRANT_COLLECTION_RULES
 from app.core.settings import AppSettings
+from app.services.retrieval_cache import bump_collection_version_sync
 from sentence_transformers import SentenceTransformer
 
 # Initialise le modèle d'embedding localement
@@ -18,7 +20,7 @@ def embed_text(text: str) -> list[float]:
     return _embedder.encode(text).tolist()
 
 # Config collections
-COLLECTIONS = ["briefs", "rules"]
+COLLECTIONS = [QDRANT_COLLECTION_BRIEF, QDRANT_COLLECTION_RULES]
 VECTOR_DIM = 768  # ou 1536 selon ton modèle (OpenAI, MiniLM...)
 
 # Simule un chunkage naïf par paragraphes
@@ -76,6 +78,9 @@ def seed_collection(
     else:
         qdrant.upsert(collection_name=collection_name, points=points)
         print(f"🚀 {len(points)} points injectés dans {collection_name}.")
+        # Invalide le cache RAG des API (clé de version de la collection)
+        version = bump_collection_version_sync(collection_name)
+        print(f"🔖 Version de {collection_name} : {version}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Seed Qdrant avec briefs & rules.")
@@ -87,6 +92,7 @@ if __name__ == "__main__":
 
     qdrant = QdrantClient(host=AppSettings.qdrant_host, port=AppSettings.qdrant_port)
 
-    seed_collection(qdrant, "briefs", args.briefs, dry_run=args.dry_run)
-    seed_collection(qdrant, "rules", args.rules, dry_run=args.dry_run)
+    # Mêmes noms que ceux lus par l'API (sinon la version bumpée n'invalide pas son cache)
+    seed_collection(qdrant, QDRANT_COLLECTION_BRIEF, args.briefs, dry_run=args.dry_run)
+    seed_collection(qdrant, QDRANT_COLLECTION_RULES, args.rules, dry_run=args.dry_run)
  
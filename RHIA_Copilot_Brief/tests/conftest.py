@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+# Champs obligatoires des settings, sans valeur réelle en test (aucun appel externe)
+REQUIRED_ENV = {
+    "OPENAI_API_KEY": "test",
+    "SUPABASE_URL": "http://localhost",
+    "JWT_SECRET_KEY": "test",
+}
+
+for name, value in REQUIRED_ENV.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Clients Redis (texte, binaire, synchrone) branchés sur un même serveur fakeredis."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from app import redis_client
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis_client,
+        "_clients",
+        {
+            True: fakeredis.aioredis.FakeRedis(server=server, decode_responses=True),
+            False: fakeredis.aioredis.FakeRedis(server=server),
+        },
+    )
+    monkeypatch.setattr(
+        redis_client, "_sync_client", fakeredis.FakeRedis(server=server, decode_responses=True)
+    )
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
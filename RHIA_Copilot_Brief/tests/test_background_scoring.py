@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+STATE = {
+    "session_id": "s1",
+    "current_section": "contexte",
+    "prompt": "prompt",
+    "draft": "# draft",
+    "rag_confidence": 0.9,
+    # Sortie de ProvisionalScorer : heuristique LLM mise de côté, confiance provisoire
+    "llm_confidence": 0.9,
+    "confidence": 0.9,
+    "confidence_label": "haute",
+    "retry_count": 0,
+}
+
+
+@pytest.fixture
+def graph_runs(monkeypatch):
+    """Graphe de régénération remplacé : journal des états reçus, draft `# révisé`."""
+    import app.graph.brief_generator as brief_generator
+    import app.graph.checkpointing as checkpointing
+
+    runs = []
+
+    async def run_graph(graph, state, config):
+        runs.append(state)
+        return {**state, "draft": "# révisé", "confidence": 0.9, "fallback_needed": False}
+
+    monkeypatch.setattr(checkpointing, "run_graph", run_graph)
+    monkeypatch.setattr(brief_generator, "get_brief_graph", lambda: None)
+    return runs
+
+
+def _evaluator(monkeypatch, score):
+    from app.graph.nodes import answer_scorer
+
+    async def score_answer(prompt, answer, rag_context):
+        return score
+
+    monkeypatch.setattr(answer_scorer, "score_answer", score_answer)
+
+
+def _poll(session_id, section_id):
+    from app.api.v1.endpoints.generate import get_section_score
+
+    return get_section_score(session_id, section_id)
+
+
+def test_pending_score_is_replaced_by_the_final_score(fake_redis, graph_runs, monkeypatch):
+    from app.services.background_scoring import schedule_scoring
+
+    _evaluator(monkeypatch, 0.9)
+
+    async def scenario():
+        task = await schedule_scoring(dict(STATE), {})
+        pending = await _poll("s1", "contexte")
+        await task
+        return pending, await _poll("s1", "contexte")
+
+    pending, done = asyncio.run(scenario())
+
+    assert (pending.status, pending.confidence) == ("pending", 0.9)
+    assert done.status == "done"
+    assert done.confidence == pytest.approx(0.9)
+    assert (done.revised, done.markdown) == (False, None)
+    assert graph_runs == []
+
+
+def test_verifier_retry_stores_the_revised_draft(fake_redis, graph_runs, monkeypatch):
+    from app.services.background_scoring import schedule_scoring
+
+    _evaluator(monkeypatch, 0.0)
+
+    async def scenario():
+        task = await schedule_scoring(dict(STATE), {})
+        await task
+        return await _poll("s1", "contexte")
+
+    done = asyncio.run(scenario())
+
+    assert done.status == "done"
+    assert (done.revised, done.markdown, done.retry_count) == (True, "# révisé", 1)
+    assert [run["retry_count"] for run in graph_runs] == [1]
+
+
+def test_unknown_section_score_is_404(fake_redis):
+    from fastapi import HTTPException
+
+    with pytest.raises(HTTPException) as missing:
+        asyncio.run(_poll("s1", "contexte"))
+
+    assert missing.value.status_code == 404
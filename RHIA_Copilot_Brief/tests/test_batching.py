@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+
+def _recording(fn=None):
+    """`fn` de batch qui journalise chaque batch reçu (résultat par défaut : longueur)."""
+    batches = []
+
+    def run(items):
+        batches.append(list(items))
+        return fn(items) if fn else [len(item) for item in items]
+
+    return run, batches
+
+
+def test_concurrent_submissions_share_one_batch():
+    from app.services.batching import MicroBatcher
+
+    fn, batches = _recording()
+    batcher = MicroBatcher(fn, max_batch=100, max_wait_ms=50, name="test")
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                batcher.submit(["a"]), batcher.submit(["bb", "ccc"]), batcher.submit(["dddd"])
+            )
+        finally:
+            await batcher.close()
+
+    results = asyncio.run(scenario())
+
+    assert results == [[1], [2, 3], [4]]
+    assert batches == [["a", "bb", "ccc", "dddd"]]
+
+
+def test_batches_are_capped_at_max_batch():
+    from app.services.batching import MicroBatcher
+
+    fn, batches = _recording()
+    batcher = MicroBatcher(fn, max_batch=2, max_wait_ms=50, name="test")
+
+    async def scenario():
+        try:
+            return await asyncio.gather(*(batcher.submit([str(i)]) for i in range(5)))
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(scenario()) == [[1]] * 5
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    from app.services.batching import MicroBatcher
+
+    fn, batches = _recording()
+    batcher = MicroBatcher(fn, max_batch=100, max_wait_ms=20, name="test")
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        try:
+            started = loop.time()
+            first = await batcher.submit(["a"])
+            elapsed = loop.time() - started
+            # Soumis après la fenêtre : batch suivant
+            second = await batcher.submit(["bb"])
+            return first, second, elapsed
+        finally:
+            await batcher.close()
+
+    first, second, elapsed = asyncio.run(scenario())
+
+    assert (first, second) == ([1], [2])
+    assert batches == [["a"], ["bb"]]
+    assert 0.015 <= elapsed < 1.0
+
+
+def test_batch_error_reaches_every_waiter_and_the_worker_survives():
+    from app.services.batching import MicroBatcher
+
+    calls = []
+
+    def fn(items):
+        calls.append(list(items))
+        if len(calls) == 1:
+            raise RuntimeError("modèle indisponible")
+        return [len(item) for item in items]
+
+    batcher = MicroBatcher(fn, max_batch=100, max_wait_ms=20, name="test")
+
+    async def scenario():
+        try:
+            failed = await asyncio.gather(
+                batcher.submit(["a"]), batcher.submit(["bb"]), return_exceptions=True
+            )
+            return failed, await batcher.submit(["ccc"])
+        finally:
+            await batcher.close()
+
+    failed, recovered = asyncio.run(scenario())
+
+    assert [str(error) for error in failed] == ["modèle indisponible"] * 2
+    assert recovered == [3]
+
+
+def test_result_count_mismatch_fails_the_batch():
+    from app.services.batching import MicroBatcher
+
+    batcher = MicroBatcher(lambda items: [0.0], max_batch=100, max_wait_ms=20, name="test")
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+            )
+        finally:
+            await batcher.close()
+
+    assert all(isinstance(error, ValueError) for error in asyncio.run(scenario()))
+
+
+def test_rerank_batcher_scores_pairs_from_concurrent_requests(fake_redis, monkeypatch):
+    pytest.importorskip("pydantic_settings")
+    from app.models.chunk import Chunk
+    from app.services import rerank_service
+
+    class Reranker:
+        def __init__(self):
+            self.calls = []
+
+        def predict(self, pairs, **_):
+            self.calls.append(len(pairs))
+            return [float(len(text)) for _, text in pairs]
+
+    reranker = Reranker()
+    monkeypatch.setattr(rerank_service, "_batcher", None)
+    monkeypatch.setattr(rerank_service, "get_reranker", lambda: reranker)
+
+    def chunks(*texts):
+        return [Chunk(id=f"{text}-id", text=text, score=0.5) for text in texts]
+
+    async def scenario():
+        try:
+            return await asyncio.gather(
+                rerank_service.arerank_chunks("requête batch A", chunks("a", "ccc")),
+                rerank_service.arerank_chunks("requête batch B", chunks("bb")),
+            )
+        finally:
+            await rerank_service.close_rerank_batcher()
+
+    first, second = asyncio.run(scenario())
+
+    assert [(c.text, c.rerank_score) for c in first] == [("ccc", 3.0), ("a", 1.0)]
+    assert [(c.text, c.rerank_score) for c in second] == [("bb", 2.0)]
+    assert reranker.calls == [3]
+    assert rerank_service._batcher is None
+
+
+def test_rerank_batcher_is_disabled_without_a_model(monkeypatch):
+    pytest.importorskip("pydantic_settings")
+    from app.services import rerank_service
+
+    monkeypatch.setattr(rerank_service, "_batcher", None)
+    monkeypatch.setattr(rerank_service, "get_reranker", lambda: None)
+
+    assert rerank_service.get_rerank_batcher() is None
+    assert asyncio.run(rerank_service.arerank_chunks("q", [])) == []
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+STATE = {
+    "prompt": "prompt",
+    "section_id": "contexte",
+    "user_preferences": {"seniority": "Senior"},
+    "brief_data": {"contexte": {"job_function": "Data"}},
+    "rag_confidence": 0.8,
+}
+
+
+def _candidate(output, temperature):
+    return {"output": output, "raw": output, "confidence": 0.95, "temperature": temperature}
+
+
+def test_best_candidate_is_chosen_and_remembered_with_its_temperature(monkeypatch):
+    from app.graph.nodes import best_of_n
+
+    remembered = []
+
+    async def generate_candidates(prompt, section_id, n, **_):
+        return [_candidate("# a", 0.5), _candidate("# b", 0.7), _candidate("# c", 0.9)]
+
+    async def score_answers(prompt, answers, rag_context):
+        return [0.2, 0.4, 0.9]
+
+    async def remember_output(prompt, section_id, seniority, raw, scope, temperature):
+        remembered.append((raw, temperature))
+
+    monkeypatch.setattr(best_of_n, "generate_candidates", generate_candidates)
+    monkeypatch.setattr(best_of_n, "score_answers", score_answers)
+    monkeypatch.setattr(best_of_n, "remember_output", remember_output)
+
+    result = asyncio.run(best_of_n.BestOfNExecutor()(dict(STATE)))
+
+    assert result["draft"] == "# c"
+    assert result["llm_confidence"] == 0.9
+    assert result["confidence"] == pytest.approx((0.8 + 0.95 + 0.9) / 3)
+    assert remembered == [("# c", 0.9)]
+
+
+@pytest.fixture
+def parallel_candidates(fake_redis, monkeypatch):
+    """Candidats en requêtes parallèles, draft `t=<température>`, cache LLM exact actif."""
+    import app.services.llm_client as llm_client
+    from app.services.llm_cache import LLMResponseCache
+
+    settings = llm_client.settings.copy(
+        update={
+            "best_of_n_mode": "parallel",
+            "temperature": 0.7,
+            "best_of_n_temperature_spread": 0.2,
+        }
+    )
+    cache = LLMResponseCache(
+        model=settings.openai_model,
+        temperature=settings.temperature,
+        ttl=60,
+        semantic=False,
+        max_distance=0.1,
+        max_entries=10,
+    )
+
+    async def complete(messages, structured, temperature=None, stream=True):
+        return f"t={temperature:.1f}"
+
+    monkeypatch.setattr(llm_client, "settings", settings)
+    monkeypatch.setattr(llm_client, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_client, "_complete", complete)
+    return cache
+
+
+def test_only_default_temperature_candidates_are_cached(parallel_candidates):
+    from app.services.llm_client import _system_message, generate_candidates, remember_output
+
+    cache = parallel_candidates
+
+    async def scenario():
+        candidates = await generate_candidates("prompt", "contexte", 3)
+        for candidate in candidates:
+            await remember_output(
+                f"prompt {candidate['raw']}",
+                "contexte",
+                "Senior",
+                candidate["raw"],
+                temperature=candidate["temperature"],
+            )
+        system_message = _system_message("contexte", structured=False)
+        cached = {
+            candidate["raw"]: await cache.lookup(
+                system_message, f"prompt {candidate['raw']}", "contexte", "Senior"
+            )
+            for candidate in candidates
+        }
+        return candidates, cached
+
+    candidates, cached = asyncio.run(scenario())
+
+    assert [c["raw"] for c in candidates] == ["t=0.5", "t=0.7", "t=0.9"]
+    assert cached == {"t=0.5": None, "t=0.7": "t=0.7", "t=0.9": None}
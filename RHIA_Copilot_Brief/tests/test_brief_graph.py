@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("langgraph")
+
+# Faux LLM et vector store mémoire : aucun appel OpenAI ni Qdrant
+OFFLINE_ENV = {
+    "llm_provider": "fake",
+    "fake_llm_latency_median": "0.001",
+    "fake_llm_latency_sigma": "0",
+    "fake_llm_seed": "0",
+    "vector_store": "memory",
+    "memory_store_job_functions": '["Data Scientist"]',
+    "memory_store_chunks_per_filter": "2",
+    "llm_cache_enabled": "false",
+    "llm_hedging": "false",
+    "graph_checkpointing": "false",
+}
+
+STATE = {
+    "session_id": "test",
+    "current_section": "responsabilites_cles",
+    "brief_data": {"responsabilites_cles": {"job_function": "Data Scientist"}},
+    "user_preferences": {"seniority": "Senior", "language": "fr", "sections": [True] * 18},
+    "retry_count": 0,
+}
+
+
+def _edges(graph) -> set[tuple[str, str]]:
+    return {(edge.source, edge.target) for edge in graph.get_graph().edges}
+
+
+def test_verify_routes_output_to_end():
+    from app.graph.brief_generator import build_brief_graph
+    from langgraph.graph import END
+
+    edges = _edges(build_brief_graph())
+
+    assert ("verify", END) in edges
+    assert ("verify", "build_prompt") in edges
+    assert ("verify", "output") not in edges
+
+
+def test_deferred_scoring_stops_after_provisional_score():
+    from app.graph.brief_generator import build_brief_graph
+    from langgraph.graph import END
+
+    edges = _edges(build_brief_graph(score_inline=False))
+
+    assert ("provisional_score", END) in edges
+    assert not any(source == "verify" for source, _ in edges)
+
+
+@pytest.fixture
+def offline_settings(monkeypatch):
+    import app.services.llm_client as llm_client
+    from app.core.settings import get_settings
+
+    for name, value in OFFLINE_ENV.items():
+        monkeypatch.setenv(name, value)
+    get_settings.cache_clear()
+    settings = get_settings()
+    # llm_client lit ses settings à l'import
+    monkeypatch.setattr(llm_client, "settings", settings)
+    yield settings
+    get_settings.cache_clear()
+
+
+def test_graph_run_returns_scored_draft(offline_settings):
+    pytest.importorskip("sentence_transformers")
+    from app.graph.brief_generator import build_brief_graph
+
+    result = asyncio.run(build_brief_graph().ainvoke(dict(STATE), config={"recursion_limit": 25}))
+
+    assert result["draft"].strip()
+    assert 0.0 <= result["confidence"] <= 1.0
+    assert result["confidence_label"]
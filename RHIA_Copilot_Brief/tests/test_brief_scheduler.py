@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+
+def test_enabled_sections_keeps_contract_order():
+    from app.core.constants import SECTION_IDS
+    from app.services.brief_scheduler import enabled_sections
+
+    toggles = [False] * len(SECTION_IDS)
+    toggles[1] = toggles[2] = True
+
+    assert enabled_sections({"sections": toggles}) == ["contexte", "finalite_mission"]
+
+
+@pytest.mark.parametrize("delta", [-1, 1])
+def test_enabled_sections_rejects_wrong_toggle_count(delta):
+    from app.core.constants import SECTION_IDS
+    from app.services.brief_scheduler import enabled_sections
+
+    with pytest.raises(ValueError):
+        enabled_sections({"sections": [True] * (len(SECTION_IDS) + delta)})
+
+
+def test_cancelled_run_marks_unfinished_sections_as_error(monkeypatch):
+    from app.core.constants import SECTION_IDS
+    from app.services import brief_scheduler
+
+    saved = []
+
+    async def set_session_data(session_id, key, value):
+        if key == brief_scheduler.PROGRESS_KEY:
+            saved.append({slug: dict(p) for slug, p in value.items()})
+
+    async def no_prefetch(self):
+        return None
+
+    async def never_ends(self, slug):
+        await self._update(slug, status="running")
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(brief_scheduler, "set_session_data", set_session_data)
+    monkeypatch.setattr(brief_scheduler.BriefRun, "_prefetch", no_prefetch)
+    monkeypatch.setattr(brief_scheduler.BriefRun, "_run_section", never_ends)
+
+    toggles = [False] * len(SECTION_IDS)
+    toggles[1] = toggles[2] = True
+    run = brief_scheduler.BriefRun("s1", {"sections": toggles}, {}, {})
+
+    async def scenario():
+        task = asyncio.create_task(run.execute())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert {p["status"] for p in saved[-1].values()} == {"error"}
+
+
+def _toggles(*slugs):
+    from app.core.constants import SECTION_IDS, SECTION_LABELS_TO_SLUGS
+
+    return [SECTION_LABELS_TO_SLUGS[label] in slugs for label in SECTION_IDS]
+
+
+@pytest.fixture
+def fake_sections(monkeypatch):
+    """Graphe de section remplacé : journal des exécutions, draft `# {slug}`."""
+    import app.graph.brief_generator as brief_generator
+    import app.graph.checkpointing as checkpointing
+    from app.services import brief_scheduler
+
+    events = []
+
+    async def run_graph(graph, state, config):
+        slug = state["current_section"]
+        events.append(("start", slug, state["previous_sections"]))
+        await asyncio.sleep(0.01)
+        events.append(("end", slug))
+        return {"draft": f"# {slug}", "confidence": 0.8, "confidence_label": "haute"}
+
+    async def no_prefetch(self):
+        return None
+
+    monkeypatch.setattr(checkpointing, "run_graph", run_graph)
+    monkeypatch.setattr(brief_generator, "get_brief_graph", lambda: None)
+    monkeypatch.setattr(brief_scheduler.BriefRun, "_prefetch", no_prefetch)
+    return events
+
+
+def test_sections_run_after_their_dependencies(fake_redis, fake_sections):
+    from app.services import brief_scheduler
+
+    sections = ("contexte", "finalite_mission", "objectifs_kpis", "responsabilites_cles")
+    run = brief_scheduler.BriefRun("s1", {"sections": _toggles(*sections)}, {}, {})
+
+    asyncio.run(run.execute())
+
+    order = [(event[0], event[1]) for event in fake_sections]
+    for slug, dependencies in run.dependencies.items():
+        for dep in dependencies:
+            assert order.index(("end", dep)) < order.index(("start", slug))
+    # Sections sœurs (même dépendance) générées en parallèle
+    assert order.index(("start", "responsabilites_cles")) < order.index(("end", "objectifs_kpis"))
+    previous = {event[1]: event[2] for event in fake_sections if event[0] == "start"}
+    assert previous["finalite_mission"] == {"Contexte & Business Case": "# contexte"}
+
+
+def test_approved_sections_are_skipped_and_feed_dependents(fake_redis, fake_sections):
+    from app.services import brief_scheduler
+
+    approvals = {"Contexte & Business Case": {"markdown": "# contexte validé"}}
+    run = brief_scheduler.BriefRun(
+        "s1", {"sections": _toggles("contexte", "finalite_mission")}, {}, approvals
+    )
+
+    asyncio.run(run.execute())
+
+    assert [event[1] for event in fake_sections if event[0] == "start"] == ["finalite_mission"]
+    assert fake_sections[0][2] == {"Contexte & Business Case": "# contexte validé"}
+    assert run.progress["contexte"]["status"] == "approved"
+
+
+def test_progress_and_drafts_are_written_to_the_session(fake_redis, fake_sections):
+    from app.services import brief_scheduler
+
+    run = brief_scheduler.BriefRun(
+        "s1", {"sections": _toggles("contexte", "finalite_mission")}, {}, {}
+    )
+
+    asyncio.run(run.execute())
+
+    progress = json.loads(fake_redis.get(f"brief:s1:{brief_scheduler.PROGRESS_KEY}"))
+    drafts = json.loads(fake_redis.get(f"brief:s1:{brief_scheduler.DRAFTS_KEY}"))
+    assert {p["status"] for p in progress.values()} == {"done"}
+    assert progress["finalite_mission"]["depends_on"] == ["contexte"]
+    assert progress["finalite_mission"]["confidence"] == 0.8
+    assert drafts == {"contexte": "# contexte", "finalite_mission": "# finalite_mission"}
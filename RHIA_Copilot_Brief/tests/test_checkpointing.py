@@ -0,0 +1,177 @@
+import asyncio
+from typing import TypedDict
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+STATE = {"session_id": "s1", "current_section": "contexte", "brief_data": {"a": 1}}
+
+
+def _thread_id(state):
+    from app.graph.checkpointing import thread_config
+
+    return thread_config(None, "brief", "s1", "contexte", state)["configurable"]["thread_id"]
+
+
+def test_thread_id_depends_on_request_data():
+    assert _thread_id(STATE) != _thread_id({**STATE, "brief_data": {"a": 2}})
+
+
+def test_thread_id_ignores_runtime_keys():
+    assert _thread_id({**STATE, "retry_count": 0}) == _thread_id({**STATE, "retry_count": 2})
+
+
+def test_thread_config_keeps_run_options():
+    from app.graph.checkpointing import thread_config
+
+    config = thread_config({"recursion_limit": 10}, "brief", "s1", "contexte", STATE)
+
+    assert config["recursion_limit"] == 10
+    assert config["configurable"]["thread_id"].startswith("brief:s1:contexte:")
+
+
+class State(TypedDict, total=False):
+    value: int
+    draft: str
+    chunks: list
+
+
+def _flaky_graph(failures: list[int], checkpointer):
+    pytest.importorskip("langgraph")
+    from app.models.chunk import Chunk
+    from langgraph.graph import END, StateGraph
+
+    calls = []
+
+    def first(state):
+        calls.append("first")
+        chunk = Chunk(id="c1", text="Python", score=0.9, metadata={"source": "rules"})
+        return {"value": state["value"] + 1, "draft": "brouillon", "chunks": [chunk]}
+
+    def second(state):
+        calls.append("second")
+        if failures:
+            failures.pop()
+            raise RuntimeError("LLM timeout")
+        return {"value": state["value"] * 10}
+
+    graph = StateGraph(State)
+    graph.add_node("first", first)
+    graph.add_node("second", second)
+    graph.set_entry_point("first")
+    graph.add_edge("first", "second")
+    graph.add_edge("second", END)
+    return graph.compile(checkpointer=checkpointer), calls
+
+
+def _redis_saver():
+    pytest.importorskip("langgraph")
+    from app.graph.redis_checkpointer import RedisCheckpointSaver
+
+    return RedisCheckpointSaver(ttl=60)
+
+
+def test_failed_run_resumes_from_redis_checkpoints(fake_redis):
+    from app.graph.checkpointing import interrupted_key, run_graph, thread_config
+
+    graph, calls = _flaky_graph([1], _redis_saver())
+    state = {"value": 1}
+    config = thread_config(None, "test", "s1", "contexte", state)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await run_graph(graph, state, config)
+        interrupted = fake_redis.get(interrupted_key(config["configurable"]["thread_id"]))
+        history = graph.checkpointer.alist({"configurable": {"thread_id": interrupted}})
+        assert len([item async for item in history]) >= 2
+        return await run_graph(graph, state, config)
+
+    result = asyncio.run(scenario())
+
+    # Reprise après `first` : non rejoué, ses écritures (Chunk compris) sont restaurées
+    assert calls == ["first", "second", "second"]
+    assert result["value"] == 20
+    assert result["draft"] == "brouillon"
+    assert result["chunks"][0].metadata == {"source": "rules"}
+    assert fake_redis.keys("checkpoint*") == []
+
+
+def test_failed_run_resumes_only_for_the_same_request(fake_redis):
+    from app.graph.checkpointing import run_graph, start_run, thread_config
+
+    graph, _ = _flaky_graph([1], _redis_saver())
+    state = {"value": 1}
+    config = thread_config(None, "test", "s1", "contexte", state)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await run_graph(graph, state, config)
+
+        other = {"value": 5}
+        other_config = thread_config(None, "test", "s1", "contexte", other)
+        # Autre requête : aucun run à reprendre, le run interrompu reste intact
+        assert (await start_run(graph, other, other_config))[0] == other
+        return await run_graph(graph, state, config)
+
+    assert asyncio.run(scenario())["value"] == 20
+
+
+def test_identical_concurrent_runs_use_separate_threads(fake_redis):
+    from app.graph.checkpointing import release_thread, start_run, thread_config
+
+    graph, _ = _flaky_graph([], _redis_saver())
+    state = {"value": 1}
+    config = thread_config(None, "test", "s1", "contexte", state)
+
+    async def scenario():
+        _, first_config = await start_run(graph, state, config)
+        _, second_config = await start_run(graph, state, config)
+        await graph.ainvoke(state, config=first_config)
+        await graph.ainvoke(state, config=second_config)
+        await release_thread(graph, first_config)
+        # Le run terminé en premier ne supprime pas les checkpoints de l'autre
+        return first_config, (await graph.aget_state(second_config)).values
+
+    first_config, second_values = asyncio.run(scenario())
+
+    assert first_config["configurable"]["thread_id"] != config["configurable"]["thread_id"]
+    assert second_values["value"] == 20
+
+
+def test_interrupted_run_is_resumed_by_a_single_request(fake_redis):
+    from app.graph.checkpointing import run_graph, start_run, thread_config
+
+    graph, _ = _flaky_graph([1], _redis_saver())
+    state = {"value": 1}
+    config = thread_config(None, "test", "s1", "contexte", state)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await run_graph(graph, state, config)
+        return await start_run(graph, state, config), await start_run(graph, state, config)
+
+    (first_input, _), (second_input, _) = asyncio.run(scenario())
+
+    assert first_input is None
+    assert second_input == state
+
+
+def test_stream_final_event_includes_keys_written_before_the_interruption(fake_redis):
+    from app.graph.checkpointing import run_graph, thread_config
+    from app.services.streaming import sse_event, stream_graph
+
+    graph, _ = _flaky_graph([1], _redis_saver())
+    state = {"value": 1}
+    config = thread_config(None, "test", "s1", "contexte", state)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await run_graph(graph, state, config)
+        stream = stream_graph(graph, state, lambda values: {"draft": values["draft"]}, config)
+        return [event async for event in stream]
+
+    events = asyncio.run(scenario())
+
+    assert events[0].startswith("event: node") and '"second"' in events[0]
+    assert events[-1] == sse_event("final", {"draft": "brouillon"})
@@ -0,0 +1,94 @@
+"""
+Budget de démarrage de l'API, mesuré dans des process neufs :
+
+1. import de `app.main` : durée + absence des bibliothèques lourdes (torch, langchain...) ;
+2. cold start : lancement d'uvicorn jusqu'à ce que /ready réponde 200 (warmup inclus),
+   seulement si Redis et Qdrant sont joignables.
+
+Budgets surchargeables : IMPORT_BUDGET_SECONDS, COLD_START_BUDGET_SECONDS.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+IMPORT_BUDGET = float(os.environ.get("IMPORT_BUDGET_SECONDS", 2.0))
+COLD_START_BUDGET = float(os.environ.get("COLD_START_BUDGET_SECONDS", 90.0))
+COLD_START_PORT = int(os.environ.get("COLD_START_PORT", 8765))
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "langchain", "langchain_openai", "langgraph"]
+
+IMPORT_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _reachable(host: str | None, port: int | str | None) -> bool:
+    if not host or not port:
+        return False
+    try:
+        with socket.create_connection((host, int(port)), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.fixture(scope="module")
+def import_result() -> dict:
+    pytest.importorskip("fastapi")
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_PROBE], text=True, cwd=SRC_DIR)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_import_has_no_heavy_modules(import_result):
+    assert import_result["heavy"] == []
+
+
+def test_import_within_budget(import_result):
+    assert import_result["seconds"] <= IMPORT_BUDGET
+
+
+def test_cold_start_within_budget():
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("uvicorn")
+    from app.core.settings import get_settings
+
+    settings = get_settings()
+    if not (
+        _reachable(os.getenv("REDIS_HOST"), os.getenv("REDIS_PORT"))
+        and _reachable(settings.qdrant_host, settings.qdrant_port)
+    ):
+        pytest.skip("Redis ou Qdrant injoignable : cold start non mesuré")
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(COLD_START_PORT)],
+        cwd=SRC_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    start = time.perf_counter()
+    try:
+        while time.perf_counter() - start < COLD_START_BUDGET:
+            try:
+                response = httpx.get(f"http://127.0.0.1:{COLD_START_PORT}/ready", timeout=1)
+                if response.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.25)
+        pytest.fail(f"/ready toujours indisponible après {COLD_START_BUDGET}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
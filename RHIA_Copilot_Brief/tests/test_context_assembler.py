@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydantic_settings")
+
+
+def _chunks(rerank_scores):
+    from app.models.chunk import Chunk
+
+    vectors = np.eye(len(rerank_scores), dtype=np.float32)
+    return [
+        Chunk(id=str(i), text=f"chunk {i}", score=0.9 - i * 0.1, rerank_score=rerank, vector=v)
+        for i, (rerank, v) in enumerate(zip(rerank_scores, vectors, strict=True))
+    ]
+
+
+def test_reranked_chunks_are_selected_by_cross_encoder_score(monkeypatch):
+    from app.services import context_assembler
+
+    monkeypatch.setattr(context_assembler, "count_tokens", lambda text: 10)
+    monkeypatch.setattr(context_assembler.get_settings(), "rag_context_token_budget", 20)
+
+    # Similarité vectorielle décroissante, cross-encoder inverse : le rerank décide
+    selected = context_assembler.assemble_context(_chunks([-4.0, 0.5, 6.0]), "contexte")
+
+    assert [c.id for c in selected] == ["2", "1"]
+    assert all(c.vector is None for c in selected)
+
+
+def test_unreachable_tiktoken_encoding_falls_back_to_an_estimate(monkeypatch):
+    tiktoken = pytest.importorskip("tiktoken")
+    from app.services import context_assembler
+
+    def offline(*args, **kwargs):
+        raise ConnectionError("téléchargement impossible")
+
+    monkeypatch.setattr(tiktoken, "encoding_for_model", offline)
+    monkeypatch.setattr(tiktoken, "get_encoding", offline)
+    context_assembler._encoding.cache_clear()
+    try:
+        assert context_assembler.count_tokens("x" * 40, model="gpt-4o") == 11
+    finally:
+        context_assembler._encoding.cache_clear()
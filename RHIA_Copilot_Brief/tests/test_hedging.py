@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("prometheus_client")
+
+MESSAGES = [{"role": "user", "content": "Rédige la section contexte"}]
+
+
+def _hedger(**overrides):
+    from app.services.hedging import Hedger
+
+    options = {"quantile": 0.9, "min_samples": 5, "max_ratio": 1.0, "window": 50}
+    return Hedger(**{**options, **overrides})
+
+
+def _fake_llm(latency=0.01):
+    from app.services.fake_llm import FakeLLM
+
+    return FakeLLM(latency_median=latency, latency_sigma=0, error_rate=0, rate_limit_rate=0)
+
+
+def _count(metric, *labels):
+    return metric.labels(*labels)._value.get()
+
+
+def test_threshold_waits_for_enough_samples():
+    hedger = _hedger(min_samples=3)
+
+    for latency in (0.1, 0.3):
+        hedger._record("m", latency, hedged=False)
+    assert hedger.threshold("m") is None
+
+    hedger._record("m", 0.2, hedged=False)
+    assert hedger.threshold("m") == 0.3
+    assert hedger.threshold("other") is None
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    from app.telemetry.metrics import LLM_HEDGE_WINS, LLM_HEDGES
+
+    hedger = _hedger()
+    for _ in range(5):
+        hedger._record("hedge-model", 0.02, hedged=False)
+    llm = _fake_llm()
+    started = []
+    cancelled = []
+
+    async def call():
+        started.append(1)
+        try:
+            if len(started) == 1:
+                await asyncio.sleep(5)  # principale bloquée
+            return await llm.complete(MESSAGES, max_tokens=100)
+        except asyncio.CancelledError:
+            cancelled.append(len(started))
+            raise
+
+    hedges = _count(LLM_HEDGES, "hedge-model")
+    wins = _count(LLM_HEDGE_WINS, "hedge-model", "hedge")
+
+    result = asyncio.run(asyncio.wait_for(hedger.run("hedge-model", call), timeout=2))
+
+    assert result.startswith("- ")
+    assert len(started) == 2
+    assert cancelled == [2]
+    assert _count(LLM_HEDGES, "hedge-model") == hedges + 1
+    assert _count(LLM_HEDGE_WINS, "hedge-model", "hedge") == wins + 1
+
+
+def test_fast_primary_is_not_hedged():
+    hedger = _hedger()
+    for _ in range(5):
+        hedger._record("m", 1.0, hedged=False)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return await _fake_llm().complete(MESSAGES, max_tokens=100)
+
+    asyncio.run(hedger.run("m", call))
+
+    assert len(calls) == 1
+
+
+def test_hedge_ratio_is_capped():
+    hedger = _hedger(max_ratio=0.0)
+    for _ in range(5):
+        hedger._record("m", 0.01, hedged=False)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    assert asyncio.run(hedger.run("m", call)) == "ok"
+    assert len(calls) == 1
+
+
+def test_failed_hedge_does_not_beat_a_successful_primary():
+    hedger = _hedger()
+    for _ in range(5):
+        hedger._record("m", 0.01, hedged=False)
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("hedge en échec")
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert asyncio.run(hedger.run("m", call)) == "primary"
+
+
+def test_latency_samples_exclude_governor_queueing(fake_redis, monkeypatch):
+    from app.services import llm_client
+    from app.services.llm_governor import LLMGovernor
+
+    governor = LLMGovernor(
+        rpm_limit=600,
+        tpm_limit=100_000,
+        initial_concurrency=1,
+        max_concurrency=1,
+        latency_target=5.0,
+        max_retries=0,
+    )
+    hedger = _hedger()
+    llm = _fake_llm()
+
+    async def complete(messages, structured):
+        return await llm.complete(messages, max_tokens=100)
+
+    monkeypatch.setattr(llm_client, "get_llm_governor", lambda: governor)
+    monkeypatch.setattr(llm_client, "_complete", complete)
+
+    async def busy():
+        await asyncio.sleep(0.3)
+
+    async def scenario():
+        occupied = asyncio.create_task(governor.run(busy, llm_client.settings.openai_model, 10))
+        await asyncio.sleep(0.05)
+        # Attend ~0,25 s une place, l'appel lui-même dure ~0,01 s
+        await llm_client._governed_complete(MESSAGES, 10, False, hedger)
+        await occupied
+
+    asyncio.run(scenario())
+
+    (latency,) = hedger._latencies[llm_client.settings.openai_model]
+    assert latency < 0.15
@@ -0,0 +1,107 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+
+class FakeEmbedder:
+    def encode(self, texts, **_):
+        if isinstance(texts, str):
+            return np.array([len(texts), 1.0], dtype=np.float32)
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+class FakeReranker:
+    def predict(self, pairs, **_):
+        if any(not query for query, _ in pairs):
+            raise ValueError("requête vide")
+        return np.array([len(doc) for _, doc in pairs], dtype=np.float32)
+
+
+def _serve(monkeypatch, socket_path, scenario):
+    """Lance le serveur sur `socket_path`, exécute `scenario` (bloquant) dans un thread."""
+    from app.services import inference_server
+
+    monkeypatch.setattr(inference_server, "load_embedder", FakeEmbedder)
+    monkeypatch.setattr(inference_server, "load_reranker", FakeReranker)
+
+    async def main():
+        server = inference_server.InferenceServer(str(socket_path), max_batch=8, max_wait_ms=5)
+        task = asyncio.create_task(server.serve_forever())
+        while not os.path.exists(socket_path):
+            await asyncio.sleep(0.01)
+        try:
+            return await asyncio.to_thread(scenario)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    return asyncio.run(main())
+
+
+def test_embed_and_rerank_round_trip_over_the_socket(monkeypatch, tmp_path):
+    from app.services.inference_client import InferenceClient, RemoteEmbedder, RemoteReranker
+
+    socket_path = tmp_path / "i.sock"
+
+    def scenario():
+        client = InferenceClient(str(socket_path), timeout=5)
+        # Même connexion réutilisée pour les trois requêtes
+        return (
+            RemoteEmbedder(client).encode(["a", "abc"]),
+            RemoteEmbedder(client).encode("abcd"),
+            RemoteReranker(client).predict([["q", "doc"], ["q", "document"]]),
+        )
+
+    vectors, vector, scores = _serve(monkeypatch, socket_path, scenario)
+
+    np.testing.assert_array_equal(vectors, [[1.0, 1.0], [3.0, 1.0]])
+    np.testing.assert_array_equal(vector, [4.0, 1.0])
+    np.testing.assert_array_equal(scores, [3.0, 8.0])
+    assert vectors.dtype == np.float32
+
+
+def test_server_errors_are_replied_without_closing_the_connection(monkeypatch, tmp_path):
+    from app.services.inference_client import InferenceClient
+
+    socket_path = tmp_path / "i.sock"
+
+    def scenario():
+        client = InferenceClient(str(socket_path), timeout=5)
+        errors = []
+        for header in ({"op": "unknown"}, {"op": "rerank", "pairs": [["", "doc"]]}):
+            with pytest.raises(RuntimeError) as error:
+                client.request(header)
+            errors.append(str(error.value))
+        return errors, client.request({"op": "embed", "texts": ["ab"]})
+
+    errors, vectors = _serve(monkeypatch, socket_path, scenario)
+
+    assert errors[0].startswith("[Inference error]")
+    assert "requête vide" in errors[1]
+    np.testing.assert_array_equal(vectors, [[2.0, 1.0]])
+
+
+def test_remote_models_fall_back_to_local_models_without_a_socket(tmp_path):
+    from app.services.inference_client import InferenceClient, RemoteEmbedder, RemoteReranker
+
+    client = InferenceClient(str(tmp_path / "absent.sock"), timeout=1)
+    loads = []
+
+    def load_embedder():
+        loads.append("embedder")
+        return FakeEmbedder()
+
+    embedder = RemoteEmbedder(client, load_embedder)
+
+    np.testing.assert_array_equal(embedder.encode(["abc"]), [[3.0, 1.0]])
+    np.testing.assert_array_equal(embedder.encode("ab"), [2.0, 1.0])
+    assert loads == ["embedder"]
+    np.testing.assert_array_equal(
+        RemoteReranker(client, FakeReranker).predict([["q", "doc"]]), [3.0]
+    )
+    with pytest.raises(FileNotFoundError):
+        RemoteEmbedder(client).encode(["abc"])
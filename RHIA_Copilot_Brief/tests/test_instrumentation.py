@@ -0,0 +1,44 @@
+import asyncio
+import inspect
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+
+class AsyncNode:
+    async def __call__(self, state):
+        return {"retry_count": state.get("retry_count", 0) + 1}
+
+
+class SyncNode:
+    def __call__(self, state):
+        return {"draft": "ok"}
+
+
+def test_async_callable_node_stays_async():
+    from app.graph.instrumentation import instrument_node
+
+    wrapped = instrument_node("test", "async_node", AsyncNode())
+
+    assert inspect.iscoroutinefunction(wrapped)
+    assert asyncio.run(wrapped({"retry_count": 0})) == {"retry_count": 1}
+
+
+def test_sync_node_stays_sync():
+    from app.graph.instrumentation import instrument_node
+
+    wrapped = instrument_node("test", "sync_node", SyncNode())
+
+    assert not inspect.iscoroutinefunction(wrapped)
+    assert wrapped({}) == {"draft": "ok"}
+
+
+def test_retry_is_counted():
+    from app.graph.instrumentation import instrument_node
+    from app.telemetry.metrics import GRAPH_RETRIES
+
+    before = GRAPH_RETRIES.labels("test")._value.get()
+    asyncio.run(instrument_node("test", "verify", AsyncNode())({"retry_count": 0}))
+
+    assert GRAPH_RETRIES.labels("test")._value.get() == before + 1
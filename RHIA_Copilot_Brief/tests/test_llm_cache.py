@@ -0,0 +1,65 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+
+@pytest.fixture
+def cache(fake_redis, monkeypatch):
+    from app.services import llm_cache
+
+    # Embedding factice : un axe par mot-clé présent dans le prompt
+    def embedding(prompt):
+        vector = np.array([word in prompt for word in ("data", "finance", "rh")], dtype=np.float32)
+        return vector / max(np.linalg.norm(vector), 1e-12)
+
+    monkeypatch.setattr(llm_cache, "_prompt_embedding", embedding)
+    return llm_cache.LLMResponseCache(
+        model="gpt-test",
+        temperature=0.3,
+        ttl=60,
+        semantic=True,
+        max_distance=0.1,
+        max_entries=10,
+    )
+
+
+def test_semantic_hit_reads_the_completion_only_for_the_best_entry(cache):
+    from app.redis_client import get_redis_bytes
+    from app.services.llm_cache import DIGEST_SIZE
+
+    index_key = cache.semantic_key("sys", "contexte", "Senior", "s")
+
+    async def scenario():
+        await cache.store("sys", "brief data v1", "contexte", "Senior", "# data", scope="s")
+        await cache.store("sys", "brief finance", "contexte", "Senior", "# finance", scope="s")
+        return (
+            await cache.lookup("sys", "brief data v2", "contexte", "Senior", scope="s"),
+            await cache.lookup("sys", "brief rh", "contexte", "Senior", scope="s"),
+            await get_redis_bytes().lrange(index_key, 0, -1),
+        )
+
+    hit, miss, index = asyncio.run(scenario())
+
+    assert (hit, miss) == ("# data", None)
+    # L'index ne porte que clé exacte + vecteur, pas les completions
+    assert {len(entry) for entry in index} == {DIGEST_SIZE + 3 * 4}
+
+
+def test_semantic_level_needs_a_scope(cache):
+    async def scenario():
+        await cache.store("sys", "brief data v1", "contexte", "Senior", "# data")
+        return await cache.lookup("sys", "brief data v2", "contexte", "Senior")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_expired_completion_is_a_semantic_miss(cache, fake_redis):
+    async def scenario():
+        await cache.store("sys", "brief data v1", "contexte", "Senior", "# data", scope="s")
+        fake_redis.delete(cache.exact_key("sys", "brief data v1"))
+        return await cache.lookup("sys", "brief data v2", "contexte", "Senior", scope="s")
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,145 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("lupa")
+
+
+def _governor(**overrides):
+    from app.services.llm_governor import LLMGovernor
+
+    options = {
+        "rpm_limit": 600,
+        "tpm_limit": 100_000,
+        "initial_concurrency": 4,
+        "max_concurrency": 8,
+        "latency_target": 5.0,
+        "max_retries": 0,
+    }
+    return LLMGovernor(**{**options, **overrides})
+
+
+def _bucket(fake_redis, *args):
+    from app.services.llm_governor import TOKEN_BUCKET_LUA
+
+    keys = ["llm:{m}:rpm", "llm:{m}:tpm"]
+    return float(fake_redis.eval(TOKEN_BUCKET_LUA, 2, *keys, *args))
+
+
+def test_token_bucket_denies_then_refills(fake_redis):
+    # 2 requêtes/min : deux passages, le troisième attend ~30 s (une requête toutes les 30 s)
+    assert _bucket(fake_redis, 2, 1000, 10) == 0
+    assert _bucket(fake_redis, 2, 1000, 10) == 0
+    assert _bucket(fake_redis, 2, 1000, 10) == pytest.approx(30, abs=0.5)
+
+    # 15 s plus tard : la moitié d'une requête regagnée, attente réduite d'autant
+    fake_redis.hset("llm:{m}:rpm", "ts", float(fake_redis.hget("llm:{m}:rpm", "ts")) - 15)
+    assert _bucket(fake_redis, 2, 1000, 10) == pytest.approx(15, abs=0.5)
+
+    fake_redis.hset("llm:{m}:rpm", "ts", float(fake_redis.hget("llm:{m}:rpm", "ts")) - 60)
+    assert _bucket(fake_redis, 2, 1000, 10) == 0
+
+
+def test_token_bucket_charges_tokens_per_minute(fake_redis):
+    assert _bucket(fake_redis, 100, 600, 500) == 0
+    # 100 tokens restants pour une demande de 400 : 300 tokens à 10 tokens/s
+    assert _bucket(fake_redis, 100, 600, 400) == pytest.approx(30, abs=0.5)
+
+
+def test_rate_limit_halves_concurrency(fake_redis):
+    from app.services.fake_llm import FakeRateLimitError
+
+    governor = _governor(initial_concurrency=4)
+
+    async def rate_limited():
+        raise FakeRateLimitError("429")
+
+    with pytest.raises(FakeRateLimitError):
+        asyncio.run(governor.run(rate_limited, "m", 10))
+
+    assert governor.limit == 2
+
+
+def test_rate_limit_is_replayed(fake_redis):
+    from app.services.fake_llm import FakeRateLimitError
+
+    governor = _governor(initial_concurrency=4, max_retries=1)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FakeRateLimitError("429")
+        return "ok"
+
+    assert asyncio.run(governor.run(flaky, "m", 10)) == "ok"
+    assert len(attempts) == 2
+
+
+def test_fast_success_increases_and_slow_success_decreases_concurrency(fake_redis):
+    governor = _governor(initial_concurrency=2, latency_target=0.05)
+
+    async def fast():
+        return "ok"
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        return "ok"
+
+    asyncio.run(governor.run(fast, "m", 10))
+    assert governor._limit == pytest.approx(2.5)
+
+    asyncio.run(governor.run(slow, "m", 10))
+    assert governor._limit == pytest.approx(2.25)
+
+
+def test_waiting_calls_are_served_by_priority(fake_redis):
+    from app.services.llm_governor import PRIORITY_GENERATION, PRIORITY_SCORING
+
+    governor = _governor(initial_concurrency=1)
+    order = []
+
+    async def call(name, release=None):
+        if release is not None:
+            await release.wait()
+        order.append(name)
+
+    async def scenario():
+        release = asyncio.Event()
+        busy = asyncio.create_task(governor.run(lambda: call("busy", release), "m", 10))
+        await asyncio.sleep(0.05)
+        scoring = asyncio.create_task(
+            governor.run(lambda: call("scoring"), "m", 10, priority=PRIORITY_SCORING)
+        )
+        await asyncio.sleep(0.05)
+        generation = asyncio.create_task(
+            governor.run(lambda: call("generation"), "m", 10, priority=PRIORITY_GENERATION)
+        )
+        await asyncio.sleep(0.05)
+        release.set()
+        await asyncio.gather(busy, scoring, generation)
+
+    asyncio.run(scenario())
+
+    assert order == ["busy", "generation", "scoring"]
+
+
+def test_budget_wait_does_not_hold_a_concurrency_slot(fake_redis):
+    governor = _governor(initial_concurrency=1, rpm_limit=1)
+
+    async def call():
+        return time.monotonic()
+
+    async def scenario():
+        await governor.run(call, "a", 10)
+        # Budget de "a" épuisé (1 requête/min) : cet appel attend le budget...
+        starved = asyncio.create_task(governor.run(call, "a", 10))
+        await asyncio.sleep(0.05)
+        # ...sans occuper l'unique place : un appel sur un autre modèle passe immédiatement
+        done = await asyncio.wait_for(governor.run(call, "b", 10), timeout=1)
+        starved.cancel()
+        return done
+
+    assert asyncio.run(scenario()) > 0
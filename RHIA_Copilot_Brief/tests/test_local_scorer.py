@@ -0,0 +1,74 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("## Titre\n\nTexte **gras** et `code`.", 1.0),
+        ("```python\nprint()\n", 0.75),  # bloc de code non fermé
+        ("Texte **gras non fermé", 0.75),
+        ("##Titre collé", 0.75),
+        ("   ", 0.75),
+        ("##Titre **ouvert\n```", 0.25),
+    ],
+)
+def test_markdown_score(text, expected):
+    from app.services.local_scorer import markdown_score
+
+    assert markdown_score(text) == expected
+
+
+@pytest.mark.parametrize(
+    "words, expected",
+    [(0, 0.0), (5, 0.5), (10, 1.0), (20, 1.0), (30, 0.5), (40, 0.0), (100, 0.0)],
+)
+def test_length_score(words, expected):
+    from app.services.local_scorer import length_score
+
+    assert length_score(" ".join(["mot"] * words), min_words=10, max_words=20) == expected
+
+
+def test_missing_information_penalty_is_capped():
+    from app.services.local_scorer import (
+        MISSING_MARKER,
+        MISSING_PENALTY,
+        MISSING_PENALTY_MAX,
+        _structure_score,
+    )
+
+    # Longueur dans la plage attendue, marqueurs compris : seule la pénalité varie
+    text = "mot " * 100
+    base = _structure_score(text)
+    one = _structure_score(f"{text} {MISSING_MARKER}")
+    many = _structure_score(f"{text} {MISSING_MARKER * 2}")
+    capped = _structure_score(f"{text} {MISSING_MARKER * 10}")
+
+    assert base - one == pytest.approx(MISSING_PENALTY)
+    assert base - many == pytest.approx(2 * MISSING_PENALTY)
+    assert base - capped == pytest.approx(MISSING_PENALTY_MAX)
+
+
+@pytest.mark.parametrize("semantic", [-1.0, 0.0, 0.5, 1.0, 2.0])
+def test_score_locally_stays_within_bounds(monkeypatch, semantic):
+    from app.services import local_scorer
+
+    async def semantic_scores(prompt, answers, rag_context):
+        return np.full(len(answers), semantic, dtype=np.float32)
+
+    monkeypatch.setattr(local_scorer, "_semantic_scores", semantic_scores)
+    answers = [
+        "## Contexte\n\n" + "mot " * 100,
+        f"Court {local_scorer.MISSING_MARKER * 5}",
+        "##Cassé **ouvert\n```",
+    ]
+
+    scores = asyncio.run(local_scorer.score_locally_many("prompt", [*answers, "  "]))
+
+    assert all(0.0 <= score <= 1.0 for score in scores)
+    assert scores[-1] == 0.0  # draft vide : pas d'appel modèle, note nulle
+    assert asyncio.run(local_scorer.score_locally("prompt", answers[0])) == scores[0]
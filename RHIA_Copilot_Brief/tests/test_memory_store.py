@@ -0,0 +1,128 @@
+import asyncio
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("qdrant_client")
+pytest.importorskip("pydantic_settings")
+
+PAYLOAD = {
+    "text": "Exemple",
+    "type": "brief",
+    "section": "contexte",
+    "job_function": "Data Scientist",
+    "seniority_level": "Senior",
+    "language": "fr",
+}
+REQUEST = ("contexte", "Data Scientist", "Senior", "fr")
+
+
+def _filter(*request):
+    from app.services.rag_retriever import RetrievalRequest, build_filter
+
+    return build_filter(RetrievalRequest(*request))
+
+
+def test_matches_accepts_the_payload_selected_by_build_filter():
+    from app.services.memory_store import matches
+
+    assert matches(PAYLOAD, _filter(*REQUEST))
+    assert matches(PAYLOAD, None)
+
+
+@pytest.mark.parametrize(
+    "key, other",
+    [
+        ("type", "rules"),
+        ("section", "finalite_mission"),
+        ("job_function", "Data"),
+        ("seniority_level", "Junior"),
+        ("language", "en"),
+        ("language", None),
+    ],
+)
+def test_matches_rejects_any_unmet_build_filter_condition(key, other):
+    from app.services.memory_store import matches
+
+    assert not matches({**PAYLOAD, key: other}, _filter(*REQUEST))
+
+
+def test_synthetic_corpus_is_found_by_the_retriever_filters():
+    from app.core.constants import SECTION_LABELS_TO_SLUGS, SENIORITY_LEVELS
+    from app.services.memory_store import _synthetic_documents, matches
+
+    payloads = _synthetic_documents(["Data Scientist"], chunks_per_filter=2)
+
+    for section in SECTION_LABELS_TO_SLUGS.values():
+        for seniority in SENIORITY_LEVELS:
+            query_filter = _filter(section, "Data Scientist", seniority, "fr")
+            assert sum(matches(p, query_filter) for p in payloads) == 2
+
+
+def test_search_batch_filters_ranks_and_projects_vectors():
+    from app.services.memory_store import InMemoryVectorStore
+    from qdrant_client.models import SearchRequest
+
+    store = InMemoryVectorStore()
+    payloads = [
+        {**PAYLOAD, "text": "proche"},
+        {**PAYLOAD, "text": "lointain"},
+        {**PAYLOAD, "text": "autre langue", "language": "en"},
+    ]
+    vectors = np.asarray([[1.0, 0.1], [0.0, 1.0], [1.0, 0.0]], dtype=np.float32)
+    store.upsert("brief", vectors, payloads)
+
+    def search(with_vector):
+        request = SearchRequest(
+            vector=[1.0, 0.0], filter=_filter(*REQUEST), limit=5, with_vector=with_vector
+        )
+        return store.search_batch("brief", [request])[0]
+
+    points = search(with_vector=True)
+    assert [p.payload["text"] for p in points] == ["proche", "lointain"]
+    assert points[0].score > points[1].score
+    assert points[0].vector is not None
+    assert search(with_vector=False)[0].vector is None
+
+
+def test_fake_llm_is_deterministic_and_injects_rate_limits():
+    from app.services.fake_llm import FakeLLM, FakeRateLimitError
+
+    llm = FakeLLM(latency_median=0.001, latency_sigma=0, error_rate=0, rate_limit_rate=0)
+    messages = [{"role": "user", "content": "Rédige la section contexte"}]
+
+    async def scenario():
+        first = await llm.complete(messages, max_tokens=200)
+        again = await llm.complete(messages, max_tokens=200)
+        structured = json.loads(await llm.complete(messages, max_tokens=200, json_output=True))
+        return first, again, structured
+
+    first, again, structured = asyncio.run(scenario())
+
+    assert first == again and first.startswith("- ")
+    assert structured["markdown"] == first
+    assert 0.6 <= structured["confidence"] < 1.0
+
+    limited = FakeLLM(latency_median=0.001, latency_sigma=0, error_rate=0, rate_limit_rate=1)
+    with pytest.raises(FakeRateLimitError) as error:
+        asyncio.run(limited.complete(messages, max_tokens=200))
+    assert error.value.status_code == 429
+
+
+def test_fake_llm_streams_tokens_to_the_sse_sink():
+    from app.services.fake_llm import FakeLLM
+    from app.services.streaming import token_sink
+
+    llm = FakeLLM(latency_median=0.001, latency_sigma=0, error_rate=0, rate_limit_rate=0)
+
+    async def scenario():
+        queue = asyncio.Queue()
+        token_sink.set(queue)
+        text = await llm.complete([{"content": "prompt"}], max_tokens=50, stream=True)
+        deltas = [queue.get_nowait()[1]["delta"] for _ in range(queue.qsize())]
+        return text, deltas
+
+    text, deltas = asyncio.run(scenario())
+
+    assert "".join(deltas) == text
@@ -0,0 +1,39 @@
+"""Parité torch / ONNX int8 des modèles exportés par `scripts/export_onnx.py`."""
+import os
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("torch")
+
+
+@pytest.fixture(scope="module")
+def metrics() -> dict[str, float | bool]:
+    from app.core.settings import get_settings
+    from app.services.onnx_backend import ONNX_MODEL_FILE
+    from scripts.export_onnx import parity_metrics
+
+    model_dir = get_settings().onnx_model_dir
+    if not all(
+        os.path.exists(os.path.join(model_dir, name, ONNX_MODEL_FILE))
+        for name in ("embedder", "reranker")
+    ):
+        pytest.skip(f"Modèles ONNX absents de {model_dir} (python scripts/export_onnx.py)")
+    return parity_metrics(model_dir)
+
+
+def test_embedder_parity(metrics):
+    from scripts.export_onnx import MIN_EMBEDDING_COSINE
+
+    assert metrics["min_cosine"] >= MIN_EMBEDDING_COSINE
+
+
+def test_reranker_parity(metrics):
+    from scripts.export_onnx import MAX_RERANK_ABS_DIFF
+
+    assert metrics["max_rerank_diff"] <= MAX_RERANK_ABS_DIFF
+
+
+def test_reranker_keeps_top1(metrics):
+    assert metrics["same_ranking"]
@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+    from fastapi.testclient import TestClient
+
+    # Sans `with` : le lifespan (connexions, warmup) n'est pas exécuté
+    return TestClient(app)
+
+
+def test_ready_is_503_while_warming_up(client, monkeypatch):
+    from app.core.resources import registry
+
+    monkeypatch.setattr(registry, "ready", False)
+    monkeypatch.setattr(registry, "warmup_error", None)
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"status": "warming_up", "error": None}
+
+
+def test_ready_reports_warmup_error(client, monkeypatch):
+    from app.core.resources import registry
+
+    monkeypatch.setattr(registry, "ready", False)
+    monkeypatch.setattr(registry, "warmup_error", "qdrant injoignable")
+
+    response = client.get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "qdrant injoignable"
+
+
+def test_ready_is_200_after_warmup(client, monkeypatch):
+    from app.core.resources import registry
+
+    monkeypatch.setattr(registry, "ready", True)
+    monkeypatch.setattr(registry, "timings", {"embed": 0.1})
+
+    response = client.get("/ready")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "timings": {"embed": 0.1}}
+
+
+def test_health_does_not_wait_for_warmup(client, monkeypatch):
+    from app.core.resources import registry
+
+    monkeypatch.setattr(registry, "ready", False)
+
+    assert client.get("/health").status_code == 200
+
+
+def test_warmup_fails_when_retrieval_is_unreachable(monkeypatch):
+    import asyncio
+
+    from app.core.resources import ResourceRegistry
+    from app.core.settings import get_settings
+    from app.services import rag_retriever, rerank_service
+
+    class Embedder:
+        def encode(self, texts, **_):
+            return [[0.0] * 4 for _ in texts]
+
+    async def unreachable(**_):
+        raise ConnectionError("qdrant injoignable")
+
+    monkeypatch.setattr(rag_retriever, "get_embedder", Embedder)
+    monkeypatch.setattr(rag_retriever, "retrieve_chunks", unreachable)
+    monkeypatch.setattr(rerank_service, "get_rerank_batcher", lambda: None)
+
+    registry = ResourceRegistry()
+    asyncio.run(registry.warmup(get_settings()))
+
+    assert registry.ready is False
+    assert registry.warmup_error == "qdrant injoignable"
+
+
+def test_close_redis_also_closes_the_sync_client(fake_redis):
+    import asyncio
+
+    from app import redis_client
+
+    assert redis_client.get_sync_redis() is not None
+
+    asyncio.run(redis_client.close_redis())
+
+    assert redis_client._sync_client is None
+    assert redis_client._clients == {}
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+
+
+def test_lock_is_renewed_while_a_long_leader_runs(fake_redis):
+    from app.services.single_flight import SingleFlight
+
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(2.5)
+        return {"draft": "ok"}
+
+    async def scenario():
+        # Deux réplicas : verrou de 1 s, calcul de 2,5 s
+        leader = SingleFlight(lock_ttl=1, result_ttl=30, wait_timeout=10)
+        follower = SingleFlight(lock_ttl=1, result_ttl=30, wait_timeout=10)
+        first = asyncio.create_task(leader.run("k", slow))
+        await asyncio.sleep(0.1)
+        second = await follower.run("k", slow)
+        return await first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == {"draft": "ok"}
+    assert calls == [1]
+    assert fake_redis.get("singleflight:lock:k") is None
+
+
+def test_identical_requests_in_process_share_one_execution(fake_redis):
+    from app.services.single_flight import SingleFlight
+
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"draft": "ok"}
+
+    async def scenario():
+        flight = SingleFlight(lock_ttl=5, result_ttl=30, wait_timeout=5)
+        return await asyncio.gather(*(flight.run("k", compute) for _ in range(3)))
+
+    assert asyncio.run(scenario()) == [{"draft": "ok"}] * 3
+    assert calls == [1]
+
+
+def test_follower_on_another_replica_receives_the_leader_result(fake_redis):
+    from app.services.single_flight import SingleFlight
+
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.3)
+        return {"draft": "ok"}
+
+    async def scenario():
+        leader = SingleFlight(lock_ttl=5, result_ttl=30, wait_timeout=5)
+        follower = SingleFlight(lock_ttl=5, result_ttl=30, wait_timeout=5)
+        first = asyncio.create_task(leader.run("k", compute))
+        await asyncio.sleep(0.05)
+        second = await follower.run("k", compute)
+        return await first, second
+
+    assert asyncio.run(scenario()) == ({"draft": "ok"}, {"draft": "ok"})
+    assert calls == [1]
+    assert fake_redis.get("singleflight:result:k") is not None
+
+
+def test_leader_failure_is_relayed_to_followers(fake_redis):
+    from app.services.single_flight import SingleFlight, SingleFlightError
+    from fastapi import HTTPException
+
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.3)
+        raise HTTPException(status_code=503, detail="LLM indisponible")
+
+    async def scenario():
+        leader = SingleFlight(lock_ttl=5, result_ttl=30, wait_timeout=5)
+        follower = SingleFlight(lock_ttl=5, result_ttl=30, wait_timeout=5)
+        first = asyncio.create_task(leader.run("k", failing))
+        await asyncio.sleep(0.05)
+        with pytest.raises(SingleFlightError) as relayed:
+            await follower.run("k", failing)
+        with pytest.raises(HTTPException):
+            await first
+        return relayed.value
+
+    error = asyncio.run(scenario())
+
+    assert (error.status_code, error.detail) == (503, "LLM indisponible")
+    assert calls == [1]
+
+
+def test_follower_takes_over_when_the_leader_vanishes(fake_redis):
+    from app.services.single_flight import SingleFlight
+
+    # Verrou d'un réplica mort : jamais renouvelé, aucun résultat publié
+    fake_redis.set("singleflight:lock:k", "dead-replica", ex=1)
+
+    async def compute():
+        return {"draft": "repris"}
+
+    async def scenario():
+        follower = SingleFlight(lock_ttl=5, result_ttl=30, wait_timeout=10)
+        return await follower.run("k", compute)
+
+    assert asyncio.run(scenario()) == {"draft": "repris"}
+
+
+def test_idempotency_key_replays_only_the_same_request(fake_redis):
+    from app.services.single_flight import IdempotencyKeyReused, IdempotencyStore
+
+    store = IdempotencyStore(ttl=60)
+
+    async def scenario():
+        await store.put("s1", "key-1", "fingerprint-a", {"markdown": "# A"})
+        replay = await store.get("s1", "key-1", "fingerprint-a")
+        with pytest.raises(IdempotencyKeyReused):
+            await store.get("s1", "key-1", "fingerprint-b")
+        return replay, await store.get("s1", "key-2", "fingerprint-b")
+
+    assert asyncio.run(scenario()) == ({"markdown": "# A"}, None)
+
+
+def test_generate_rejects_an_idempotency_key_reused_with_another_body(fake_redis, monkeypatch):
+    from app.api.v1.endpoints import generate
+    from app.core.constants import SECTION_IDS
+    from fastapi import HTTPException
+
+    async def run_generation(payload):
+        return {
+            "markdown": f"# {payload.brief_data['contexte']['job_function']}",
+            "confidence": 0.9,
+            "confidence_label": "haute",
+            "fallback_needed": False,
+        }
+
+    monkeypatch.setattr(generate, "_run_generation", run_generation)
+
+    def request(job_function):
+        return generate.GenerateRequest(
+            session_id="s1",
+            section_id="contexte",
+            user_preferences={"sections": [True] * len(SECTION_IDS), "seniority": "Senior"},
+            brief_data={"contexte": {"job_function": job_function}},
+        )
+
+    async def scenario():
+        first = await generate.generate_section(request("Data"), idempotency_key="k1")
+        replay = await generate.generate_section(request("Data"), idempotency_key="k1")
+        with pytest.raises(HTTPException) as conflict:
+            await generate.generate_section(request("Finance"), idempotency_key="k1")
+        return first, replay, conflict.value
+
+    first, replay, conflict = asyncio.run(scenario())
+
+    assert replay == first
+    assert first.markdown == "# Data"
+    assert conflict.status_code == 422